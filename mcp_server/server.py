@@ -4,52 +4,453 @@ MCP Server for Runwise.
 
 Provides training run analysis tools to MCP-compatible AI assistants.
 
-To use with Claude Code, add to your MCP settings:
+Install runwise (`pip install runwise`, or `pip install -e .` from a checkout),
+then add to your MCP settings:
 {
     "mcpServers": {
         "runwise": {
             "command": "python",
-            "args": ["/path/to/runwise/mcp_server/server.py"],
+            "args": ["-m", "mcp_server.server"],
             "env": {
                 "RUNWISE_PROJECT_ROOT": "/path/to/your/project"
             }
         }
     }
 }
+
+To run from an uninstalled source tree, add "PYTHONPATH": "/path/to/runwise"
+to the "env" block.
 """
 
-import json
+import hashlib
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from runwise import RunAnalyzer, RunwiseConfig, __version__, _json
+from runwise.cache import ResultCache
+from runwise.config import get_cache_dir
+from runwise.core import _RUN_FILES, _file_stamp
+
+# Shared default for requests without params. Handlers only read from it.
+_EMPTY: dict = {}
+
+# Resolved runs are reused for this many seconds, so a burst of tool calls on
+# the same run only scans the wandb directory once.
+_RUN_CACHE_TTL = 30.0
+_RUN_CACHE_SIZE = 32
+
+# Tools whose output depends only on the run's files and arguments, and can
+# therefore be persisted once the run has finished.
+_CACHEABLE_TOOLS = frozenset({
+    "health_check",
+    "analyze_run",
+    "get_history",
+    "get_history_stats",
+    "list_keys",
+    "get_config",
+    "get_run_context",
+    "detect_anomalies",
+    "get_sparkline",
+})
+
+# Maximum number of requests from one JSON-RPC batch handled concurrently.
+_BATCH_WORKERS = 8
+
+# Tool definitions returned by tools/list. The list is static for the lifetime
+# of the server, so the response dict is built once and reused.
+_TOOLS = [
+    # Quick health check - most common use case
+    {
+        "name": "health_check",
+        "description": "Quick training health check - the 'how's training going?' tool. Combines run status, key metrics, sparklines, and anomaly detection in one call. START HERE for most queries.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "run_id": {
+                    "type": "string",
+                    "description": "Run ID (uses latest/active run if not specified)"
+                }
+            }
+        }
+    },
+    # Discovery tools - use these first
+    {
+        "name": "list_runs",
+        "description": "List recent W&B training runs. Shows run IDs, names, state, and key metrics.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of runs to list",
+                    "default": 15
+                }
+            }
+        }
+    },
+    {
+        "name": "list_keys",
+        "description": "IMPORTANT: Call this FIRST before get_history or get_sparkline to discover available metric keys. Lists all metrics logged in a run's history.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "run_id": {
+                    "type": "string",
+                    "description": "Run ID (uses latest if not specified)"
+                }
+            }
+        }
+    },
+    # Analysis tools
+    {
+        "name": "analyze_run",
+        "description": "Detailed analysis of a specific run with metrics, sparklines, and anomaly detection.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "run_id": {
+                    "type": "string",
+                    "description": "W&B run ID to analyze"
+                },
+                "keys": {
+                    "type": "string",
+                    "description": "Comma-separated metric keys to show (optional, uses schema if not specified)"
+                }
+            },
+            "required": ["run_id"]
+        }
+    },
+    {
+        "name": "analyze_latest",
+        "description": "Analyze the latest/active training run. Same as analyze_run but auto-selects most recent run.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "keys": {
+                    "type": "string",
+                    "description": "Comma-separated metric keys to show (optional)"
+                }
+            }
+        }
+    },
+    {
+        "name": "compare_runs",
+        "description": "Compare metrics between two runs. Supports @step syntax for step-matched comparison (e.g., 'run1@50000' to compare at specific steps). Essential for curriculum learning.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "run_a": {
+                    "type": "string",
+                    "description": "First run ID (supports @step syntax, e.g., 'abc123@50000')"
+                },
+                "run_b": {
+                    "type": "string",
+                    "description": "Second run ID (supports @step syntax)"
+                },
+                "filter": {
+                    "type": "string",
+                    "description": "Filter metrics by prefix (e.g., 'val', 'train')"
+                },
+                "threshold": {
+                    "type": "number",
+                    "description": "Only show metrics with delta > threshold % (e.g., 5 for 5%)"
+                },
+                "show_config_diff": {
+                    "type": "boolean",
+                    "description": "Include hyperparameter differences",
+                    "default": False
+                }
+            },
+            "required": ["run_a", "run_b"]
+        }
+    },
+    {
+        "name": "live_status",
+        "description": "Get live status of currently running training from output.log. Shows recent metrics and throughput.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {}
+        }
+    },
+    # History tools - call list_keys first!
+    {
+        "name": "get_history",
+        "description": "Get downsampled training history as CSV. Call list_keys first to discover available metrics. Efficiently handles million-step runs.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "run_id": {
+                    "type": "string",
+                    "description": "Run ID (uses latest if not specified)"
+                },
+                "keys": {
+                    "type": "string",
+                    "description": "Comma-separated metric keys (REQUIRED - call list_keys first to discover)"
+                },
+                "samples": {
+                    "type": "integer",
+                    "description": "Number of data points (default: 500)",
+                    "default": 500
+                }
+            },
+            "required": ["keys"]
+        }
+    },
+    {
+        "name": "get_history_stats",
+        "description": "Get statistical summary (min/max/mean/final). More token-efficient than get_history. Call list_keys first.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "run_id": {
+                    "type": "string",
+                    "description": "Run ID (uses latest if not specified)"
+                },
+                "keys": {
+                    "type": "string",
+                    "description": "Comma-separated metric keys (REQUIRED - call list_keys first)"
+                }
+            },
+            "required": ["keys"]
+        }
+    },
+    {
+        "name": "get_sparkline",
+        "description": "Compact sparkline visualization of metric trends. Shows trend in ~10 tokens. Call list_keys first.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "run_id": {
+                    "type": "string",
+                    "description": "Run ID (uses latest if not specified)"
+                },
+                "keys": {
+                    "type": "string",
+                    "description": "Comma-separated metric keys (REQUIRED - call list_keys first)"
+                },
+                "samples": {
+                    "type": "integer",
+                    "description": "Number of data points to sample (default: 50)",
+                    "default": 50
+                }
+            },
+            "required": ["keys"]
+        }
+    },
+    # Metadata tools
+    {
+        "name": "get_config",
+        "description": "Get hyperparameters and configuration (learning rate, batch size, model architecture, etc.)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "run_id": {
+                    "type": "string",
+                    "description": "Run ID (uses latest if not specified)"
+                }
+            }
+        }
+    },
+    {
+        "name": "get_run_context",
+        "description": "Get run context (name, notes, tags, group). User-provided descriptions of what the run is testing.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "run_id": {
+                    "type": "string",
+                    "description": "Run ID (uses latest if not specified)"
+                }
+            }
+        }
+    },
+    {
+        "name": "find_best_run",
+        "description": "Find the best run by a specific metric. Returns ranked list of runs.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "metric": {
+                    "type": "string",
+                    "description": "Metric to compare (call list_keys to discover available metrics)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of runs to consider (default: 10)",
+                    "default": 10
+                },
+                "higher_is_better": {
+                    "type": "boolean",
+                    "description": "True for metrics like accuracy, false for loss",
+                    "default": False
+                }
+            },
+            "required": ["metric"]
+        }
+    },
+    {
+        "name": "detect_anomalies",
+        "description": "Run anomaly detection. Detects loss spikes, overfitting, plateaus, gradient issues. Returns empty string if healthy (token-efficient).",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "run_id": {
+                    "type": "string",
+                    "description": "Run ID (uses latest if not specified)"
+                },
+                "loss_key": {
+                    "type": "string",
+                    "description": "Key for loss metric (default: auto-detect)",
+                    "default": "loss"
+                }
+            }
+        }
+    },
+    {
+        "name": "analyze_local_log",
+        "description": "Analyze a local JSONL training log file (not W&B).",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "file": {
+                    "type": "string",
+                    "description": "Log file path (uses latest in logs/ if not specified)"
+                }
+            }
+        }
+    }
+]
+
+
+@dataclass(slots=True)
+class RPCRequest:
+    """A decoded JSON-RPC request, normalized once so handlers use attributes."""
+
+    method: str
+    params: dict
+    id: Any = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RPCRequest":
+        return cls(
+            method=data.get("method", ""),
+            params=data.get("params") or _EMPTY,
+            id=data.get("id"),
+        )
+
+
+# JSON-RPC error payloads. The static one is shared and must not be mutated.
+_INVALID_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": None,
+    "error": {"code": -32600, "message": "Invalid Request"}
+}
+
 
-# Add parent to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+def _method_not_found(method) -> dict:
+    return {"error": {"code": -32601, "message": "Method not found: " + str(method)}}
 
-from runwise import RunAnalyzer, RunwiseConfig, __version__
+
+def _unknown_tool(name) -> dict:
+    return {"error": {"code": -32602, "message": "Unknown tool: " + str(name)}}
+
+
+def _internal_error(request_id, exc: Exception) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": -32603, "message": str(exc)}
+    }
+
+
+# Tool results with more text than this are written in pieces (see below).
+_LARGE_TEXT = 64_000
+
+
+def _write_response(stdout, response) -> None:
+    """Write a JSON-RPC response followed by a newline.
+
+    Large single-text tool results (e.g. get_history CSV) are written as
+    envelope, encoded text and trailer, so the text is encoded once without
+    re-serializing it inside the full response.
+    """
+    result = response.get("result") if isinstance(response, dict) else None
+    if isinstance(result, dict) and len(result) == 1:
+        content = result.get("content")
+        if isinstance(content, list) and len(content) == 1:
+            text = content[0].get("text")
+            if isinstance(text, str) and len(text) > _LARGE_TEXT and len(content[0]) == 2:
+                stdout.write(b'{"jsonrpc":"2.0","id":')
+                stdout.write(_json.dumps(response.get("id")))
+                stdout.write(b',"result":{"content":[{"type":"text","text":')
+                stdout.write(_json.dumps(text))
+                stdout.write(b"}]}}\n")
+                return
+    stdout.write(_json.dumps(response))
+    stdout.write(b"\n")
+
+
+# Failures a tool can hit on bad input or unreadable run files. These are
+# reported as tool errors (isError) so the agent can adjust its call; anything
+# else is a bug and surfaces as a JSON-RPC internal error.
+_TOOL_ERRORS = (OSError, ValueError, KeyError, TypeError)
+
+
+@lru_cache(maxsize=64)
+def _parse_keys(spec: str) -> tuple[str, ...]:
+    """Parse a comma-separated key list, e.g. "loss, val_loss" -> ("loss", "val_loss")."""
+    return tuple(k for k in (part.strip() for part in spec.split(",")) if k)
+
+
+@lru_cache(maxsize=16)
+def _log_candidates(logs_dir: Path, file_arg: str) -> tuple[Path, Path]:
+    """Paths to try for a user-supplied log file: as given, then under logs_dir."""
+    return Path(file_arg), logs_dir / file_arg
 
 
 class MCPServer:
     """Simple MCP server implementation for Runwise."""
 
     def __init__(self):
-        project_root = os.environ.get("RUNWISE_PROJECT_ROOT", os.getcwd())
-        config = RunwiseConfig.auto_detect(Path(project_root))
+        self.project_root = Path(os.environ.get("RUNWISE_PROJECT_ROOT", os.getcwd()))
+        config = RunwiseConfig.auto_detect(self.project_root)
         self.analyzer = RunAnalyzer(config)
-
-    def handle_request(self, request: dict) -> dict:
+        self._tools_response = {"tools": _TOOLS}
+        # Tool name -> handler, so dispatch is a single dict lookup
+        self._tools = {
+            tool["name"]: getattr(self, f"_tool_{tool['name']}") for tool in _TOOLS
+        }
+        # Pre-encoded results for methods whose response never changes
+        self._static_results = {
+            "initialize": _json.dumps(self._initialize(_EMPTY)),
+            "tools/list": _json.dumps(self._tools_response),
+        }
+        # run_id ("" for latest) -> (resolved_at, RunInfo)
+        self._run_cache: dict = {}
+        self._run_cache_lock = threading.Lock()
+        # On-disk cache of tool output for finished runs. The salt invalidates
+        # entries when runwise or the project config changes.
+        self._result_cache = ResultCache(get_cache_dir() / "mcp-results.sqlite3")
+        self._cache_salt = f"{__version__}:{config!r}"
+        # Worker threads for JSON-RPC batches (started on first use)
+        self._pool = ThreadPoolExecutor(max_workers=_BATCH_WORKERS)
+
+    def handle_request(self, request: "dict | RPCRequest") -> dict:
         """Handle an MCP request. Returns the result to be wrapped in JSON-RPC format."""
-        method = request.get("method", "")
-        params = request.get("params", {})
-
-        if method == "initialize":
-            return {"result": self._initialize(params)}
-        elif method == "tools/list":
-            return {"result": self._list_tools()}
-        elif method == "tools/call":
-            return {"result": self._call_tool(params)}
-        else:
-            return {"error": {"code": -32601, "message": f"Method not found: {method}"}}
+        if not isinstance(request, RPCRequest):
+            request = RPCRequest.from_dict(request)
+        handler = self._METHODS.get(request.method)
+        if handler is None:
+            return _method_not_found(request.method)
+        return {"result": handler(self, request.params)}
 
     def _initialize(self, params: dict) -> dict:
         """Handle initialize request."""
@@ -64,272 +465,9 @@ class MCPServer:
             }
         }
 
-    def _list_tools(self) -> dict:
-        """List available tools with improved descriptions."""
-        return {
-            "tools": [
-                # Quick health check - most common use case
-                {
-                    "name": "health_check",
-                    "description": "Quick training health check - the 'how's training going?' tool. Combines run status, key metrics, sparklines, and anomaly detection in one call. START HERE for most queries.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "run_id": {
-                                "type": "string",
-                                "description": "Run ID (uses latest/active run if not specified)"
-                            }
-                        }
-                    }
-                },
-                # Discovery tools - use these first
-                {
-                    "name": "list_runs",
-                    "description": "List recent W&B training runs. Shows run IDs, names, state, and key metrics.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum number of runs to list",
-                                "default": 15
-                            }
-                        }
-                    }
-                },
-                {
-                    "name": "list_keys",
-                    "description": "IMPORTANT: Call this FIRST before get_history or get_sparkline to discover available metric keys. Lists all metrics logged in a run's history.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "run_id": {
-                                "type": "string",
-                                "description": "Run ID (uses latest if not specified)"
-                            }
-                        }
-                    }
-                },
-                # Analysis tools
-                {
-                    "name": "analyze_run",
-                    "description": "Detailed analysis of a specific run with metrics, sparklines, and anomaly detection.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "run_id": {
-                                "type": "string",
-                                "description": "W&B run ID to analyze"
-                            },
-                            "keys": {
-                                "type": "string",
-                                "description": "Comma-separated metric keys to show (optional, uses schema if not specified)"
-                            }
-                        },
-                        "required": ["run_id"]
-                    }
-                },
-                {
-                    "name": "analyze_latest",
-                    "description": "Analyze the latest/active training run. Same as analyze_run but auto-selects most recent run.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "keys": {
-                                "type": "string",
-                                "description": "Comma-separated metric keys to show (optional)"
-                            }
-                        }
-                    }
-                },
-                {
-                    "name": "compare_runs",
-                    "description": "Compare metrics between two runs. Supports @step syntax for step-matched comparison (e.g., 'run1@50000' to compare at specific steps). Essential for curriculum learning.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "run_a": {
-                                "type": "string",
-                                "description": "First run ID (supports @step syntax, e.g., 'abc123@50000')"
-                            },
-                            "run_b": {
-                                "type": "string",
-                                "description": "Second run ID (supports @step syntax)"
-                            },
-                            "filter": {
-                                "type": "string",
-                                "description": "Filter metrics by prefix (e.g., 'val', 'train')"
-                            },
-                            "threshold": {
-                                "type": "number",
-                                "description": "Only show metrics with delta > threshold % (e.g., 5 for 5%)"
-                            },
-                            "show_config_diff": {
-                                "type": "boolean",
-                                "description": "Include hyperparameter differences",
-                                "default": False
-                            }
-                        },
-                        "required": ["run_a", "run_b"]
-                    }
-                },
-                {
-                    "name": "live_status",
-                    "description": "Get live status of currently running training from output.log. Shows recent metrics and throughput.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {}
-                    }
-                },
-                # History tools - call list_keys first!
-                {
-                    "name": "get_history",
-                    "description": "Get downsampled training history as CSV. Call list_keys first to discover available metrics. Efficiently handles million-step runs.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "run_id": {
-                                "type": "string",
-                                "description": "Run ID (uses latest if not specified)"
-                            },
-                            "keys": {
-                                "type": "string",
-                                "description": "Comma-separated metric keys (REQUIRED - call list_keys first to discover)"
-                            },
-                            "samples": {
-                                "type": "integer",
-                                "description": "Number of data points (default: 500)",
-                                "default": 500
-                            }
-                        },
-                        "required": ["keys"]
-                    }
-                },
-                {
-                    "name": "get_history_stats",
-                    "description": "Get statistical summary (min/max/mean/final). More token-efficient than get_history. Call list_keys first.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "run_id": {
-                                "type": "string",
-                                "description": "Run ID (uses latest if not specified)"
-                            },
-                            "keys": {
-                                "type": "string",
-                                "description": "Comma-separated metric keys (REQUIRED - call list_keys first)"
-                            }
-                        },
-                        "required": ["keys"]
-                    }
-                },
-                {
-                    "name": "get_sparkline",
-                    "description": "Compact sparkline visualization of metric trends. Shows trend in ~10 tokens. Call list_keys first.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "run_id": {
-                                "type": "string",
-                                "description": "Run ID (uses latest if not specified)"
-                            },
-                            "keys": {
-                                "type": "string",
-                                "description": "Comma-separated metric keys (REQUIRED - call list_keys first)"
-                            },
-                            "samples": {
-                                "type": "integer",
-                                "description": "Number of data points to sample (default: 50)",
-                                "default": 50
-                            }
-                        },
-                        "required": ["keys"]
-                    }
-                },
-                # Metadata tools
-                {
-                    "name": "get_config",
-                    "description": "Get hyperparameters and configuration (learning rate, batch size, model architecture, etc.)",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "run_id": {
-                                "type": "string",
-                                "description": "Run ID (uses latest if not specified)"
-                            }
-                        }
-                    }
-                },
-                {
-                    "name": "get_run_context",
-                    "description": "Get run context (name, notes, tags, group). User-provided descriptions of what the run is testing.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "run_id": {
-                                "type": "string",
-                                "description": "Run ID (uses latest if not specified)"
-                            }
-                        }
-                    }
-                },
-                {
-                    "name": "find_best_run",
-                    "description": "Find the best run by a specific metric. Returns ranked list of runs.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "metric": {
-                                "type": "string",
-                                "description": "Metric to compare (call list_keys to discover available metrics)"
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Number of runs to consider (default: 10)",
-                                "default": 10
-                            },
-                            "higher_is_better": {
-                                "type": "boolean",
-                                "description": "True for metrics like accuracy, false for loss",
-                                "default": False
-                            }
-                        },
-                        "required": ["metric"]
-                    }
-                },
-                {
-                    "name": "detect_anomalies",
-                    "description": "Run anomaly detection. Detects loss spikes, overfitting, plateaus, gradient issues. Returns empty string if healthy (token-efficient).",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "run_id": {
-                                "type": "string",
-                                "description": "Run ID (uses latest if not specified)"
-                            },
-                            "loss_key": {
-                                "type": "string",
-                                "description": "Key for loss metric (default: auto-detect)",
-                                "default": "loss"
-                            }
-                        }
-                    }
-                },
-                {
-                    "name": "analyze_local_log",
-                    "description": "Analyze a local JSONL training log file (not W&B).",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "file": {
-                                "type": "string",
-                                "description": "Log file path (uses latest in logs/ if not specified)"
-                            }
-                        }
-                    }
-                }
-            ]
-        }
+    def _list_tools(self, params: dict) -> dict:
+        """List available tools (built once in __init__)."""
+        return self._tools_response
 
     def _parse_run_at_step(self, run_spec: str) -> tuple:
         """Parse run@step syntax. Returns (run_id, step) where step may be None."""
@@ -343,256 +481,75 @@ class MCPServer:
                 return run_spec, None
         return run_spec, None
 
+    def _resolve_run(self, run_id: str):
+        """Find a run by ID, or the latest run if run_id is empty.
+
+        Results are cached for _RUN_CACHE_TTL seconds. Misses are not cached so
+        a newly started run is picked up on the next call.
+        """
+        now = time.monotonic()
+        with self._run_cache_lock:
+            entry = self._run_cache.get(run_id)
+            if entry is not None and now - entry[0] < _RUN_CACHE_TTL:
+                return entry[1]
+
+        run = self.analyzer.find_run(run_id)
+
+        if run is not None:
+            with self._run_cache_lock:
+                if run_id not in self._run_cache and len(self._run_cache) >= _RUN_CACHE_SIZE:
+                    # Evict the oldest entry (dicts keep insertion order)
+                    self._run_cache.pop(next(iter(self._run_cache)))
+                self._run_cache[run_id] = (now, run)
+        return run
+
+    def _result_cache_key(self, tool_name: str, arguments: dict, run) -> str:
+        """Cache key covering the tool call, config and the run's files."""
+        # Same files as the analyzer's own RunInfo cache, so both caches
+        # invalidate together
+        files_dir = run.directory / "files"
+        stamps = [_file_stamp(files_dir / name) for name in _RUN_FILES]
+        payload = _json.dumps([
+            self._cache_salt,
+            tool_name,
+            sorted(arguments.items()),
+            str(run.directory),
+            len(run.segments),
+            stamps,
+        ])
+        return hashlib.sha256(payload).hexdigest()
+
+    def _call_cached(self, tool_name: str, handler, arguments: dict) -> str:
+        """Run a tool handler, reusing stored output for finished runs.
+
+        Only calls that name a run explicitly are cached: "latest" can point
+        at a different run tomorrow.
+        """
+        run_id = arguments.get("run_id") or ""
+        if tool_name not in _CACHEABLE_TOOLS or not run_id or not self._result_cache.enabled:
+            return handler(arguments)
+        run = self._resolve_run(run_id)
+        if run is None or run.state != "finished":
+            return handler(arguments)
+
+        key = self._result_cache_key(tool_name, arguments, run)
+        result = self._result_cache.get(key)
+        if result is None:
+            result = handler(arguments)
+            self._result_cache.set(key, result)
+        return result
+
     def _call_tool(self, params: dict) -> dict:
         """Execute a tool call."""
-        tool_name = params.get("name", "")
-        arguments = params.get("arguments", {})
-
-        try:
-            # Health check - the quick "how's training going?" tool
-            if tool_name == "health_check":
-                from runwise.anomalies import detect_anomalies, format_anomalies
-                from runwise.sparklines import sparkline, trend_indicator
-
-                run_id = arguments.get("run_id")
-                run = self.analyzer.find_run(run_id) if run_id else self.analyzer.get_latest_run()
-
-                if not run:
-                    result = "No runs found. Check that you're in a project with a wandb/ directory."
-                else:
-                    lines = ["TRAINING HEALTH CHECK", "=" * 40, ""]
-
-                    # Basic info
-                    state = "RUNNING" if run.state == "running" else run.state.upper()
-                    lines.append(f"Run: {run.run_id} | State: {state}")
-                    lines.append(f"Name: {run.name or '(unnamed)'}")
-                    lines.append(f"Step: {run.final_step:,} | Runtime: {run.metrics.get('_runtime', 0)/3600:.1f}h")
-                    lines.append("")
-
-                    # Key metrics with sparklines
-                    history = self.analyzer.get_history_data(run, samples=50)
-                    if history:
-                        lines.append("KEY METRICS:")
-                        # Auto-detect common keys
-                        common_keys = ["loss", "train/loss", "val_loss", "val/loss",
-                                       "accuracy", "train/accuracy", "val/accuracy"]
-                        found_keys = []
-                        for key in common_keys:
-                            if any(key in r for r in history):
-                                found_keys.append(key)
-
-                        for key in found_keys[:5]:  # Top 5 metrics
-                            values = [r.get(key) for r in history if key in r]
-                            if values:
-                                spark = sparkline(values, width=12)
-                                trend = trend_indicator(values)
-                                first = values[0] if values else 0
-                                last = values[-1] if values else 0
-                                lines.append(f"  {key}: {spark} {trend} ({first:.4g} → {last:.4g})")
-                        lines.append("")
-
-                        # Anomaly detection
-                        anomalies = detect_anomalies(
-                            history,
-                            config=self.analyzer.config.anomaly_config,
-                            loss_key=self.analyzer.config.schema.loss_key
-                        )
-                        if anomalies:
-                            lines.append("ANOMALIES DETECTED:")
-                            lines.append(format_anomalies(anomalies, compact=True))
-                        else:
-                            lines.append("STATUS: Healthy - no anomalies detected")
-                    else:
-                        lines.append("(no history data available yet)")
-
-                    result = "\n".join(lines)
-
-            elif tool_name == "list_runs":
-                limit = arguments.get("limit", 15)
-                runs = self.analyzer.list_runs(limit=limit)
-                result = self.analyzer.format_run_list(runs) if runs else "No runs found"
-
-            elif tool_name == "analyze_run":
-                run_id = arguments.get("run_id")
-                run = self.analyzer.find_run(run_id)
-                if run:
-                    keys = None
-                    if arguments.get("keys"):
-                        keys = [k.strip() for k in arguments["keys"].split(",")]
-                    result = self.analyzer.summarize_run(run, keys=keys)
-                else:
-                    result = f"Run '{run_id}' not found"
-
-            elif tool_name == "analyze_latest":
-                run = self.analyzer.get_latest_run()
-                if run:
-                    keys = None
-                    if arguments.get("keys"):
-                        keys = [k.strip() for k in arguments["keys"].split(",")]
-                    result = self.analyzer.summarize_run(run, keys=keys)
-                else:
-                    result = "No latest run found"
-
-            elif tool_name == "compare_runs":
-                # Parse @step syntax
-                run_spec_a = arguments.get("run_a", "")
-                run_spec_b = arguments.get("run_b", "")
-                run_id_a, step_a = self._parse_run_at_step(run_spec_a)
-                run_id_b, step_b = self._parse_run_at_step(run_spec_b)
-
-                run_a = self.analyzer.find_run(run_id_a)
-                run_b = self.analyzer.find_run(run_id_b)
-
-                if not run_a:
-                    result = f"Run '{run_id_a}' not found"
-                elif not run_b:
-                    result = f"Run '{run_id_b}' not found"
-                elif step_a is not None or step_b is not None:
-                    # Step-matched comparison
-                    if step_a is None:
-                        step_a = run_a.final_step
-                    if step_b is None:
-                        step_b = run_b.final_step
-                    result = self.analyzer.compare_runs_at_step(
-                        run_a,
-                        run_b,
-                        step_a=step_a,
-                        step_b=step_b,
-                        filter_prefix=arguments.get("filter"),
-                        threshold=arguments.get("threshold"),
-                        show_config_diff=arguments.get("show_config_diff", False)
-                    )
-                else:
-                    # Regular comparison
-                    result = self.analyzer.compare_runs(
-                        run_a,
-                        run_b,
-                        filter_prefix=arguments.get("filter"),
-                        show_config_diff=arguments.get("show_config_diff", False),
-                        threshold=arguments.get("threshold"),
-                    )
-
-            elif tool_name == "live_status":
-                result = self.analyzer.get_live_status()
-
-            elif tool_name == "analyze_local_log":
-                file_arg = arguments.get("file")
-                if file_arg:
-                    log_file = Path(file_arg)
-                    if not log_file.exists():
-                        log_file = self.analyzer.config.logs_dir / file_arg
-                else:
-                    logs = self.analyzer.list_local_logs()
-                    log_file = logs[0] if logs else None
-
-                if log_file and log_file.exists():
-                    result = self.analyzer.summarize_local_log(log_file)
-                else:
-                    result = "No log file found"
+        tool_name: str = params.get("name") or ""
+        arguments: dict = params.get("arguments") or _EMPTY
 
-            elif tool_name == "get_history":
-                run_id = arguments.get("run_id")
-                run = self.analyzer.find_run(run_id) if run_id else self.analyzer.get_latest_run()
-                if not run:
-                    result = "Run not found"
-                else:
-                    keys = [k.strip() for k in arguments.get("keys", "").split(",")]
-                    samples = arguments.get("samples", 500)
-                    result = self.analyzer.get_history(run, keys, samples=samples)
-
-            elif tool_name == "get_history_stats":
-                run_id = arguments.get("run_id")
-                run = self.analyzer.find_run(run_id) if run_id else self.analyzer.get_latest_run()
-                if not run:
-                    result = "Run not found"
-                else:
-                    keys = [k.strip() for k in arguments.get("keys", "").split(",")]
-                    result = self.analyzer.get_history_stats(run, keys)
-
-            elif tool_name == "list_keys":
-                run_id = arguments.get("run_id")
-                run = self.analyzer.find_run(run_id) if run_id else self.analyzer.get_latest_run()
-                if not run:
-                    result = "Run not found"
-                else:
-                    result = self.analyzer.list_available_keys(run)
-
-            elif tool_name == "get_config":
-                run_id = arguments.get("run_id")
-                run = self.analyzer.find_run(run_id) if run_id else self.analyzer.get_latest_run()
-                if not run:
-                    result = "Run not found"
-                else:
-                    result = self.analyzer.get_config(run)
-
-            elif tool_name == "get_run_context":
-                run_id = arguments.get("run_id")
-                run = self.analyzer.find_run(run_id) if run_id else self.analyzer.get_latest_run()
-                if not run:
-                    result = "Run not found"
-                else:
-                    result = self.analyzer.get_run_context(run)
-
-            elif tool_name == "find_best_run":
-                metric = arguments.get("metric")
-                limit = arguments.get("limit", 10)
-                higher_is_better = arguments.get("higher_is_better", False)
-                result = self.analyzer.format_best_run(metric, limit, higher_is_better)
-
-            elif tool_name == "detect_anomalies":
-                from runwise.anomalies import detect_anomalies, format_anomalies
-
-                run_id = arguments.get("run_id")
-                run = self.analyzer.find_run(run_id) if run_id else self.analyzer.get_latest_run()
-                if not run:
-                    result = "Run not found"
-                else:
-                    loss_key = arguments.get("loss_key", self.analyzer.config.schema.loss_key)
-                    history = self.analyzer.get_history_data(run, samples=200)
-                    if not history:
-                        result = "No history data for anomaly detection"
-                    else:
-                        anomalies = detect_anomalies(
-                            history,
-                            config=self.analyzer.config.anomaly_config,
-                            loss_key=loss_key
-                        )
-                        if anomalies:
-                            result = format_anomalies(anomalies, compact=True)
-                        else:
-                            result = "No anomalies detected - run appears healthy"
-
-            elif tool_name == "get_sparkline":
-                from runwise.sparklines import sparkline, trend_indicator
-
-                run_id = arguments.get("run_id")
-                run = self.analyzer.find_run(run_id) if run_id else self.analyzer.get_latest_run()
-                if not run:
-                    result = "Run not found"
-                else:
-                    keys = [k.strip() for k in arguments.get("keys", "").split(",")]
-                    samples = arguments.get("samples", 50)
-                    history = self.analyzer.get_history_data(run, keys=keys, samples=samples)
-
-                    if not history:
-                        result = f"No history data for keys: {keys}"
-                    else:
-                        lines = [f"SPARKLINES: {run.run_id}"]
-                        for key in keys:
-                            values = [r.get(key) for r in history if key in r]
-                            if values:
-                                spark = sparkline(values, width=20)
-                                trend = trend_indicator(values)
-                                first = values[0] if values else 0
-                                last = values[-1] if values else 0
-                                lines.append(f"  {key}: {spark} {trend} ({first:.4g}→{last:.4g})")
-                            else:
-                                lines.append(f"  {key}: (no data)")
-                        result = "\n".join(lines)
-
-            else:
-                return {"error": {"code": -32602, "message": f"Unknown tool: {tool_name}"}}
+        handler = self._tools.get(tool_name)
+        if handler is None:
+            return _unknown_tool(tool_name)
 
+        try:
+            result = self._call_cached(tool_name, handler, arguments)
             return {
                 "content": [
                     {
@@ -602,55 +559,333 @@ class MCPServer:
                 ]
             }
 
-        except Exception as e:
+        except _TOOL_ERRORS as e:
             return {
                 "content": [
                     {
                         "type": "text",
-                        "text": f"Error executing {tool_name}: {str(e)}"
+                        "text": "Error executing " + tool_name + ": " + str(e)
                     }
                 ],
                 "isError": True
             }
 
+    # Tool handlers. Each takes the tool arguments and returns the result text.
+
+    def _tool_health_check(self, arguments: dict) -> str:
+        from runwise.anomalies import detect_anomalies, format_anomalies
+        from runwise.sparklines import sparkline, trend_indicator
+
+        run = self._resolve_run(arguments.get("run_id") or "")
+
+        if not run:
+            return "No runs found. Check that you're in a project with a wandb/ directory."
+
+        lines = ["TRAINING HEALTH CHECK", "=" * 40, ""]
+
+        # Basic info
+        state = "RUNNING" if run.state == "running" else run.state.upper()
+        lines.append(f"Run: {run.run_id} | State: {state}")
+        lines.append(f"Name: {run.name or '(unnamed)'}")
+        lines.append(f"Step: {run.final_step:,} | Runtime: {run.metrics.get('_runtime', 0)/3600:.1f}h")
+        lines.append("")
+
+        # Key metrics with sparklines
+        history = self.analyzer.get_history_data(run, samples=50)
+        if history:
+            lines.append("KEY METRICS:")
+            # Auto-detect common keys
+            common_keys = ["loss", "train/loss", "val_loss", "val/loss",
+                           "accuracy", "train/accuracy", "val/accuracy"]
+            found_keys = []
+            for key in common_keys:
+                if any(key in r for r in history):
+                    found_keys.append(key)
+
+            for key in found_keys[:5]:  # Top 5 metrics
+                values = [r.get(key) for r in history if key in r]
+                if values:
+                    spark = sparkline(values, width=12)
+                    trend = trend_indicator(values)
+                    first = values[0] if values else 0
+                    last = values[-1] if values else 0
+                    lines.append(f"  {key}: {spark} {trend} ({first:.4g} → {last:.4g})")
+            lines.append("")
+
+            # Anomaly detection
+            anomalies = detect_anomalies(
+                history,
+                config=self.analyzer.config.anomaly_config,
+                loss_key=self.analyzer.config.schema.loss_key
+            )
+            if anomalies:
+                lines.append("ANOMALIES DETECTED:")
+                lines.append(format_anomalies(anomalies, compact=True))
+            else:
+                lines.append("STATUS: Healthy - no anomalies detected")
+        else:
+            lines.append("(no history data available yet)")
+
+        return "\n".join(lines)
+
+    def _tool_list_runs(self, arguments: dict) -> str:
+        limit = arguments.get("limit", 15)
+        runs = self.analyzer.list_runs(limit=limit)
+        return self.analyzer.format_run_list(runs) if runs else "No runs found"
+
+    def _tool_analyze_run(self, arguments: dict) -> str:
+        run_id: str = arguments.get("run_id") or ""
+        run = self.analyzer.find_run(run_id)
+        if not run:
+            return f"Run '{run_id}' not found"
+        keys = _parse_keys(arguments.get("keys") or "") or None
+        return self.analyzer.summarize_run(run, keys=keys)
+
+    def _tool_analyze_latest(self, arguments: dict) -> str:
+        run = self.analyzer.get_latest_run()
+        if not run:
+            return "No latest run found"
+        keys = _parse_keys(arguments.get("keys") or "") or None
+        return self.analyzer.summarize_run(run, keys=keys)
+
+    def _tool_compare_runs(self, arguments: dict) -> str:
+        # Parse @step syntax
+        run_spec_a: str = arguments.get("run_a") or ""
+        run_spec_b: str = arguments.get("run_b") or ""
+        run_id_a, step_a = self._parse_run_at_step(run_spec_a)
+        run_id_b, step_b = self._parse_run_at_step(run_spec_b)
+
+        run_a = self.analyzer.find_run(run_id_a)
+        run_b = self.analyzer.find_run(run_id_b)
+
+        if not run_a:
+            return f"Run '{run_id_a}' not found"
+        if not run_b:
+            return f"Run '{run_id_b}' not found"
+
+        if step_a is not None or step_b is not None:
+            # Step-matched comparison
+            if step_a is None:
+                step_a = run_a.final_step
+            if step_b is None:
+                step_b = run_b.final_step
+            return self.analyzer.compare_runs_at_step(
+                run_a,
+                run_b,
+                step_a=step_a,
+                step_b=step_b,
+                filter_prefix=arguments.get("filter"),
+                threshold=arguments.get("threshold"),
+                show_config_diff=arguments.get("show_config_diff", False)
+            )
+
+        # Regular comparison
+        return self.analyzer.compare_runs(
+            run_a,
+            run_b,
+            filter_prefix=arguments.get("filter"),
+            show_config_diff=arguments.get("show_config_diff", False),
+            threshold=arguments.get("threshold"),
+        )
+
+    def _tool_live_status(self, arguments: dict) -> str:
+        return self.analyzer.get_live_status()
+
+    def _find_log(self, file_arg: str) -> Path | None:
+        """Locate a local log file, or the most recent one if none is given.
+
+        Each candidate path costs a single stat() call.
+        """
+        if not file_arg:
+            logs = self.analyzer.list_local_logs()
+            return logs[0] if logs else None
+        for candidate in _log_candidates(self.analyzer.config.logs_dir, file_arg):
+            try:
+                candidate.stat()
+            except OSError:
+                continue
+            return candidate
+        return None
+
+    def _tool_analyze_local_log(self, arguments: dict) -> str:
+        log_file = self._find_log(arguments.get("file") or "")
+        if log_file is None:
+            return "No log file found"
+        return self.analyzer.summarize_local_log(log_file)
+
+    def _tool_get_history(self, arguments: dict) -> str:
+        run = self._resolve_run(arguments.get("run_id") or "")
+        if not run:
+            return "Run not found"
+        keys = _parse_keys(arguments.get("keys") or "")
+        samples = arguments.get("samples", 500)
+        return self.analyzer.get_history(run, keys, samples=samples)
+
+    def _tool_get_history_stats(self, arguments: dict) -> str:
+        run = self._resolve_run(arguments.get("run_id") or "")
+        if not run:
+            return "Run not found"
+        keys = _parse_keys(arguments.get("keys") or "")
+        return self.analyzer.get_history_stats(run, keys)
+
+    def _tool_list_keys(self, arguments: dict) -> str:
+        run = self._resolve_run(arguments.get("run_id") or "")
+        if not run:
+            return "Run not found"
+        return self.analyzer.list_available_keys(run)
+
+    def _tool_get_config(self, arguments: dict) -> str:
+        run = self._resolve_run(arguments.get("run_id") or "")
+        if not run:
+            return "Run not found"
+        return self.analyzer.get_config(run)
+
+    def _tool_get_run_context(self, arguments: dict) -> str:
+        run = self._resolve_run(arguments.get("run_id") or "")
+        if not run:
+            return "Run not found"
+        return self.analyzer.get_run_context(run)
+
+    def _tool_find_best_run(self, arguments: dict) -> str:
+        metric: str = arguments.get("metric") or ""
+        limit = arguments.get("limit", 10)
+        higher_is_better = arguments.get("higher_is_better", False)
+        return self.analyzer.format_best_run(metric, limit, higher_is_better)
+
+    def _tool_detect_anomalies(self, arguments: dict) -> str:
+        from runwise.anomalies import detect_anomalies, format_anomalies
+
+        run = self._resolve_run(arguments.get("run_id") or "")
+        if not run:
+            return "Run not found"
+
+        loss_key = arguments.get("loss_key", self.analyzer.config.schema.loss_key)
+        history = self.analyzer.get_history_data(run, samples=200)
+        if not history:
+            return "No history data for anomaly detection"
+
+        anomalies = detect_anomalies(
+            history,
+            config=self.analyzer.config.anomaly_config,
+            loss_key=loss_key
+        )
+        if anomalies:
+            return format_anomalies(anomalies, compact=True)
+        return "No anomalies detected - run appears healthy"
+
+    def _tool_get_sparkline(self, arguments: dict) -> str:
+        from runwise.sparklines import sparkline, trend_indicator
+
+        run = self._resolve_run(arguments.get("run_id") or "")
+        if not run:
+            return "Run not found"
+
+        keys = _parse_keys(arguments.get("keys") or "")
+        samples = arguments.get("samples", 50)
+        history = self.analyzer.get_history_data(run, keys=keys, samples=samples)
+        if not history:
+            return f"No history data for keys: {list(keys)}"
+
+        lines = [f"SPARKLINES: {run.run_id}"]
+        for key in keys:
+            values = [r.get(key) for r in history if key in r]
+            if values:
+                spark = sparkline(values, width=20)
+                trend = trend_indicator(values)
+                first = values[0] if values else 0
+                last = values[-1] if values else 0
+                lines.append(f"  {key}: {spark} {trend} ({first:.4g}→{last:.4g})")
+            else:
+                lines.append(f"  {key}: (no data)")
+        return "\n".join(lines)
+
+    # JSON-RPC method -> handler taking (self, params)
+    _METHODS = MappingProxyType({
+        "initialize": _initialize,
+        "tools/list": _list_tools,
+        "tools/call": _call_tool,
+    })
+
+    def _respond(self, request: dict) -> dict:
+        """Handle one request and wrap the result in a JSON-RPC 2.0 response."""
+        request = RPCRequest.from_dict(request)
+        handler_response = self.handle_request(request)
+
+        # Construct proper JSON-RPC 2.0 response
+        # The response should be: {"jsonrpc": "2.0", "id": X, "result": {...}}
+        # OR for errors: {"jsonrpc": "2.0", "id": X, "error": {...}}
+        response = {
+            "jsonrpc": "2.0",
+            "id": request.id
+        }
+
+        # handler_response contains either {"result": ...} or {"error": ...}
+        if "error" in handler_response:
+            response["error"] = handler_response["error"]
+        else:
+            response["result"] = handler_response.get("result", handler_response)
+        return response
+
+    def _respond_batch_item(self, request) -> dict:
+        """Respond to one element of a batch, never raising."""
+        if not isinstance(request, dict):
+            return _INVALID_REQUEST
+        try:
+            return self._respond(request)
+        except Exception as e:
+            return _internal_error(request.get("id"), e)
+
+    def _respond_batch(self, requests: list) -> list | dict:
+        """Handle a JSON-RPC batch, running the requests concurrently.
+
+        Tool calls are dominated by file I/O, so independent requests in a
+        batch finish in roughly the time of the slowest one.
+        """
+        if not requests:
+            return _INVALID_REQUEST
+        if len(requests) == 1:
+            return [self._respond_batch_item(requests[0])]
+        # map() preserves order, so responses line up with requests
+        return list(self._pool.map(self._respond_batch_item, requests))
+
     def run(self):
         """Run the MCP server (stdio transport)."""
+        # Work on the underlying binary buffers: frames go straight to the
+        # JSON parser without a UTF-8 decode, and responses are already bytes.
+        stdin = sys.stdin.buffer
+        stdout = sys.stdout.buffer
         while True:
+            line = stdin.readline()
+            if not line:
+                break
+            if line.isspace():
+                continue
+
             try:
-                line = sys.stdin.readline()
-                if not line:
-                    break
-
-                request = json.loads(line)
-                handler_response = self.handle_request(request)
-
-                # Construct proper JSON-RPC 2.0 response
-                # The response should be: {"jsonrpc": "2.0", "id": X, "result": {...}}
-                # OR for errors: {"jsonrpc": "2.0", "id": X, "error": {...}}
-                response = {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id")
-                }
+                request = _json.loads(line)
+            except _json.JSONDecodeError:
+                continue
 
-                # handler_response contains either {"result": ...} or {"error": ...}
-                if "error" in handler_response:
-                    response["error"] = handler_response["error"]
+            try:
+                if isinstance(request, list):
+                    _write_response(stdout, self._respond_batch(request))
                 else:
-                    response["result"] = handler_response.get("result", handler_response)
-
-                sys.stdout.write(json.dumps(response) + "\n")
-                sys.stdout.flush()
-
-            except json.JSONDecodeError:
-                continue
+                    static = self._static_results.get(request.get("method"))
+                    if static is not None:
+                        # Constant result: splice the pre-encoded bytes in
+                        stdout.write(b'{"jsonrpc":"2.0","id":')
+                        stdout.write(_json.dumps(request.get("id")))
+                        stdout.write(b',"result":')
+                        stdout.write(static)
+                        stdout.write(b"}\n")
+                    else:
+                        _write_response(stdout, self._respond(request))
             except Exception as e:
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "id": None,
-                    "error": {"code": -32603, "message": str(e)}
-                }
-                sys.stdout.write(json.dumps(error_response) + "\n")
-                sys.stdout.flush()
+                # Unexpected failure (a bug, not a tool error): report it
+                # against the request so the client is not left waiting.
+                request_id = request.get("id") if isinstance(request, dict) else None
+                _write_response(stdout, _internal_error(request_id, e))
+            stdout.flush()
 
 
 def main():
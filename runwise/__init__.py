@@ -7,16 +7,55 @@ Includes sparkline visualizations and anomaly detection.
 
 __version__ = "0.5.2"
 
-from .anomalies import Anomaly, AnomalyConfig, detect_anomalies, format_anomalies
-from .config import MetricSchema, RunwiseConfig
-from .core import RunAnalyzer
-from .sparklines import (
-    calculate_slope,
-    calculate_windowed_slopes,
-    sparkline,
-    sparkline_with_stats,
-    trend_indicator,
-)
+from typing import TYPE_CHECKING
+
+# Public names are imported lazily (PEP 562) so that `import runwise` stays
+# cheap. The MCP server and CLI only pay for the modules they actually use.
+_LAZY_ATTRS = {
+    # Core
+    "RunAnalyzer": "core",
+    "RunwiseConfig": "config",
+    "MetricSchema": "config",
+    # Sparklines
+    "sparkline": "sparklines",
+    "sparkline_with_stats": "sparklines",
+    "trend_indicator": "sparklines",
+    "calculate_slope": "sparklines",
+    "calculate_windowed_slopes": "sparklines",
+    # Anomaly detection
+    "Anomaly": "anomalies",
+    "AnomalyConfig": "anomalies",
+    "detect_anomalies": "anomalies",
+    "format_anomalies": "anomalies",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Cache so __getattr__ is not hit again
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+if TYPE_CHECKING:
+    from .anomalies import Anomaly, AnomalyConfig, detect_anomalies, format_anomalies
+    from .config import MetricSchema, RunwiseConfig
+    from .core import RunAnalyzer
+    from .sparklines import (
+        calculate_slope,
+        calculate_windowed_slopes,
+        sparkline,
+        sparkline_with_stats,
+        trend_indicator,
+    )
 
 # TensorBoard support is optional - import separately
 # from .tensorboard import TensorBoardParser, TENSORBOARD_AVAILABLE
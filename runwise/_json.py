@@ -0,0 +1,120 @@
+"""
+JSON helpers with optional orjson and simdjson acceleration.
+
+orjson is a C extension that parses and serializes several times faster than
+the stdlib and produces UTF-8 bytes directly. simdjson (pysimdjson) parses
+lazily, so pulling a few fields out of a wide history record skips building
+the rest of it. Both are optional - without them we fall back to the stdlib
+`json` module with the same interface.
+
+Usage:
+    from runwise import _json
+
+    data = _json.loads(line)        # accepts bytes or str
+    payload = _json.dumps(data)     # always returns UTF-8 bytes
+    row = _json.loads_fields(line, ("_step", "loss"))  # only these keys
+"""
+
+import json
+import threading
+from typing import Any
+
+# Try to import orjson - make it optional
+ORJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None  # type: ignore
+
+# Try to import simdjson - make it optional
+SIMDJSON_AVAILABLE = False
+
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    simdjson = None  # type: ignore
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch this regardless of backend.
+JSONDecodeError = json.JSONDecodeError
+
+
+def _stdlib_loads(data: bytes | str) -> Any:
+    try:
+        return json.loads(data)
+    except UnicodeDecodeError as e:
+        raise JSONDecodeError(f"Invalid UTF-8: {e}", "", 0) from e
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+if ORJSON_AVAILABLE:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def loads(data: bytes | str) -> Any:
+        """Parse JSON from bytes or str."""
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity literals, which wandb history files
+            # contain for diverged runs. The stdlib accepts them.
+            return _stdlib_loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to compact UTF-8 JSON bytes."""
+        try:
+            return orjson.dumps(obj, option=_OPTIONS)
+        except TypeError:
+            # e.g. integers wider than 64 bits
+            return _stdlib_dumps(obj)
+else:
+    loads = _stdlib_loads
+    dumps = _stdlib_dumps
+
+
+def _pick_fields(data: bytes | str, fields: tuple[str, ...]) -> dict:
+    record = loads(data)
+    if not isinstance(record, dict):
+        raise JSONDecodeError("Expected a JSON object", "", 0)
+    return {key: record[key] for key in fields if key in record}
+
+
+if SIMDJSON_AVAILABLE:
+    # A simdjson parser can't be shared between threads, and can't be reused
+    # while proxies into its last document are alive - so each thread gets
+    # its own, and values are copied out before returning.
+    _parsers = threading.local()
+
+    def loads_fields(data: bytes | str, fields: tuple[str, ...]) -> dict:
+        """Decode only `fields` of a JSON object; absent fields are omitted."""
+        parser = getattr(_parsers, "parser", None)
+        if parser is None:
+            parser = _parsers.parser = simdjson.Parser()
+        try:
+            doc = parser.parse(data)
+        except ValueError:
+            # Invalid UTF-8, NaN/Infinity literals, ... - let the full
+            # decoder accept or reject it
+            return _pick_fields(data, fields)
+        if not isinstance(doc, simdjson.Object):
+            raise JSONDecodeError("Expected a JSON object", "", 0)
+        record = {}
+        for key in fields:
+            value = doc.get(key, doc)
+            if value is doc:
+                continue
+            if isinstance(value, simdjson.Object):
+                value = value.as_dict()
+            elif isinstance(value, simdjson.Array):
+                value = value.as_list()
+            record[key] = value
+        return record
+else:
+    def loads_fields(data: bytes | str, fields: tuple[str, ...]) -> dict:
+        """Decode only `fields` of a JSON object; absent fields are omitted."""
+        return _pick_fields(data, fields)
@@ -13,6 +13,7 @@ Detection types:
 - Throughput drops (system issues)
 """
 
+from bisect import bisect_left, insort
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -201,18 +202,24 @@ def _detect_spikes(
     anomalies = []
     values = [v for _, v in series]
 
-    # Use sliding window for local anomaly detection
+    # Use sliding window for local anomaly detection. The window is kept
+    # sorted as it slides (one bisect removal and insertion per step), so
+    # the median is a lookup rather than a sort.
     window_size = min(config.spike_window, len(values))
+    window = sorted(values[:window_size])
+    mid = window_size // 2
 
     for i in range(window_size, len(values)):
-        window = values[i - window_size: i]
+        if i > window_size:
+            del window[bisect_left(window, values[i - window_size - 1])]
+            insort(window, values[i - 1])
         current_value = values[i]
         current_step = series[i][0]
 
         # Calculate MAD
-        median = sorted(window)[len(window) // 2]
-        deviations = [abs(v - median) for v in window]
-        mad = sorted(deviations)[len(deviations) // 2]
+        median = window[mid]
+        deviations = sorted([abs(v - median) for v in window])
+        mad = deviations[mid]
 
         if mad == 0:
             continue  # All values identical
@@ -232,8 +239,10 @@ def _detect_spikes(
                         details={"value": current_value, "median": median, "mad_score": score},
                     )
                 )
+                if len(anomalies) == 3:
+                    break  # Limit to first 3 spikes
 
-    return anomalies[:3]  # Limit to first 3 spikes
+    return anomalies
 
 
 def _detect_overfitting(
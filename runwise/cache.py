@@ -0,0 +1,88 @@
+"""
+Persistent result cache for Runwise.
+
+Stores rendered analysis text in a small SQLite database so that repeat
+queries on finished runs - across processes and sessions - skip re-parsing
+the run files. Uses only the stdlib (sqlite3).
+
+The cache is best-effort: if the database cannot be opened or written
+(read-only home directory, locked file, ...), lookups simply miss.
+
+Usage:
+    from runwise.cache import ResultCache
+    from runwise.config import get_cache_dir
+
+    cache = ResultCache(get_cache_dir() / "results.sqlite3")
+    text = cache.get(key)
+    if text is None:
+        text = expensive()
+        cache.set(key, text)
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_TTL = 7 * 86400  # One week
+
+
+class ResultCache:
+    """Thread-safe string key/value store with per-entry expiry."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), timeout=1.0, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        except (OSError, sqlite3.Error):
+            self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if missing or expired."""
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, expires FROM results WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key: str, value: str, expire: float = DEFAULT_TTL) -> None:
+        """Store a value for `expire` seconds."""
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (key, value, expires) VALUES (?, ?, ?)",
+                    (key, value, time.time() + expire),
+                )
+                self._conn.execute("DELETE FROM results WHERE expires < ?", (time.time(),))
+                self._conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+            self._conn = None
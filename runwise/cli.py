@@ -34,16 +34,33 @@ COMMON WORKFLOWS:
 
   # Output formats
   runwise latest --format md          # Markdown for GitHub/Notion
+
+  # Interactive session (config loaded once)
+  runwise shell
 """
 
 import argparse
 import json
+import os
+import re
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+# Try to import pyahocorasick - optional, speeds up key pattern matching
+AHOCORASICK_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None  # type: ignore
 
-from .config import MetricGroup, MetricSchema, RunwiseConfig
-from .core import RunAnalyzer
-from .formatters.markdown import MarkdownFormatter, to_markdown
+# The analyzer modules are imported inside the commands that use them, so
+# `runwise --help` and the non-W&B commands start without loading them.
+if TYPE_CHECKING:
+    from .core import RunAnalyzer
 
 
 def _detect_wandb_project() -> Optional[str]:
@@ -99,7 +116,7 @@ def _detect_wandb_project() -> Optional[str]:
     return None
 
 
-def _no_wandb_runs_message(analyzer: RunAnalyzer) -> str:
+def _no_wandb_runs_message(analyzer: "RunAnalyzer") -> str:
     """Generate helpful message when no W&B runs are found."""
     lines = [
         "No W&B runs found in wandb/ directory.",
@@ -123,7 +140,7 @@ def _no_wandb_runs_message(analyzer: RunAnalyzer) -> str:
     return "\n".join(lines)
 
 
-def _run_not_found_message(run_id: str, analyzer: RunAnalyzer) -> str:
+def _run_not_found_message(run_id: str, analyzer: "RunAnalyzer") -> str:
     """Generate helpful message when a specific run is not found."""
     lines = [f"Run '{run_id}' not found.", ""]
 
@@ -139,7 +156,7 @@ def _run_not_found_message(run_id: str, analyzer: RunAnalyzer) -> str:
     return "\n".join(lines)
 
 
-def cmd_list(analyzer: RunAnalyzer, args):
+def cmd_list(analyzer: "RunAnalyzer", args):
     """List recent W&B runs from local wandb/ directory."""
     runs = analyzer.list_runs(limit=args.limit)
     if runs:
@@ -149,6 +166,7 @@ def cmd_list(analyzer: RunAnalyzer, args):
         # Apply format if requested
         fmt = getattr(args, 'format', None)
         if fmt == 'md':
+            from .formatters.markdown import to_markdown
             output = to_markdown(output, "list")
 
         print(output)
@@ -156,7 +174,7 @@ def cmd_list(analyzer: RunAnalyzer, args):
         print(_no_wandb_runs_message(analyzer))
 
 
-def cmd_latest(analyzer: RunAnalyzer, args):
+def cmd_latest(analyzer: "RunAnalyzer", args):
     """Summarize latest W&B run."""
     run = analyzer.get_latest_run()
     if run:
@@ -176,6 +194,7 @@ def cmd_latest(analyzer: RunAnalyzer, args):
         # Apply format if requested
         fmt = getattr(args, 'format', None)
         if fmt == 'md':
+            from .formatters.markdown import MarkdownFormatter
             formatter = MarkdownFormatter()
             output = formatter.format_run_summary(run, output)
 
@@ -184,7 +203,7 @@ def cmd_latest(analyzer: RunAnalyzer, args):
         print(_no_wandb_runs_message(analyzer))
 
 
-def cmd_run(analyzer: RunAnalyzer, args):
+def cmd_run(analyzer: "RunAnalyzer", args):
     """Summarize specific W&B run."""
     run = analyzer.find_run(args.run_id)
     if run:
@@ -204,6 +223,7 @@ def cmd_run(analyzer: RunAnalyzer, args):
         # Apply format if requested
         fmt = getattr(args, 'format', None)
         if fmt == 'md':
+            from .formatters.markdown import MarkdownFormatter
             formatter = MarkdownFormatter()
             output = formatter.format_run_summary(run, output)
 
@@ -225,7 +245,7 @@ def _parse_run_at_step(run_spec: str) -> tuple[str, int | None]:
     return run_spec, None
 
 
-def cmd_compare(analyzer: RunAnalyzer, args):
+def cmd_compare(analyzer: "RunAnalyzer", args):
     """Compare two W&B runs, optionally at specific steps."""
     # Parse @step syntax from run IDs
     run_id_a, step_a = _parse_run_at_step(args.run_a)
@@ -272,13 +292,14 @@ def cmd_compare(analyzer: RunAnalyzer, args):
     # Apply format if requested
     fmt = getattr(args, 'format', None)
     if fmt == 'md':
+        from .formatters.markdown import MarkdownFormatter
         formatter = MarkdownFormatter()
         output = formatter.format_comparison(output)
 
     print(output)
 
 
-def cmd_config(analyzer: RunAnalyzer, args):
+def cmd_config(analyzer: "RunAnalyzer", args):
     """Show config/hyperparameters for a W&B run."""
     run = analyzer.find_run(args.run_id) if args.run_id else analyzer.get_latest_run()
 
@@ -292,7 +313,7 @@ def cmd_config(analyzer: RunAnalyzer, args):
     print(analyzer.get_config(run))
 
 
-def cmd_notes(analyzer: RunAnalyzer, args):
+def cmd_notes(analyzer: "RunAnalyzer", args):
     """Show run context (name, notes, tags, group) for a W&B run."""
     run = analyzer.find_run(args.run_id) if args.run_id else analyzer.get_latest_run()
 
@@ -306,7 +327,7 @@ def cmd_notes(analyzer: RunAnalyzer, args):
     print(analyzer.get_run_context(run))
 
 
-def cmd_best(analyzer: RunAnalyzer, args):
+def cmd_best(analyzer: "RunAnalyzer", args):
     """Find the best run by a metric."""
     print(analyzer.format_best_run(
         metric=args.metric,
@@ -315,7 +336,7 @@ def cmd_best(analyzer: RunAnalyzer, args):
     ))
 
 
-def cmd_history(analyzer: RunAnalyzer, args):
+def cmd_history(analyzer: "RunAnalyzer", args):
     """Get downsampled training history from a W&B run."""
     run = analyzer.find_run(args.run_id) if args.run_id else analyzer.get_latest_run()
 
@@ -340,7 +361,7 @@ def cmd_history(analyzer: RunAnalyzer, args):
     print(analyzer.get_history(run, keys, samples=args.samples))
 
 
-def cmd_stats(analyzer: RunAnalyzer, args):
+def cmd_stats(analyzer: "RunAnalyzer", args):
     """Get history statistics from a W&B run (even more compact than history)."""
     run = analyzer.find_run(args.run_id) if args.run_id else analyzer.get_latest_run()
 
@@ -365,47 +386,196 @@ def cmd_stats(analyzer: RunAnalyzer, args):
     print(analyzer.get_history_stats(run, keys))
 
 
-def _get_default_metric_keys(analyzer: RunAnalyzer, run) -> list[str]:
-    """Try to auto-detect common metric keys from run history."""
-    # Common metric patterns to look for
-    common_patterns = [
-        "loss", "train/loss", "train_loss",
-        "val_loss", "val/loss", "validation_loss",
-        "accuracy", "train/accuracy", "acc",
-        "val_accuracy", "val/accuracy", "val_acc",
-        "lr", "learning_rate",
-    ]
+# Common metric patterns to look for, in priority order
+_DEFAULT_KEY_PATTERNS = (
+    "loss", "train/loss", "train_loss",
+    "val_loss", "val/loss", "validation_loss",
+    "accuracy", "train/accuracy", "acc",
+    "val_accuracy", "val/accuracy", "val_acc",
+    "lr", "learning_rate",
+)
+_DEFAULT_KEY_PATTERN_SET = frozenset(_DEFAULT_KEY_PATTERNS)
+
+
+@lru_cache(maxsize=1)
+def _pattern_automaton():
+    """Aho-Corasick automaton over _DEFAULT_KEY_PATTERNS (value = pattern index)."""
+    automaton = ahocorasick.Automaton()
+    for index, pattern in enumerate(_DEFAULT_KEY_PATTERNS):
+        automaton.add_word(pattern, index)
+    automaton.make_automaton()
+    return automaton
+
+
+def _first_pattern_index(lowered: str) -> Optional[int]:
+    """Index of the highest-priority pattern contained in `lowered`, or None."""
+    if AHOCORASICK_AVAILABLE:
+        # One pass over the key finds every contained pattern
+        return min((index for _, index in _pattern_automaton().iter(lowered)), default=None)
+    for index, pattern in enumerate(_DEFAULT_KEY_PATTERNS):
+        if pattern in lowered:
+            return index
+    return None
+
+
+# A JSON string (with escapes) or a structural character. Everything else -
+# numbers, literals, commas, whitespace - is skipped by finditer.
+_JSON_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]:]')
+
+
+def _top_level_keys(line: bytes) -> list[str]:
+    """
+    Extract the keys of a JSON object without decoding its values.
+
+    Strings are matched whole, so braces and colons inside them are ignored.
+    A string at depth 1 followed by ':' is a key. Malformed input yields
+    whatever keys were seen before the damage.
+    """
+    keys = []
+    depth = 0
+    pending = None
+    for match in _JSON_TOKEN.finditer(line):
+        token = match.group()
+        first = token[0]
+        if first == 0x22:  # '"'
+            pending = token if depth == 1 else None
+        elif first == 0x3A:  # ':'
+            if pending is not None:
+                if b"\\" in pending:
+                    try:
+                        keys.append(json.loads(pending))
+                    except ValueError:
+                        return keys  # Damaged escape
+                else:
+                    keys.append(pending[1:-1].decode("utf-8", "replace"))
+            pending = None
+        else:
+            depth += 1 if first in b"{[" else -1
+            pending = None
+    return keys
+
+
+# On-disk cache of auto-detected keys: {history path: {mtime_ns, size, keys}}
+_KEY_CACHE_FILE = "default_keys.json"
+_KEY_CACHE_MAX_ENTRIES = 256
+
+
+def _load_key_cache(path: Path) -> dict:
+    try:
+        with open(path, 'rb') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_key_cache(path: Path, cache: dict) -> None:
+    # Drop the oldest entries (dicts keep insertion order)
+    while len(cache) > _KEY_CACHE_MAX_ENTRIES:
+        cache.pop(next(iter(cache)))
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w') as f:
+            f.write(json.dumps(cache, separators=(",", ":")))
+        os.replace(tmp, path)  # Atomic, so concurrent CLIs never see half a file
+    except OSError:
+        pass
+
+
+def _get_default_metric_keys(analyzer: "RunAnalyzer", run) -> list[str]:
+    """
+    Try to auto-detect common metric keys from run history.
+
+    Results are cached on disk keyed by the history file's path, mtime and
+    size, so repeat CLI calls on an unchanged run skip reading it.
+    """
+    from .config import get_cache_dir
 
-    # Get available keys from the run
-    available = set()
     history_file = run.directory / "files" / "wandb-history.jsonl"
-    if history_file.exists():
-        import json
-        with open(history_file, 'r') as f:
-            for i, line in enumerate(f):
-                if i >= 5:  # Only check first few lines
-                    break
-                try:
-                    record = json.loads(line.strip())
-                    available.update(k for k in record.keys() if not k.startswith("_"))
-                except Exception:
-                    continue
-
-    # Find matching keys
-    found_keys = []
-    for pattern in common_patterns:
-        if pattern in available:
-            found_keys.append(pattern)
-        # Also check for partial matches
-        for key in available:
-            if pattern in key.lower() and key not in found_keys:
-                found_keys.append(key)
+    try:
+        st = os.stat(history_file)
+    except OSError:
+        return []
+    if st.st_size < 4:
+        # Empty or just-created history (e.g. a run that has only started)
+        # has no keys; skip the cache and the read.
+        return []
+
+    cache_path = get_cache_dir() / _KEY_CACHE_FILE
+    cache = _load_key_cache(cache_path)
+    cache_key = os.path.abspath(history_file)
+    entry = cache.get(cache_key)
+    if (
+        isinstance(entry, dict)
+        and entry.get("mtime_ns") == st.st_mtime_ns
+        and entry.get("size") == st.st_size
+        and isinstance(entry.get("keys"), list)
+    ):
+        return entry["keys"]
+
+    keys = _detect_default_keys(history_file)
+    cache.pop(cache_key, None)  # Re-insert as newest
+    cache[cache_key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "keys": keys}
+    _save_key_cache(cache_path, cache)
+    return keys
+
+
+_HEAD_CHUNK = 65536
+
+
+def _head_lines(path: Path, count: int) -> list[bytes]:
+    """
+    Return the first `count` lines of a file.
+
+    Reads in 64 KB chunks (usually just one) rather than line by line; only
+    very long records need a further read.
+    """
+    data = b""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(_HEAD_CHUNK)
+            data += chunk
+            if not chunk or data.count(b"\n") >= count:
+                break
+    return data.split(b"\n", count)[:count]
+
+
+def _detect_default_keys(history_file: Path) -> list[str]:
+    """Pick up to 6 common metric keys from the first lines of a history file."""
+    # Get available keys from the run (insertion-ordered for stable output).
+    # Only key names are needed, so scan the raw bytes instead of parsing
+    # every value.
+    available: dict[str, None] = {}
+    for line in _head_lines(history_file, 5):  # Only check first few lines
+        for key in _top_level_keys(line):
+            if not key.startswith("_"):
+                available[key] = None
+
+    # Rank each key by the first pattern it contains. Within a group the
+    # pattern itself comes first, then keys that are other known patterns
+    # (e.g. "train/loss" under "loss"), then any other key containing it.
+    # Each key is lowercased once.
+    ranked = []
+    for key in available:
+        lowered = key.lower()
+        index = _first_pattern_index(lowered)
+        if index is None:
+            continue
+        if lowered == _DEFAULT_KEY_PATTERNS[index]:
+            tier = 0
+        elif lowered in _DEFAULT_KEY_PATTERN_SET:
+            tier = 1
+        else:
+            tier = 2
+        ranked.append((index, tier, key))
+    ranked.sort(key=lambda item: item[:2])  # Stable: ties keep file order
 
     # Limit to reasonable number
-    return found_keys[:6]
+    return [key for _, _, key in ranked[:6]]
 
 
-def cmd_keys(analyzer: RunAnalyzer, args):
+def cmd_keys(analyzer: "RunAnalyzer", args):
     """List available metric keys in a W&B run."""
     run = analyzer.find_run(args.run_id) if args.run_id else analyzer.get_latest_run()
 
@@ -419,7 +589,7 @@ def cmd_keys(analyzer: RunAnalyzer, args):
     print(analyzer.list_available_keys(run))
 
 
-def cmd_stability(analyzer: RunAnalyzer, args):
+def cmd_stability(analyzer: "RunAnalyzer", args):
     """Analyze training stability using rolling standard deviation."""
     run = analyzer.find_run(args.run_id) if args.run_id else analyzer.get_latest_run()
 
@@ -452,12 +622,12 @@ def cmd_stability(analyzer: RunAnalyzer, args):
         print(analyzer.get_stability_analysis(run, keys, window=window))
 
 
-def cmd_live(analyzer: RunAnalyzer, args):
+def cmd_live(analyzer: "RunAnalyzer", args):
     """Show live training status."""
     print(analyzer.get_live_status())
 
 
-def cmd_sync(analyzer: RunAnalyzer, args):
+def cmd_sync(analyzer: "RunAnalyzer", args):
     """Sync W&B runs to recover missing history data."""
     import subprocess
     import shutil
@@ -530,7 +700,7 @@ def cmd_sync(analyzer: RunAnalyzer, args):
             print("All runs have history files.")
 
 
-def cmd_find(analyzer: RunAnalyzer, args):
+def cmd_find(analyzer: "RunAnalyzer", args):
     """Find runs by name, tag, or pattern."""
     pattern = args.pattern.lower()
     matches = []
@@ -577,7 +747,7 @@ def cmd_find(analyzer: RunAnalyzer, args):
         print("Search looks in: run name, ID, tags, group, and notes")
 
 
-def cmd_watch(analyzer: RunAnalyzer, args):
+def cmd_watch(analyzer: "RunAnalyzer", args):
     """Watch live training output with formatted metrics."""
     import time
     import sys
@@ -632,7 +802,7 @@ def cmd_watch(analyzer: RunAnalyzer, args):
         print("\n\nStopped watching.")
 
 
-def cmd_local(analyzer: RunAnalyzer, args):
+def cmd_local(analyzer: "RunAnalyzer", args):
     """List or analyze local JSONL log files."""
     # If no file specified, list available logs
     if not args.file:
@@ -641,13 +811,12 @@ def cmd_local(analyzer: RunAnalyzer, args):
             print("LOCAL LOGS (in logs/ directory):")
             print("")
             for log in logs[:15]:
-                records = analyzer.parse_local_log(log)
-                if records:
-                    max_step = max(r.get("step", r.get("_step", 0)) for r in records)
+                count, max_step, first_keys = analyzer.quick_log_stats(log)
+                if count:
                     # Show some available keys
-                    sample_keys = [k for k in records[0].keys() if not k.startswith("_")][:5]
+                    sample_keys = [k for k in first_keys if not k.startswith("_")][:5]
                     keys_hint = ", ".join(sample_keys)
-                    print(f"  {log.name}: {len(records)} records, step {max_step}")
+                    print(f"  {log.name}: {count} records, step {max_step}")
                     print(f"    keys: {keys_hint}...")
                 else:
                     print(f"  {log.name}: empty")
@@ -725,8 +894,10 @@ def cmd_local(analyzer: RunAnalyzer, args):
     print(analyzer.summarize_local_log(log_file))
 
 
-def cmd_init(analyzer: RunAnalyzer, args):
+def cmd_init(analyzer: Optional["RunAnalyzer"], args):
     """Initialize runwise.json configuration."""
+    from .config import MetricGroup, MetricSchema, RunwiseConfig
+
     config_path = Path("runwise.json")
     if config_path.exists() and not args.force:
         print("runwise.json already exists. Use --force to overwrite.")
@@ -761,7 +932,7 @@ def cmd_init(analyzer: RunAnalyzer, args):
     print("Edit this file to customize metrics for your project.")
 
 
-def cmd_tb(analyzer: RunAnalyzer, args):
+def cmd_tb(analyzer: Optional["RunAnalyzer"], args):
     """List or analyze TensorBoard runs."""
     from .tensorboard import TENSORBOARD_AVAILABLE, TensorBoardParser
 
@@ -798,7 +969,7 @@ def cmd_tb(analyzer: RunAnalyzer, args):
         print(f"Error reading TensorBoard logs: {e}")
 
 
-def cmd_api(analyzer: RunAnalyzer, args):
+def cmd_api(analyzer: Optional["RunAnalyzer"], args):
     """Access W&B runs via cloud API."""
     from .wandb_api import WANDB_API_AVAILABLE, WandbAPIClient
 
@@ -972,48 +1143,63 @@ def cmd_api(analyzer: RunAnalyzer, args):
             print("  3. Check project/entity names are correct")
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Runwise: Token-efficient ML training run analysis for AI agents",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-DATA SOURCES (choose based on your setup):
+def cmd_shell(analyzer: "RunAnalyzer", args):
+    """
+    Interactive prompt that runs commands in-process.
 
-  W&B Local (default) - reads from local wandb/ directory:
-    runwise list                # List runs
-    runwise latest              # Analyze latest run
-    runwise run <id>            # Analyze specific run
-    runwise history -k loss     # Get training history
+    Config detection and interpreter start-up happen once for the session
+    instead of once per command.
+    """
+    import shlex
 
-  Local JSONL - for standalone log files (not W&B):
-    runwise local               # List files in logs/
-    runwise local <file> --keys # List available metrics
-    runwise local <file> --history -k loss,val_loss
+    print("runwise shell - enter commands without the 'runwise' prefix "
+          "(e.g. 'list', 'history -k loss'). 'help' lists commands, 'exit' quits.")
+    while True:
+        try:
+            line = input("runwise> ")
+        except (EOFError, KeyboardInterrupt):
+            print("")
+            return
 
-  W&B Cloud API - when no local files (requires: pip install wandb):
-    runwise api -p <project>    # List runs from cloud
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            print(f"Error: {e}")
+            continue
+        if not argv:
+            continue
+        if argv[0] in ("exit", "quit"):
+            return
+        if argv[0] == "help":
+            _build_parser().print_help()
+            continue
+        if argv[0] == "shell":
+            print("Already in the runwise shell")
+            continue
 
-  TensorBoard - for tfevents files (requires: pip install tensorboard):
-    runwise tb                  # List TB runs
+        parser = _build_parser(argv[0] if argv[0] in _COMMANDS else None)
+        try:
+            cmd_args = parser.parse_args(argv)
+        except SystemExit:
+            continue  # argparse already printed the usage error or help
+        if not cmd_args.command:
+            continue
 
-TIPS FOR AI AGENTS:
-  - Always run 'runwise keys' or 'runwise local <file> --keys' first
-    to discover available metric names before querying history/stats
-  - Use --format md for output suitable for GitHub issues or documentation
-  - The 'history' and 'stats' commands require -k to specify metric keys
-        """
-    )
+        try:
+            cmd_args.func(analyzer, cmd_args)
+        except Exception as e:
+            print(f"Error: {e}")
 
-    subparsers = parser.add_subparsers(dest="command", help="Command to run")
 
-    # list
+def _add_list_parser(subparsers):
     p_list = subparsers.add_parser("list", help="List recent runs with sparkline trends")
     p_list.add_argument("-n", "--limit", type=int, default=15, help="Number of runs to show")
     p_list.add_argument("--no-spark", action="store_true", help="Disable sparklines (faster)")
     p_list.add_argument("--format", choices=["text", "md"], default="text",
                         help="Output format (default: text, md for Markdown)")
 
-    # latest
+
+def _add_latest_parser(subparsers):
     p_latest = subparsers.add_parser(
         "latest",
         help="Summarize latest run with anomaly detection",
@@ -1033,7 +1219,8 @@ Examples:
     p_latest.add_argument("--format", choices=["text", "md"], default="text",
                           help="Output format (default: text, md for Markdown)")
 
-    # run
+
+def _add_run_parser(subparsers):
     p_run = subparsers.add_parser(
         "run",
         help="Summarize specific run",
@@ -1053,7 +1240,8 @@ Examples:
     p_run.add_argument("--format", choices=["text", "md"], default="text",
                        help="Output format (default: text, md for Markdown)")
 
-    # compare
+
+def _add_compare_parser(subparsers):
     p_compare = subparsers.add_parser(
         "compare",
         help="Compare two runs",
@@ -1085,33 +1273,39 @@ Examples:
     p_compare.add_argument("--format", choices=["text", "md"], default="text",
                            help="Output format (default: text, md for Markdown)")
 
-    # config
+
+def _add_config_parser(subparsers):
     p_config = subparsers.add_parser("config", help="Show hyperparameters/config for a run")
     p_config.add_argument("run_id", nargs="?", help="Run ID (uses latest if omitted)")
 
-    # notes
+
+def _add_notes_parser(subparsers):
     p_notes = subparsers.add_parser("notes", help="Show run context (name, notes, tags, group)")
     p_notes.add_argument("run_id", nargs="?", help="Run ID (uses latest if omitted)")
 
-    # best
+
+def _add_best_parser(subparsers):
     p_best = subparsers.add_parser("best", help="Find the best run by a metric")
     p_best.add_argument("metric", help="Metric to compare (e.g., 'val_loss', 'accuracy')")
     p_best.add_argument("-n", "--limit", type=int, default=10, help="Number of runs to consider (default: 10)")
     p_best.add_argument("--max", dest="higher_is_better", action="store_true",
                         help="Higher values are better (default: lower is better)")
 
-    # history (downsampled)
+
+def _add_history_parser(subparsers):
     p_history = subparsers.add_parser("history", help="Get downsampled training history (CSV)")
     p_history.add_argument("run_id", nargs="?", help="Run ID (uses latest if omitted)")
     p_history.add_argument("-k", "--keys", help="Comma-separated metric keys (auto-detects if omitted)")
     p_history.add_argument("-n", "--samples", type=int, default=500, help="Number of samples (default: 500)")
 
-    # stats (even more compact)
+
+def _add_stats_parser(subparsers):
     p_stats = subparsers.add_parser("stats", help="Get history statistics (min/max/mean)")
     p_stats.add_argument("run_id", nargs="?", help="Run ID (uses latest if omitted)")
     p_stats.add_argument("-k", "--keys", help="Comma-separated metric keys (auto-detects if omitted)")
 
-    # stability (rolling std dev analysis)
+
+def _add_stability_parser(subparsers):
     p_stability = subparsers.add_parser(
         "stability",
         help="Analyze training stability (rolling std dev)",
@@ -1143,14 +1337,17 @@ Examples:
     p_stability.add_argument("-n", "--samples", type=int, default=100,
                              help="Number of CSV rows when using --csv (default: 100)")
 
-    # keys (list available)
+
+def _add_keys_parser(subparsers):
     p_keys = subparsers.add_parser("keys", help="List available metric keys in a run")
     p_keys.add_argument("run_id", nargs="?", help="Run ID (uses latest if omitted)")
 
-    # live
+
+def _add_live_parser(subparsers):
     subparsers.add_parser("live", help="Show live training status")
 
-    # sync
+
+def _add_sync_parser(subparsers):
     p_sync = subparsers.add_parser(
         "sync",
         help="Sync W&B runs to recover missing history data",
@@ -1170,7 +1367,8 @@ Examples:
     p_sync.add_argument("run_id", nargs="?", help="Run ID to sync (optional)")
     p_sync.add_argument("--all", action="store_true", help="Sync all unsynced runs")
 
-    # find
+
+def _add_find_parser(subparsers):
     p_find = subparsers.add_parser(
         "find",
         help="Find runs by name, tag, or pattern",
@@ -1186,7 +1384,8 @@ Examples:
     p_find.add_argument("pattern", help="Pattern to search for (case-insensitive)")
     p_find.add_argument("-n", "--limit", type=int, default=50, help="Max runs to search (default: 50)")
 
-    # watch
+
+def _add_watch_parser(subparsers):
     p_watch = subparsers.add_parser(
         "watch",
         help="Watch live training output (tail -f with formatting)",
@@ -1207,7 +1406,8 @@ Examples:
     p_watch.add_argument("run_id", nargs="?", help="Run ID to watch (uses latest if omitted)")
     p_watch.add_argument("-i", "--interval", type=float, default=1.0, help="Update interval in seconds (default: 1.0)")
 
-    # local
+
+def _add_local_parser(subparsers):
     p_local = subparsers.add_parser(
         "local",
         help="Analyze local JSONL log files (not W&B runs)",
@@ -1242,17 +1442,20 @@ Examples:
     p_local.add_argument("-w", "--window", type=int, default=100,
                          help="Rolling window size for --stability (default: 100)")
 
-    # init
+
+def _add_init_parser(subparsers):
     p_init = subparsers.add_parser("init", help="Initialize configuration")
     p_init.add_argument("--name", help="Project name")
     p_init.add_argument("--force", action="store_true", help="Overwrite existing config")
 
-    # TensorBoard
+
+def _add_tb_parser(subparsers):
     p_tb = subparsers.add_parser("tb", help="List/analyze TensorBoard runs (requires tensorboard)")
     p_tb.add_argument("--log-dir", "-d", help="TensorBoard log directory (default: current)")
     p_tb.add_argument("--run", "-r", dest="run_id", help="Specific run to analyze")
 
-    # W&B API
+
+def _add_api_parser(subparsers):
     p_api = subparsers.add_parser(
         "api",
         help="Access W&B runs via cloud API (requires wandb)",
@@ -1296,46 +1499,131 @@ Examples:
     p_api.add_argument("-d", "--diff", action="store_true",
                        help="Show config differences (for comparison)")
 
-    args = parser.parse_args()
 
-    if not args.command:
-        parser.print_help()
-        return
+def _add_shell_parser(subparsers):
+    subparsers.add_parser(
+        "shell",
+        help="Interactive prompt that keeps config loaded between commands",
+        description="""Run several commands in one session.
+
+Config is detected once, and each command skips interpreter start-up.
+
+Examples:
+  runwise shell
+  runwise> list
+  runwise> history -k loss,val_loss
+  runwise> exit
+""",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+
+# Command name -> (subparser builder, handler)
+_COMMANDS = {
+    "list": (_add_list_parser, cmd_list),
+    "latest": (_add_latest_parser, cmd_latest),
+    "run": (_add_run_parser, cmd_run),
+    "compare": (_add_compare_parser, cmd_compare),
+    "config": (_add_config_parser, cmd_config),
+    "notes": (_add_notes_parser, cmd_notes),
+    "best": (_add_best_parser, cmd_best),
+    "history": (_add_history_parser, cmd_history),
+    "stats": (_add_stats_parser, cmd_stats),
+    "stability": (_add_stability_parser, cmd_stability),
+    "keys": (_add_keys_parser, cmd_keys),
+    "live": (_add_live_parser, cmd_live),
+    "sync": (_add_sync_parser, cmd_sync),
+    "find": (_add_find_parser, cmd_find),
+    "watch": (_add_watch_parser, cmd_watch),
+    "local": (_add_local_parser, cmd_local),
+    "init": (_add_init_parser, cmd_init),
+    "tb": (_add_tb_parser, cmd_tb),
+    "api": (_add_api_parser, cmd_api),
+    "shell": (_add_shell_parser, cmd_shell),
+}
+
+
+# Commands that do not read local runs, so skip config detection for them
+_NO_ANALYZER = frozenset({"init", "tb", "api"})
+
+
+@lru_cache(maxsize=1)
+def _load_config():
+    """Auto-detect the project config (once per process)."""
+    from .config import RunwiseConfig
 
-    # Initialize analyzer
     try:
-        config = RunwiseConfig.auto_detect()
+        return RunwiseConfig.auto_detect()
     except Exception as e:
         print(f"Warning: Could not auto-detect config: {e}")
-        config = RunwiseConfig()
-
-    analyzer = RunAnalyzer(config)
-
-    # Dispatch command
-    commands = {
-        "list": cmd_list,
-        "latest": cmd_latest,
-        "run": cmd_run,
-        "compare": cmd_compare,
-        "config": cmd_config,
-        "notes": cmd_notes,
-        "best": cmd_best,
-        "history": cmd_history,
-        "stats": cmd_stats,
-        "stability": cmd_stability,
-        "keys": cmd_keys,
-        "live": cmd_live,
-        "sync": cmd_sync,
-        "find": cmd_find,
-        "watch": cmd_watch,
-        "local": cmd_local,
-        "init": cmd_init,
-        "tb": cmd_tb,
-        "api": cmd_api,
-    }
-
-    if args.command in commands:
-        commands[args.command](analyzer, args)
+        return RunwiseConfig()
+
+
+def _make_analyzer() -> "RunAnalyzer":
+    from .core import RunAnalyzer
+
+    return RunAnalyzer(_load_config())
+
+
+def _build_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """
+    Build the argument parser.
+
+    With `command`, only that subcommand's parser is registered - building all
+    of them is wasted work for a normal invocation. Without it (help, no
+    command, unknown command) every subcommand is registered.
+    """
+    parser = argparse.ArgumentParser(
+        description="Runwise: Token-efficient ML training run analysis for AI agents",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+DATA SOURCES (choose based on your setup):
+
+  W&B Local (default) - reads from local wandb/ directory:
+    runwise list                # List runs
+    runwise latest              # Analyze latest run
+    runwise run <id>            # Analyze specific run
+    runwise history -k loss     # Get training history
+
+  Local JSONL - for standalone log files (not W&B):
+    runwise local               # List files in logs/
+    runwise local <file> --keys # List available metrics
+    runwise local <file> --history -k loss,val_loss
+
+  W&B Cloud API - when no local files (requires: pip install wandb):
+    runwise api -p <project>    # List runs from cloud
+
+  TensorBoard - for tfevents files (requires: pip install tensorboard):
+    runwise tb                  # List TB runs
+
+TIPS FOR AI AGENTS:
+  - Always run 'runwise keys' or 'runwise local <file> --keys' first
+    to discover available metric names before querying history/stats
+  - Use --format md for output suitable for GitHub issues or documentation
+  - The 'history' and 'stats' commands require -k to specify metric keys
+        """
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+    for name, (add_parser, handler) in _COMMANDS.items():
+        if command is None or name == command:
+            add_parser(subparsers)
+            subparsers.choices[name].set_defaults(func=handler)
+    return parser
+
+
+def main():
+    argv = sys.argv[1:]
+    command = argv[0] if argv and argv[0] in _COMMANDS else None
+    parser = _build_parser(command)
+    args = parser.parse_args(argv)
+
+    if not args.command:
+        parser.print_help()
+        return
+
+    analyzer = None if args.command in _NO_ANALYZER else _make_analyzer()
+    args.func(analyzer, args)
 
 
 if __name__ == "__main__":
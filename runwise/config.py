@@ -101,6 +101,17 @@ class MetricSchema:
         )
 
 
+def get_cache_dir() -> Path:
+    """
+    Directory for Runwise's on-disk caches.
+
+    Uses RUNWISE_CACHE_DIR if set, otherwise ~/.cache/runwise.
+    """
+    if env_cache := os.environ.get("RUNWISE_CACHE_DIR"):
+        return Path(env_cache)
+    return Path.home() / ".cache" / "runwise"
+
+
 @dataclass
 class RunwiseConfig:
     """
@@ -128,13 +139,16 @@ class RunwiseConfig:
     downsample_interval: int = 1000  # For training curves
     max_validation_history: int = 10  # How many val results to show
 
+    # I/O settings
+    io_workers: int = 8  # Threads used to parse run directories (1 = serial)
+
     @classmethod
     def auto_detect(cls, project_root: Optional[Path] = None) -> "RunwiseConfig":
         """
         Auto-detect configuration from project structure.
 
         Looks for:
-        1. runwise.json in project root
+        1. runwise.json in project root (or the file named by RUNWISE_CONFIG_PATH)
         2. wandb/ directory
         3. logs/ directory
         """
@@ -144,13 +158,17 @@ class RunwiseConfig:
         config = cls()
 
         # Check for config file
-        config_file = project_root / "runwise.json"
+        if env_config := os.environ.get("RUNWISE_CONFIG_PATH"):
+            config_file = Path(env_config)
+        else:
+            config_file = project_root / "runwise.json"
         if config_file.exists():
             with open(config_file) as f:
                 data = json.load(f)
 
             config.project_name = data.get("project_name", config.project_name)
             config.downsample_interval = data.get("downsample_interval", config.downsample_interval)
+            config.io_workers = data.get("io_workers", config.io_workers)
 
             if "wandb_dir" in data:
                 config.wandb_dir = project_root / data["wandb_dir"]
@@ -224,6 +242,7 @@ class RunwiseConfig:
             "wandb_dir": str(self.wandb_dir),
             "logs_dir": str(self.logs_dir),
             "downsample_interval": self.downsample_interval,
+            "io_workers": self.io_workers,
             "schema_inline": {
                 "loss_key": self.schema.loss_key,
                 "step_key": self.schema.step_key,
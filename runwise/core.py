@@ -10,16 +10,521 @@ Provides the main RunAnalyzer class that handles:
 - Anomaly detection
 """
 
-import json
+import mmap
+import os
 import re
-from dataclasses import dataclass
+import stat
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+from . import _json
 from .anomalies import detect_anomalies, format_anomalies
 from .config import RunwiseConfig
 from .sparklines import calculate_slope, sparkline, trend_indicator
 
+# Try to import PyYAML - optional, parses config.yaml in C when built with libyaml
+YAML_AVAILABLE = False
+
+try:
+    import yaml
+    try:
+        from yaml import CSafeLoader as _YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader  # type: ignore
+    YAML_AVAILABLE = True
+except ImportError:
+    yaml = None  # type: ignore
+
+# Try to import pyahocorasick - optional, matches many keys in one pass
+AHOCORASICK_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None  # type: ignore
+
+# Integer "step"/"_step" field of a JSONL record, for reading steps without
+# decoding the whole line.
+_STEP_FIELD_RE = re.compile(rb'"(_?step)"\s*:\s*(-?\d+)\s*[,}]')
+
+# A JSON object key not starting with "_". Keys always follow "{" or ",", so
+# a line with no match has only internal keys (strings inside arrays can
+# also match, which just means the line gets decoded).
+_PUBLIC_KEY_RE = re.compile(rb'[{,]\s*"(?!_)')
+
+# W&B run directory name, e.g. run-20251212_191603-iustpqgf
+_RUN_DIR_RE = re.compile(r'run-(\d{8})_(\d{6})-(\w+)')
+
+# "Step 1000" / "step: 1000" in plain-text output logs
+_STEP_TEXT_RE = re.compile(r'[Ss]tep[:\s]+(\d+)')
+
+# Live status metrics, fused into one alternation so each output.log line
+# is scanned once. The keywords can't overlap, so finditer sees every match
+# the separate searches would.
+_LIVE_METRIC_RE = re.compile(
+    r'[Ss]tep[:\s]+(?P<step>\d+)'
+    r'|[Ll]oss[:\s]+(?P<loss>[\d.]+)'
+    r'|[Aa]cc(?:uracy)?[:\s]+(?P<acc>[\d.]+)'
+    r'|[Ll][Rr][:\s]+(?P<lr>[\d.e+-]+)'
+)
+
+# "Val (Easy) | Token Acc: 0.987 | Seq Acc: 0.941" validation summaries
+_VAL_LINE_RE = re.compile(r'Val\s*\(([^)]+)\)\s*\|(.+)')
+_VAL_TOKEN_RE = re.compile(r'[Tt]oken[^:]*:\s*([\d.]+)%?')
+_VAL_SEQ_RE = re.compile(r'[Ss]eq[^:]*:\s*([\d.]+)%?')
+
+
+
+_COUNT_CHUNK = 1 << 20
+_SKIP_CHUNK = 64 * 1024
+
+
+def _count_lines(data) -> int:
+    """Count lines in a bytes-like buffer (e.g. an mmap), like `for _ in f`."""
+    # mmap has no count() before Python 3.13, so count 1 MB slices
+    total = 0
+    for start in range(0, len(data), _COUNT_CHUNK):
+        total += data[start:start + _COUNT_CHUNK].count(b"\n")
+    if len(data) and data[-1:] != b"\n":
+        total += 1  # Final line without a newline
+    return total
+
+
+def _sample_indices(total: int, samples: int) -> list[int]:
+    """
+    Evenly spaced line indices, including the first and last line.
+
+    Returned ascending and without duplicates (the stride exceeds 1 when
+    total > samples), so callers can walk them as a cursor.
+    """
+    if total <= samples:
+        return list(range(total))
+    if samples < 2:
+        return list(range(samples))
+    return [int(i * (total - 1) / (samples - 1)) for i in range(samples)]
+
+
+# Line counts of recently sampled files, keyed by (path, mtime_ns, size)
+_LINE_COUNT_CACHE_SIZE = 64
+_line_counts: dict[tuple, int] = {}
+# Shared by every analyzer and MCP server worker thread
+_line_counts_lock = threading.Lock()
+
+
+def _read_sampled_lines(path: Path, samples: int) -> tuple[int, list[tuple[int, bytes]]]:
+    """
+    Read evenly spaced lines of a file without iterating the rest.
+
+    The file is memory-mapped: lines are counted with C-level counts over
+    1 MB slices, then only the sampled lines are sliced out. Both passes
+    are sequential, and gaps between samples are skipped a block at a
+    time (one C-level count per block) rather than line by line. The
+    count is remembered per (path, mtime, size), so resampling an
+    unchanged file only pays for the second pass.
+
+    Returns:
+        (total_lines, [(line_number, line_bytes), ...])
+    """
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        size = st.st_size
+        if size == 0:
+            return 0, []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Repeat samples of an unchanged file (other keys or sample
+            # counts) reuse its line count instead of rescanning it
+            count_key = (path, st.st_mtime_ns, size)
+            total = _line_counts.get(count_key)
+            if total is None:
+                total = _count_lines(mm)
+                with _line_counts_lock:
+                    if len(_line_counts) >= _LINE_COUNT_CACHE_SIZE:
+                        _line_counts.pop(next(iter(_line_counts)), None)
+                    _line_counts[count_key] = total
+            wanted = _sample_indices(total, samples)
+            lines = []
+            line_num = 0  # Line containing pos
+            pos = 0
+            for index in wanted:
+                # Skip whole blocks that end before the target line starts
+                while pos < size:
+                    end = min(pos + _SKIP_CHUNK, size)
+                    newlines = mm[pos:end].count(b"\n")
+                    if line_num + newlines >= index:
+                        break
+                    line_num += newlines
+                    pos = end
+                while line_num < index:
+                    pos = mm.find(b"\n", pos) + 1
+                    line_num += 1
+                end = mm.find(b"\n", pos)
+                lines.append((index, mm[pos:] if end == -1 else mm[pos:end]))
+            return total, lines
+
+
+def _iter_lines(path: Path) -> Iterator[bytes]:
+    """
+    Iterate the lines of a file, newlines included, via a read-only mmap.
+
+    mmap.readline slices each line straight out of the mapped pages, which
+    skips the buffered reader's extra copy in `for line in f`.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter(mm.readline, b"")
+
+
+def _read_tail_lines(path: Path, count: int, block: int = 64 * 1024) -> list[str]:
+    """
+    Read the last `count` lines of a text file without reading the rest.
+
+    Reads a block from the end of the file, doubling it until it holds
+    `count` whole lines. Lines are split like text-mode iteration (on
+    \\n, \\r\\n or a bare \\r, as progress bars write) and returned
+    without line endings.
+    """
+    if count <= 0:
+        return []
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        while True:
+            block = min(block, size)
+            f.seek(size - block)
+            text = f.read(block).decode("utf-8", "replace")
+            lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+            if lines[-1] == "":
+                lines.pop()  # Trailing newline
+            # Unless the block reaches the start of the file, its first
+            # line may be partial and doesn't count
+            if block == size or len(lines) > count:
+                return lines[-count:]
+            block *= 2
+
+
+def _read_edge_lines(path: Path, block: int = 64 * 1024) -> tuple[list[bytes], bool]:
+    """
+    Read the complete lines within the first and last `block` bytes of a file.
+
+    Returns (lines, whole), where `whole` is True if the two blocks cover
+    the entire file and every line was returned.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= 2 * block:
+            return f.read().split(b"\n"), True
+        head = f.read(block)
+        f.seek(size - block)
+        tail = f.read(block)
+    # The last line of the head and the first line of the tail may be partial
+    return head.split(b"\n")[:-1] + tail.split(b"\n")[1:], False
+
+
+def _latest_marker_target(latest: Path) -> Optional[Path]:
+    """
+    The run directory named by a latest-run marker file, or None.
+
+    latest-run is normally a symlink. Where symlinks are unavailable (e.g.
+    Windows without developer mode) it may instead be a small text file
+    holding the run directory's name.
+    """
+    try:
+        name = latest.read_text().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    target = latest.parent / name
+    return target if name and target.is_dir() else None
+
+
+def _latest_run_dir(wandb_dir: Path) -> Optional[Path]:
+    """The resolved run directory wandb/latest-run points at, or None."""
+    latest = wandb_dir / "latest-run"
+    try:
+        if latest.is_dir():
+            return latest.resolve()
+    except OSError:
+        return None
+    if latest.is_file():
+        return _latest_marker_target(latest)
+    return None
+
+
+# Files whose contents feed a parsed RunInfo. A cached RunInfo is reused only
+# while all of them are unchanged.
+_RUN_FILES = (
+    "wandb-summary.json",
+    "wandb-metadata.json",
+    "config.yaml",
+    "wandb-history.jsonl",
+)
+
+
+# Max sampled histories kept per analyzer (oldest evicted first)
+_HISTORY_CACHE_SIZE = 32
+
+
+def _file_stamp(path: Path) -> Optional[tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _key_needles(keys: Iterable[str]) -> Optional[tuple[bytes, ...]]:
+    """
+    Quoted byte forms of metric keys, for checking whether a raw JSONL line
+    can contain them.
+
+    Returns None if any key could be written with JSON escapes, in which
+    case a substring check could miss it.
+    """
+    needles = []
+    for key in keys:
+        if not key.isascii() or not key.isprintable() or '"' in key or "\\" in key:
+            return None
+        needles.append(b'"' + key.encode() + b'"')
+    return tuple(needles)
+
+
+def _keys_absent_from(path: Path, keys: Iterable[str]) -> set[str]:
+    """
+    Keys whose quoted name never appears in a JSONL file.
+
+    Found with C-level byte searches over the mapped file, without decoding
+    any records. Returns an empty set when the answer could be wrong
+    because keys or file contents may use JSON escapes.
+    """
+    keys = list(keys)
+    needles = _key_needles(keys)
+    if not needles:
+        return set()
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return set(keys)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b"\\") != -1:
+                return set()
+            return {key for key, needle in zip(keys, needles) if mm.find(needle) == -1}
+
+
+def _step_fields(line: bytes) -> Optional[dict[bytes, bytes]]:
+    """
+    Integer "_step"/"step" fields of a stripped raw JSONL object, read
+    without decoding it.
+
+    Returns None when a match might not be a top-level key: the line is not
+    a single flat object (a nested object could hold its own step) or has
+    escapes (a key could be hidden inside a string).
+    """
+    if (
+        not (line.startswith(b"{") and line.endswith(b"}"))
+        or b"\\" in line
+        or line.count(b"{") != 1
+    ):
+        return None
+    return dict(_STEP_FIELD_RE.findall(line))
+
+
+def _quick_step(line: bytes, default: int) -> Optional[int]:
+    """
+    Read the step of a raw JSONL record without decoding it.
+
+    Returns the integer "_step" (else "step"), `default` if the record has
+    neither, or None when the line has to be fully decoded (escapes, nested
+    objects, non-integer steps, not an object).
+    """
+    line = line.strip()
+    fields = _step_fields(line)
+    if fields is None:
+        return None
+    if b"_step" in fields:
+        return int(fields[b"_step"])
+    if b"step" in fields:
+        return int(fields[b"step"])
+    if b'"_step"' in line or b'"step"' in line:
+        return None  # Present but not an integer
+    return default
+
+
+@lru_cache(maxsize=32)
+def _line_extractor(keys: tuple[str, ...]) -> Callable[[bytes, int], Optional[dict]]:
+    """
+    Build the history line extractor for a fixed key set.
+
+    Everything that depends only on the keys (quoted needles, the decoded
+    field list) is worked out once per key set instead of per call. The
+    extractor maps a raw JSONL line and its line number to
+    {"_step": step, key: value, ...} for the keys present, or None if the
+    line is not a valid JSON object.
+    """
+    needles = _key_needles(keys)
+    fields = ("_step", "step", *keys)
+
+    def extract(line: bytes, line_num: int) -> Optional[dict]:
+        if needles and not any(needle in line for needle in needles):
+            # None of the keys appear, so only the step is needed - read it
+            # without decoding the line
+            step = _quick_step(line, line_num)
+            if step is not None:
+                return {"_step": step}
+        try:
+            record = _json.loads_fields(line, fields)
+        except _json.JSONDecodeError:
+            return None
+        row = {"_step": record.get("_step", record.get("step", line_num))}
+        for key in keys:
+            if key in record:
+                row[key] = record[key]
+        return row
+
+    return extract
+
+
+@lru_cache(maxsize=32)
+def _key_matcher(keys: tuple[str, ...]) -> Callable[[str], bool]:
+    """
+    Build a test for whether text contains any of `keys`.
+
+    With pyahocorasick, one automaton pass over the text finds any key;
+    otherwise each key is searched for in turn.
+    """
+    if not keys:
+        return lambda text: False
+    if "" in keys:
+        return lambda text: True  # e.g. a trailing comma in --keys
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for key in keys:
+            automaton.add_word(key, key)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    return lambda text: any(key in text for key in keys)
+
+
+# Characters of output.log searched per chunk (plus the rest of the last line)
+_TEXT_CHUNK = 1 << 22
+
+
+def _lines_with_keys(text: str, keys: tuple[str, ...]) -> list[str]:
+    """
+    Stripped lines of `text` that contain any of the lowercased `keys`,
+    ignoring case.
+
+    ASCII text is lowercased once as a whole and searched with str.find,
+    so only matching lines are ever split out. Otherwise (lowercasing can
+    change lengths, or a key could span or edge a line) each line is
+    checked in turn.
+    """
+    if text.isascii() and all(key and key == key.strip() and "\n" not in key for key in keys):
+        lowered = text.lower()
+        starts = set()
+        for key in keys:
+            pos = lowered.find(key)
+            while pos != -1:
+                starts.add(lowered.rfind("\n", 0, pos) + 1)
+                end = lowered.find("\n", pos)
+                if end == -1:
+                    break
+                pos = lowered.find(key, end + 1)
+        lines = []
+        for start in sorted(starts):
+            end = text.find("\n", start)
+            lines.append((text[start:] if end == -1 else text[start:end]).strip())
+        return lines
+
+    contains_key = _key_matcher(keys)
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()  # Trailing newline
+    return [line for line in map(str.strip, lines) if contains_key(line.lower())]
+
+
+@lru_cache(maxsize=32)
+def _metric_text_re(keys: tuple[str, ...]) -> tuple[re.Pattern, dict[str, list[str]]]:
+    """
+    Compile one case-insensitive "<key>: <number>" pattern for a key set.
+
+    Keys are tried longest first, so "val_loss: 0.3" is read as val_loss
+    rather than loss. Returns the pattern and a map from lowercased key
+    text to the keys it stands for.
+    """
+    names: dict[str, list[str]] = {}
+    for key in keys:
+        names.setdefault(key.lower(), []).append(key)
+    alternation = "|".join(re.escape(k) for k in sorted(names, key=len, reverse=True))
+    pattern = re.compile(rf'({alternation})[:\s]+([\d.e+-]+)', re.IGNORECASE)
+    return pattern, names
+
+
+def _csv_cell(value) -> str:
+    """Format a history value for CSV output (floats to 6 significant digits)."""
+    # Decoded JSON floats are exact floats, so an identity check on the type
+    # replaces isinstance; str("") is already ""
+    return f"{value:.6g}" if type(value) is float else str(value)
+
+
+def _is_local_log_name(name: str) -> bool:
+    """Whether a file name looks like a local training log."""
+    return (
+        name.endswith(".jsonl")
+        or (name.startswith("metrics_") and name.endswith(".json"))
+        or (name.startswith("train_") and name.endswith(".log"))
+    )
+
+
+# YAML scalars the config fallback parser maps to Python constants
+_YAML_CONSTANTS = {"null": None, "None": None, "true": True, "false": False}
+
+
+def _parse_config_scalar(value_str: str):
+    """Parse a scalar config.yaml value (fallback parser, no PyYAML)."""
+    if value_str in _YAML_CONSTANTS:
+        return _YAML_CONSTANTS[value_str]
+    if value_str[:1] in ("'", '"'):
+        return value_str[1:-1]
+    try:
+        # Int unless it has a decimal point or exponent
+        if '.' in value_str or 'e' in value_str or 'E' in value_str:
+            return float(value_str)
+        return int(value_str)
+    except ValueError:
+        return value_str
+
+
+def _read_bytes(path: Path) -> Optional[bytes]:
+    """Contents of a file, or None if it can't be read."""
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _history_columns(history: list[dict]) -> dict[str, list]:
+    """
+    Transpose history records into per-key value lists in one pass.
+
+    Each column holds the values of the records that have that key, in
+    record order.
+    """
+    columns: dict[str, list] = {}
+    for record in history:
+        for key, value in record.items():
+            column = columns.get(key)
+            if column is None:
+                columns[key] = column = []
+            column.append(value)
+    return columns
+
 
 @dataclass
 class RunInfo:
@@ -72,33 +577,76 @@ class RunAnalyzer:
             config: RunwiseConfig instance. If None, auto-detects from cwd.
         """
         self.config = config or RunwiseConfig.auto_detect()
+        # Parsed runs keyed by directory, with the file stamps they were
+        # parsed from. Long-lived analyzers (MCP server, shell) reuse them.
+        self._run_cache: dict[Path, tuple[tuple, RunInfo]] = {}
+        # Sampled history records keyed by file, file stamp, samples and keys
+        self._history_cache: dict[tuple, list[dict]] = {}
+        # Metric keys seen in a history file, keyed by file and file stamp
+        self._keys_cache: dict[tuple, frozenset[str]] = {}
+        # Guards eviction and insertion in the caches above; the MCP server
+        # shares one analyzer across its worker threads
+        self._cache_lock = threading.Lock()
 
     # ==================== Run Discovery ====================
 
     def list_runs(self, limit: int = 20) -> list[RunInfo]:
-        """List recent W&B runs."""
-        runs = []
-
-        if not self.config.wandb_dir.exists():
-            return runs
-
-        for d in sorted(self.config.wandb_dir.iterdir(), reverse=True):
-            if d.is_dir() and d.name.startswith("run-"):
-                run_info = self._parse_run_dir(d)
-                if run_info:
-                    runs.append(run_info)
-                    if len(runs) >= limit:
-                        break
+        """
+        List recent W&B runs.
+
+        Run directories are parsed on a small thread pool (config.io_workers)
+        since each parse is dominated by file reads. Directories are handed
+        out in newest-first batches so results keep their order and an
+        early limit stops further reads.
+        """
+        dirs = sorted(self._scan_run_dirs(), reverse=True)
+        workers = min(self.config.io_workers, len(dirs))
+        if workers <= 1:
+            return self._collect_runs(map(self._parse_run_dir, dirs), limit)
+
+        batch = max(limit, workers)
+        runs: list[RunInfo] = []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for start in range(0, len(dirs), batch):
+                runs = self._collect_runs(
+                    pool.map(self._parse_run_dir, dirs[start:start + batch]), limit, runs
+                )
+                if len(runs) >= limit:
+                    break
+        return runs
 
+    @staticmethod
+    def _collect_runs(parsed, limit: int, runs: Optional[list[RunInfo]] = None) -> list[RunInfo]:
+        """Append parsed runs (skipping failures) until limit is reached."""
+        runs = [] if runs is None else runs
+        for run_info in parsed:
+            if run_info:
+                runs.append(run_info)
+                if len(runs) >= limit:
+                    break
         return runs
 
+    def _scan_run_dirs(self, run_id: str = "") -> list[Path]:
+        """
+        List run directories in wandb_dir, optionally only those containing run_id.
+
+        Uses os.scandir so names and directory checks come from the directory
+        listing itself rather than a stat per entry.
+        """
+        try:
+            with os.scandir(self.config.wandb_dir) as it:
+                return [
+                    Path(entry.path) for entry in it
+                    if entry.name.startswith("run-") and run_id in entry.name and entry.is_dir()
+                ]
+        except OSError:
+            return []
+
     def get_latest_run(self) -> Optional[RunInfo]:
         """Get the latest/active run."""
-        latest_link = self.config.wandb_dir / "latest-run"
-        if latest_link.exists():
-            target = latest_link.resolve()
-            if target.is_dir():
-                return self._parse_run_dir(target)
+        target = _latest_run_dir(self.config.wandb_dir)
+        if target is not None:
+            return self._parse_run_dir(target)
         return None
 
     def find_run(self, run_id: str) -> Optional[RunInfo]:
@@ -107,7 +655,11 @@ class RunAnalyzer:
 
         If the run was resumed (multiple directories with same ID),
         combines them into a single RunInfo with segments tracked.
+        An empty run_id returns the latest run.
         """
+        if not run_id:
+            return self.get_latest_run()
+
         # Find all directories matching this run ID
         matching_dirs = self._find_all_run_dirs(run_id)
         if not matching_dirs:
@@ -132,14 +684,7 @@ class RunAnalyzer:
 
     def _find_all_run_dirs(self, run_id: str) -> list[Path]:
         """Find all directories matching a run ID (for resumed runs)."""
-        matching = []
-        if not self.config.wandb_dir.exists():
-            return matching
-
-        for d in self.config.wandb_dir.iterdir():
-            if d.is_dir() and d.name.startswith("run-") and run_id in d.name:
-                matching.append(d)
-        return matching
+        return self._scan_run_dirs(run_id)
 
     def _get_max_step_from_segments(self, segments: list[Path]) -> int:
         """Get the maximum step from output.logs across all segments."""
@@ -150,7 +695,7 @@ class RunAnalyzer:
                 try:
                     with open(output_file, 'r') as f:
                         for line in f:
-                            match = re.search(r'[Ss]tep[:\s]+(\d+)', line)
+                            match = _STEP_TEXT_RE.search(line)
                             if match:
                                 step = int(match.group(1))
                                 if step > max_step:
@@ -160,9 +705,27 @@ class RunAnalyzer:
         return max_step
 
     def _parse_run_dir(self, directory: Path) -> Optional[RunInfo]:
+        """
+        Parse a W&B run directory, reusing an earlier parse if its files
+        are unchanged.
+
+        Running runs are never cached, since their state also depends on
+        the clock.
+        """
+        files_dir = directory / "files"
+        stamps = tuple(_file_stamp(files_dir / name) for name in _RUN_FILES)
+        cached = self._run_cache.get(directory)
+        if cached is not None and cached[0] == stamps:
+            return replace(cached[1])  # Copy: callers set segments etc.
+
+        run_info = self._load_run_dir(directory)
+        if run_info is not None and run_info.state != "running":
+            self._run_cache[directory] = (stamps, replace(run_info))
+        return run_info
+
+    def _load_run_dir(self, directory: Path) -> Optional[RunInfo]:
         """Parse a W&B run directory."""
-        # Format: run-20251212_191603-iustpqgf
-        match = re.match(r'run-(\d{8})_(\d{6})-(\w+)', directory.name)
+        match = _RUN_DIR_RE.match(directory.name)
         if not match:
             return None
 
@@ -175,12 +738,15 @@ class RunAnalyzer:
             time=f"{time_str[:2]}:{time_str[2:4]}:{time_str[4:]}",
         )
 
+        # Each file is read once; a missing file simply yields None
+        files_dir = directory / "files"
+        summary_bytes = _read_bytes(files_dir / "wandb-summary.json")
+        metadata_bytes = _read_bytes(files_dir / "wandb-metadata.json")
+
         # Load summary if available
-        summary_file = directory / "files" / "wandb-summary.json"
-        if summary_file.exists():
+        if summary_bytes is not None:
             try:
-                with open(summary_file) as f:
-                    summary = json.load(f)
+                summary = _json.loads(summary_bytes)
                 run_info.metrics = summary
                 run_info.final_step = summary.get(
                     self.config.schema.step_key,
@@ -189,17 +755,14 @@ class RunAnalyzer:
             except Exception:
                 pass
 
-        # Load config if available
-        config_file = directory / "files" / "config.yaml"
-        if config_file.exists():
-            run_info.config = self._parse_wandb_config(config_file)
+        # Load config if available (missing file -> {})
+        run_info.config = self._parse_wandb_config(files_dir / "config.yaml")
 
         # Load metadata for run context (name, notes, tags, group)
-        metadata_file = directory / "files" / "wandb-metadata.json"
-        if metadata_file.exists():
+        metadata = None
+        if metadata_bytes is not None:
             try:
-                with open(metadata_file) as f:
-                    metadata = json.load(f)
+                metadata = _json.loads(metadata_bytes)
                 # Extract user-provided run context
                 run_info.name = metadata.get("displayName", "")
                 run_info.notes = metadata.get("notes", "")
@@ -211,22 +774,50 @@ class RunAnalyzer:
             except Exception:
                 pass
 
-        # Detect run state
-        run_info.state = self._detect_run_state(directory)
+        # Detect run state, reusing the metadata parsed above
+        run_info.state = self._detect_run_state(
+            directory, metadata, has_summary=summary_bytes is not None
+        )
 
         return run_info
 
     def _parse_wandb_config(self, config_file: Path) -> dict:
         """Parse W&B config.yaml file, filtering out internal keys."""
-        config = {}
+        # W&B config.yaml has a specific format with 'value' keys
+        # Example: learning_rate:\n  value: 0.001
+        if YAML_AVAILABLE:
+            try:
+                content = config_file.read_bytes()
+            except OSError:
+                return {}
+            try:
+                parsed = yaml.load(content, Loader=_YamlLoader)
+            except yaml.YAMLError:
+                parsed = None
+            if isinstance(parsed, dict):
+                return {
+                    key: entry["value"]
+                    for key, entry in parsed.items()
+                    if isinstance(key, str)
+                    and not key.startswith(("_", "wandb"))
+                    and isinstance(entry, dict)
+                    and "value" in entry
+                }
+
+        # Fallback: stream lines rather than materializing the whole file
         try:
-            # W&B config.yaml has a specific format with 'value' keys
-            # Example: learning_rate:\n  value: 0.001
-            content = config_file.read_text()
+            with open(config_file, encoding="utf-8", errors="replace") as f:
+                return self._parse_wandb_config_text(f)
+        except OSError:
+            return {}
 
+    def _parse_wandb_config_text(self, lines: Iterable[str]) -> dict:
+        """Line-based fallback parser for scalar W&B config values."""
+        config = {}
+        try:
             # Simple YAML parsing for W&B config format
             current_key = None
-            for line in content.split('\n'):
+            for line in lines:
                 line = line.rstrip()
                 if not line or line.startswith('#'):
                     continue
@@ -240,39 +831,28 @@ class RunAnalyzer:
                 # Value line (indented)
                 elif current_key and 'value:' in line:
                     value_str = line.split('value:', 1)[1].strip()
-                    # Parse value
-                    if value_str == 'null' or value_str == 'None':
-                        config[current_key] = None
-                    elif value_str == 'true':
-                        config[current_key] = True
-                    elif value_str == 'false':
-                        config[current_key] = False
-                    elif value_str.startswith("'") or value_str.startswith('"'):
-                        config[current_key] = value_str[1:-1]
-                    else:
-                        try:
-                            # Try int first, then float
-                            if '.' in value_str or 'e' in value_str.lower():
-                                config[current_key] = float(value_str)
-                            else:
-                                config[current_key] = int(value_str)
-                        except ValueError:
-                            config[current_key] = value_str
+                    config[current_key] = _parse_config_scalar(value_str)
         except Exception:
             pass
         return config
 
-    def _detect_run_state(self, directory: Path) -> str:
-        """Detect if a run is running, finished, or crashed."""
-        # Check for wandb-summary.json - indicates run logged something
-        summary_file = directory / "files" / "wandb-summary.json"
+    def _detect_run_state(
+        self,
+        directory: Path,
+        metadata: Optional[dict],
+        has_summary: bool,
+    ) -> str:
+        """
+        Detect if a run is running, finished, or crashed.
 
-        # Check for exit code or status files
-        exit_file = directory / "files" / "wandb-metadata.json"
-        if exit_file.exists():
+        Args:
+            directory: Run directory
+            metadata: Parsed wandb-metadata.json, or None if missing/invalid
+            has_summary: Whether wandb-summary.json exists
+        """
+        # Check for exit code or status in metadata
+        if isinstance(metadata, dict):
             try:
-                with open(exit_file) as f:
-                    metadata = json.load(f)
                 # Check for exit code
                 if "exitcode" in metadata:
                     code = metadata["exitcode"]
@@ -286,24 +866,27 @@ class RunAnalyzer:
             except Exception:
                 pass
 
-        # Check if run is still active by looking at latest-run symlink
+        # Check if run is still active by looking at latest-run symlink.
+        # Compare device/inode rather than resolving both paths.
         latest_link = self.config.wandb_dir / "latest-run"
-        if latest_link.exists():
-            try:
-                if latest_link.resolve() == directory.resolve():
-                    # This is the latest run - check if process is likely still running
-                    # by checking if files are being modified recently
-                    history_file = directory / "files" / "wandb-history.jsonl"
-                    if history_file.exists():
-                        import time
-                        mtime = history_file.stat().st_mtime
-                        if time.time() - mtime < 300:  # Modified in last 5 minutes
-                            return "running"
-            except Exception:
-                pass
+        try:
+            latest_stat = os.stat(latest_link)  # Follows the symlink
+            if stat.S_ISREG(latest_stat.st_mode):
+                # Marker file naming the run directory
+                target = _latest_marker_target(latest_link)
+                latest_stat = os.stat(target) if target is not None else None
+            if latest_stat is not None and os.path.samestat(latest_stat, os.stat(directory)):
+                # This is the latest run - check if process is likely still running
+                # by checking if files are being modified recently
+                history_file = directory / "files" / "wandb-history.jsonl"
+                mtime = os.stat(history_file).st_mtime
+                if time.time() - mtime < 300:  # Modified in last 5 minutes
+                    return "running"
+        except OSError:
+            pass
 
         # If summary exists but no exit code, assume finished
-        if summary_file.exists():
+        if has_summary:
             return "finished"
 
         return "unknown"
@@ -442,12 +1025,14 @@ class RunAnalyzer:
 
         lines.append("")
 
-        # Build sparkline lookup from history
+        # Build sparkline lookup from history, only for metrics that are shown
         metric_sparklines = {}
         if include_sparklines and history:
-            for key in set(k for record in history for k in record.keys()):
-                values = [r.get(key) for r in history if key in r]
-                if values and all(isinstance(v, (int, float)) for v in values if v is not None):
+            shown = set(keys) if keys else {k for group in schema.groups for k in group.metrics}
+            for key, values in _history_columns(history).items():
+                if key not in shown:
+                    continue
+                if all(v is None or isinstance(v, (int, float)) for v in values):
                     metric_sparklines[key] = sparkline(values, width=10)
 
         # If custom keys specified, show only those metrics
@@ -534,7 +1119,8 @@ class RunAnalyzer:
                         if len(step_values) > 2:
                             mid_vals = [v for _, v in step_values[1:-1]]
                             if mid_vals:
-                                variance = sum((v - sum(mid_vals)/len(mid_vals))**2 for v in mid_vals) / len(mid_vals)
+                                mean = sum(mid_vals) / len(mid_vals)
+                                variance = sum((v - mean) ** 2 for v in mid_vals) / len(mid_vals)
                                 if variance < 0.0001:
                                     lines.append("  WARNING: Plateau detected in middle steps")
             lines.append("")
@@ -597,14 +1183,11 @@ class RunAnalyzer:
             trend_str = ""
             if show_sparklines:
                 try:
-                    history = self.get_history_data(
-                        run,
-                        keys=[primary_key, loss_key],
-                        samples=20
-                    )
+                    # Use loss for trend (decreasing is good); it's the only
+                    # key needed, so lines without it skip decoding
+                    history = self.get_history_data(run, keys=[loss_key], samples=20)
                     if history:
-                        # Use loss for trend (decreasing is good)
-                        loss_values = [r.get(loss_key) for r in history if loss_key in r]
+                        loss_values = [r[loss_key] for r in history if loss_key in r]
                         if loss_values:
                             spark = sparkline(loss_values, width=8)
                             trend = trend_indicator(loss_values)
@@ -837,26 +1420,25 @@ class RunAnalyzer:
             lines.append(f"  NOTE: Runs at different steps (A: {step_a:,}, B: {step_b:,})")
             lines.append("")
 
-        # Collect all metrics from both runs
-        all_keys = set(run_a.metrics.keys()) | set(run_b.metrics.keys())
+        # Only metrics present in both runs can be compared
+        common_keys = run_a.metrics.keys() & run_b.metrics.keys()
+        prefix = filter_prefix.lower() if filter_prefix else None
 
         # Filter and collect metrics
         metrics_to_show = []
-        for key in all_keys:
-            val_a = run_a.metrics.get(key)
-            val_b = run_b.metrics.get(key)
-
-            if not isinstance(val_a, (int, float)) or not isinstance(val_b, (int, float)):
-                continue
-
+        for key in common_keys:
             # Skip internal metrics
             if key.startswith("_"):
                 continue
 
             # Apply filter if specified
-            if filter_prefix:
-                if not key.lower().startswith(filter_prefix.lower()):
-                    continue
+            if prefix and not key.lower().startswith(prefix):
+                continue
+
+            val_a = run_a.metrics[key]
+            val_b = run_b.metrics[key]
+            if not isinstance(val_a, (int, float)) or not isinstance(val_b, (int, float)):
+                continue
 
             # Calculate delta percentage
             if val_a != 0:
@@ -1126,21 +1708,50 @@ class RunAnalyzer:
     def _get_available_keys(self, run: RunInfo) -> set[str]:
         """Get available metric keys from a run's history."""
         history_file = run.directory / "files" / "wandb-history.jsonl"
-        if not history_file.exists():
-            return set()
+        return set(self._history_keys(history_file))
+
+    def _history_keys(self, history_file: Path) -> frozenset[str]:
+        """
+        Keys (including internal "_" keys) seen in a history file.
+
+        Reads the complete lines in the first and last 64 KB of the file.
+        If those show fewer than 3 metric keys, the first 5 lines and every
+        1000th line of the first 10,000 are sampled as well. The result is
+        cached per file stamp, so repeated key listings and comparisons of
+        an unchanged run skip the scan.
+        """
+        stamp = _file_stamp(history_file)
+        if stamp is None:
+            return frozenset()
+        cache_key = (history_file, stamp)
+        cached = self._keys_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        def add_keys(line: bytes) -> None:
+            try:
+                keys.update(_json.loads(line).keys())
+            except (_json.JSONDecodeError, AttributeError):
+                pass
 
-        import json
         keys = set()
-        with open(history_file, 'r') as f:
-            for i, line in enumerate(f):
-                if i >= 10:  # Check first 10 lines
+        lines, whole = _read_edge_lines(history_file)
+        for line in lines:
+            add_keys(line)
+
+        if not whole and sum(not k.startswith("_") for k in keys) < 3:
+            for i, line in enumerate(_iter_lines(history_file)):
+                if i < 5 or i % 1000 == 0:  # Sample first 5 and every 1000th
+                    add_keys(line)
+                if i > 10000:  # Don't scan entire huge file
                     break
-                try:
-                    record = json.loads(line.strip())
-                    keys.update(record.keys())
-                except Exception:
-                    continue
-        return keys
+
+        result = frozenset(keys)
+        with self._cache_lock:
+            if len(self._keys_cache) >= _HISTORY_CACHE_SIZE:
+                self._keys_cache.pop(next(iter(self._keys_cache)), None)
+            self._keys_cache[cache_key] = result
+        return result
 
     # ==================== History (Downsampled) ====================
 
@@ -1158,53 +1769,60 @@ class RunAnalyzer:
 
         Args:
             run: RunInfo object for the run
-            keys: List of metric keys to fetch (None = all keys)
+            keys: List of metric keys to fetch (None = all keys; rows with
+                only internal "_" keys are then skipped)
             samples: Number of data points to return
 
         Returns:
-            List of metric dictionaries
+            List of metric dictionaries (cached; treat the dicts as read-only)
         """
         history_file = run.directory / "files" / "wandb-history.jsonl"
-        if not history_file.exists():
+        stamp = _file_stamp(history_file)
+        if stamp is None:
             return []
 
-        # First pass: count lines
-        total_lines = 0
-        with open(history_file, 'r') as f:
-            for _ in f:
-                total_lines += 1
-
+        # Reuse the sample from an earlier call while the file is unchanged
+        # (e.g. `list` then `latest` in the shell, or repeat MCP calls)
+        cache_key = (history_file, stamp, samples, tuple(keys) if keys else None)
+        cached = self._history_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        records = self._load_history_data(history_file, keys, samples)
+        with self._cache_lock:
+            if len(self._history_cache) >= _HISTORY_CACHE_SIZE:
+                self._history_cache.pop(next(iter(self._history_cache)), None)
+            self._history_cache[cache_key] = records
+        return list(records)
+
+    def _load_history_data(
+        self,
+        history_file: Path,
+        keys: Optional[list[str]],
+        samples: int,
+    ) -> list[dict]:
+        """Read and decode a sample of history records (see get_history_data)."""
+        total_lines, lines = _read_sampled_lines(history_file, samples)
         if total_lines == 0:
             return []
 
-        # Calculate which lines to sample
-        if total_lines <= samples:
-            sample_indices = set(range(total_lines))
-        else:
-            sample_indices = set()
-            for i in range(samples):
-                idx = int(i * (total_lines - 1) / (samples - 1))
-                sample_indices.add(idx)
+        extract = _line_extractor(tuple(keys)) if keys else None
 
-        # Second pass: read only sampled lines
         records = []
-        with open(history_file, 'r') as f:
-            for line_num, line in enumerate(f):
-                if line_num not in sample_indices:
-                    continue
-                try:
-                    record = json.loads(line.strip())
-                    if keys:
-                        # Filter to requested keys plus step
-                        filtered = {"_step": record.get("_step", record.get("step", line_num))}
-                        for key in keys:
-                            if key in record:
-                                filtered[key] = record[key]
-                        records.append(filtered)
-                    else:
-                        records.append(record)
-                except json.JSONDecodeError:
-                    continue
+        for line_num, line in lines:
+            if extract is not None:
+                record = extract(line, line_num)
+                if record is not None:
+                    records.append(record)
+                continue
+            if not _PUBLIC_KEY_RE.search(line):
+                # Only internal "_" keys (e.g. a _wandb/_runtime-only row):
+                # no metrics to return, so don't decode it
+                continue
+            try:
+                records.append(_json.loads(line))
+            except _json.JSONDecodeError:
+                continue
 
         return records
 
@@ -1245,65 +1863,36 @@ class RunAnalyzer:
         """
         Downsample a JSONL file efficiently without loading it all into memory.
 
-        Uses two-pass approach:
-        1. Count total lines (fast, no parsing)
-        2. Read only the lines we need based on calculated interval
+        Uses two passes over a memory-mapped file:
+        1. Count total lines (C-level newline counts, no parsing)
+        2. Parse only the lines we need based on calculated interval
         """
-        # First pass: count lines
-        total_lines = 0
-        with open(file_path, 'r') as f:
-            for _ in f:
-                total_lines += 1
-
+        total_lines, lines = _read_sampled_lines(file_path, samples)
         if total_lines == 0:
             return "step," + ",".join(keys) + "\n(no data)"
 
-        # Calculate which lines to sample
-        if total_lines <= samples:
-            # File is small enough, read all
-            sample_indices = set(range(total_lines))
-        else:
-            # Evenly spaced samples including first and last
-            sample_indices = set()
-            for i in range(samples):
-                idx = int(i * (total_lines - 1) / (samples - 1))
-                sample_indices.add(idx)
-
-        # Second pass: read only sampled lines
+        # Each sampled line is decoded once, for the requested keys only
+        extract = _line_extractor(tuple(keys))
+        defaults = [""] * len(keys)
         rows = []
-        available_keys = set()
-
-        with open(file_path, 'r') as f:
-            for line_num, line in enumerate(f):
-                if line_num not in sample_indices:
-                    continue
-
-                try:
-                    record = json.loads(line.strip())
-                    available_keys.update(record.keys())
-
-                    step = record.get("_step", record.get("step", line_num))
-                    row = [str(step)]
-
-                    for key in keys:
-                        val = record.get(key, "")
-                        if isinstance(val, float):
-                            row.append(f"{val:.6g}")
-                        else:
-                            row.append(str(val) if val != "" else "")
-
-                    rows.append(",".join(row))
-                except json.JSONDecodeError:
-                    continue
+        for line_num, line in lines:
+            record = extract(line, line_num)
+            if record is not None:
+                # _csv_cell inlined: this runs once per sampled cell
+                cells = [
+                    f"{v:.6g}" if type(v) is float else str(v)
+                    for v in map(record.get, keys, defaults)
+                ]
+                rows.append(",".join([str(record["_step"]), *cells]))
 
         if not rows:
             # No data found for requested keys, list available
-            filtered_keys = [k for k in available_keys if not k.startswith("_")]
+            filtered_keys = [k for k in self._history_keys(file_path) if not k.startswith("_")]
             return f"No data for keys: {keys}\nAvailable keys: {sorted(filtered_keys)[:20]}"
 
-        # Build CSV output
-        header = "step," + ",".join(keys)
-        return header + "\n" + "\n".join(rows)
+        # Build CSV output in a single join
+        rows.insert(0, "step," + ",".join(keys))
+        return "\n".join(rows)
 
     def _no_history_message(self, run: RunInfo, keys: list[str]) -> str:
         """Generate helpful error message when history files are missing."""
@@ -1367,60 +1956,61 @@ class RunAnalyzer:
         if not output_files:
             return self._no_history_message(run, keys)
 
-        # First pass: find all lines with metrics from ALL output.logs
+        # First pass: find all lines with metrics from ALL output.logs,
+        # reading whole-line chunks at a time
+        lowered_keys = tuple(k.lower() for k in keys)
         metric_lines = []
         for output_file in output_files:
             with open(output_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    # Check if line contains any of our keys
-                    if any(key in line.lower() for key in [k.lower() for k in keys]):
-                        metric_lines.append(line)
+                while chunk := f.read(_TEXT_CHUNK):
+                    chunk += f.readline()  # Finish the last line
+                    metric_lines.extend(_lines_with_keys(chunk, lowered_keys))
 
         if not metric_lines:
             return f"No metrics matching {keys} found in output.log"
 
         # Downsample
         if len(metric_lines) > samples:
-            indices = [int(i * (len(metric_lines) - 1) / (samples - 1)) for i in range(samples)]
-            metric_lines = [metric_lines[i] for i in indices]
+            metric_lines = [metric_lines[i] for i in _sample_indices(len(metric_lines), samples)]
 
         # Parse and format as CSV
+        key_re, key_names = _metric_text_re(tuple(keys))
         rows = []
         for line in metric_lines:
             row_data = {"step": ""}
 
-            # Try JSON parsing first
-            try:
-                data = json.loads(line)
+            # Try JSON parsing first (only JSON objects can hold metrics, so
+            # plain-text lines skip the decode attempt)
+            data = None
+            if line.startswith("{"):
+                try:
+                    data = _json.loads(line)
+                except _json.JSONDecodeError:
+                    pass
+
+            if isinstance(data, dict):
                 row_data["step"] = str(data.get("_step", data.get("step", "")))
                 for key in keys:
                     if key in data:
-                        val = data[key]
-                        row_data[key] = f"{val:.6g}" if isinstance(val, float) else str(val)
-            except json.JSONDecodeError:
+                        row_data[key] = _csv_cell(data[key])
+            else:
                 # Try regex patterns
-                step_match = re.search(r'[Ss]tep[:\s]+(\d+)', line)
+                step_match = _STEP_TEXT_RE.search(line)
                 if step_match:
                     row_data["step"] = step_match.group(1)
 
-                for key in keys:
-                    pattern = rf'{re.escape(key)}[:\s]+([\d.e+-]+)'
-                    match = re.search(pattern, line, re.IGNORECASE)
-                    if match:
-                        row_data[key] = match.group(1)
+                for match in key_re.finditer(line):
+                    for key in key_names[match.group(1).lower()]:
+                        row_data.setdefault(key, match.group(2))
 
             if row_data["step"] or any(key in row_data for key in keys):
-                row = [row_data.get("step", "")]
-                for key in keys:
-                    row.append(row_data.get(key, ""))
-                rows.append(",".join(row))
+                rows.append(",".join([row_data["step"], *(row_data.get(key, "") for key in keys)]))
 
         if not rows:
             return "Could not parse metrics from output.log"
 
-        header = "step," + ",".join(keys)
-        return header + "\n" + "\n".join(rows)
+        rows.insert(0, "step," + ",".join(keys))
+        return "\n".join(rows)
 
     def get_history_stats(
         self,
@@ -1442,24 +2032,45 @@ class RunAnalyzer:
                 f"Try: runwise sync {run.run_id}  # Recover history from W&B"
             )
 
+        # Keys the file never mentions are dropped before any parsing
+        missing = _keys_absent_from(history_file, keys)
+        present = [key for key in keys if key not in missing]
+        if keys and not present:
+            filtered_keys = [k for k in self._history_keys(history_file) if not k.startswith("_")]
+            return f"No data for keys: {keys}\nAvailable keys: {sorted(filtered_keys)[:20]}"
+
         # Single pass through file collecting stats
-        stats = {key: {"values": [], "nan_count": 0} for key in keys}
+        # Running aggregates per key: one pass, no per-value lists
+        stats = {
+            key: {"n": 0, "min": None, "max": None, "sum": 0.0, "last": None, "nan_count": 0}
+            for key in keys
+        }
         total_steps = 0
+        fields = tuple(present)
+        needles = _key_needles(present)
 
-        with open(history_file, 'r') as f:
-            for line in f:
-                total_steps += 1
-                try:
-                    record = json.loads(line.strip())
-                    for key in keys:
-                        if key in record:
-                            val = record[key]
-                            if val is None or (isinstance(val, float) and (val != val)):  # NaN check
-                                stats[key]["nan_count"] += 1
-                            elif isinstance(val, (int, float)):
-                                stats[key]["values"].append(val)
-                except json.JSONDecodeError:
-                    continue
+        for line in _iter_lines(history_file):
+            total_steps += 1
+            if needles and b"\\" not in line and not any(needle in line for needle in needles):
+                continue  # None of the keys are on this line
+            try:
+                record = _json.loads_fields(line, fields)
+                for key in present:
+                    if key in record:
+                        val = record[key]
+                        if val is None or (isinstance(val, float) and (val != val)):  # NaN check
+                            stats[key]["nan_count"] += 1
+                        elif isinstance(val, (int, float)):
+                            agg = stats[key]
+                            if agg["n"] == 0 or val < agg["min"]:
+                                agg["min"] = val
+                            if agg["n"] == 0 or val > agg["max"]:
+                                agg["max"] = val
+                            agg["n"] += 1
+                            agg["sum"] += val
+                            agg["last"] = val
+            except _json.JSONDecodeError:
+                continue
 
         # Format output
         lines = [f"HISTORY STATS: {run.run_id} ({total_steps:,} steps)", ""]
@@ -1467,17 +2078,17 @@ class RunAnalyzer:
         lines.append("-" * 70)
 
         for key in keys:
-            vals = stats[key]["values"]
-            nan_count = stats[key]["nan_count"]
+            agg = stats[key]
+            nan_count = agg["nan_count"]
 
-            if not vals:
+            if not agg["n"]:
                 lines.append(f"{key:<20} {'--':>10} {'--':>10} {'--':>10} {'--':>10} {nan_count:>6}")
                 continue
 
-            min_v = min(vals)
-            max_v = max(vals)
-            mean_v = sum(vals) / len(vals)
-            final_v = vals[-1]
+            min_v = agg["min"]
+            max_v = agg["max"]
+            mean_v = agg["sum"] / agg["n"]
+            final_v = agg["last"]
 
             # Format based on magnitude
             def fmt(v):
@@ -1487,6 +2098,10 @@ class RunAnalyzer:
 
             lines.append(f"{key:<20} {fmt(min_v):>10} {fmt(max_v):>10} {fmt(mean_v):>10} {fmt(final_v):>10} {nan_count:>6}")
 
+        if missing:
+            lines.append("")
+            lines.append(f"Not in history: {', '.join(k for k in keys if k in missing)}")
+
         return "\n".join(lines)
 
     def get_stability_analysis(
@@ -1523,18 +2138,17 @@ class RunAnalyzer:
         data = {key: [] for key in keys}
         total_steps = 0
 
-        with open(history_file, 'r') as f:
-            for line in f:
-                total_steps += 1
-                try:
-                    record = json.loads(line.strip())
-                    for key in keys:
-                        if key in record:
-                            val = record[key]
-                            if isinstance(val, (int, float)) and val == val:  # not NaN
-                                data[key].append(val)
-                except json.JSONDecodeError:
-                    continue
+        for line in _iter_lines(history_file):
+            total_steps += 1
+            try:
+                record = _json.loads(line)
+                for key in keys:
+                    if key in record:
+                        val = record[key]
+                        if isinstance(val, (int, float)) and val == val:  # not NaN
+                            data[key].append(val)
+            except _json.JSONDecodeError:
+                continue
 
         return self._format_stability_report(
             run.run_id, data, keys, window, total_steps
@@ -1679,23 +2293,22 @@ class RunAnalyzer:
         data = {key: [] for key in keys}
         steps = []
 
-        with open(history_file, 'r') as f:
-            for line in f:
-                try:
-                    record = json.loads(line.strip())
-                    step = record.get("_step", len(steps))
-                    steps.append(step)
-                    for key in keys:
-                        if key in record:
-                            val = record[key]
-                            if isinstance(val, (int, float)) and val == val:
-                                data[key].append(val)
-                            else:
-                                data[key].append(None)
+        for line in _iter_lines(history_file):
+            try:
+                record = _json.loads(line)
+                step = record.get("_step", len(steps))
+                steps.append(step)
+                for key in keys:
+                    if key in record:
+                        val = record[key]
+                        if isinstance(val, (int, float)) and val == val:
+                            data[key].append(val)
                         else:
                             data[key].append(None)
-                except json.JSONDecodeError:
-                    continue
+                    else:
+                        data[key].append(None)
+            except _json.JSONDecodeError:
+                continue
 
         if len(steps) < window:
             return f"Not enough data for window={window} (only {len(steps)} steps)"
@@ -1716,16 +2329,13 @@ class RunAnalyzer:
 
         # Downsample if needed
         if len(rolling_data) > samples:
-            indices = [int(i * (len(rolling_data) - 1) / (samples - 1)) for i in range(samples)]
-            rolling_data = [rolling_data[i] for i in indices]
+            rolling_data = [rolling_data[i] for i in _sample_indices(len(rolling_data), samples)]
 
         # Build CSV
         header_parts = ["step"]
         for key in keys:
             header_parts.extend([f"{key}_mean", f"{key}_std"])
-        header = ",".join(header_parts)
-
-        rows = []
+        rows = [",".join(header_parts)]
         for row in rolling_data:
             row_parts = [str(row.get("step", ""))]
             for key in keys:
@@ -1735,7 +2345,7 @@ class RunAnalyzer:
                 row_parts.append(f"{std_val:.6g}" if isinstance(std_val, float) else "")
             rows.append(",".join(row_parts))
 
-        return header + "\n" + "\n".join(rows)
+        return "\n".join(rows)
 
     def list_available_keys(self, run: RunInfo) -> str:
         """
@@ -1751,19 +2361,7 @@ class RunAnalyzer:
                 return "Available keys (from summary):\n" + "\n".join(sorted(keys))
             return f"No history or summary for run {run.run_id}"
 
-        # Read first and last few lines to get representative keys
-        keys = set()
-        with open(history_file, 'r') as f:
-            for i, line in enumerate(f):
-                if i < 5 or i % 1000 == 0:  # Sample first 5 and every 1000th
-                    try:
-                        record = json.loads(line.strip())
-                        keys.update(k for k in record.keys() if not k.startswith("_"))
-                    except json.JSONDecodeError:
-                        continue
-                if i > 10000:  # Don't scan entire huge file
-                    break
-
+        keys = [k for k in self._history_keys(history_file) if not k.startswith("_")]
         return "Available keys:\n" + "\n".join(sorted(keys))
 
     # ==================== Live Status ====================
@@ -1793,12 +2391,13 @@ class RunAnalyzer:
         if not output_files:
             return "\n".join(lines) + "\n(no output.log yet)"
 
-        # Read last 100 lines from ALL output.logs combined (most recent last)
+        # Read last 100 lines from ALL output.logs combined (most recent last),
+        # reading only the tail of each file
         recent_lines = []
-        for output_file in output_files:
-            with open(output_file) as f:
-                recent_lines.extend(f.readlines())
-        recent_lines = recent_lines[-100:]
+        for output_file in reversed(output_files):
+            recent_lines[:0] = _read_tail_lines(output_file, 100 - len(recent_lines))
+            if len(recent_lines) >= 100:
+                break
 
         # Parse for latest metrics (generic patterns)
         latest_step = None
@@ -1810,38 +2409,35 @@ class RunAnalyzer:
         for line in recent_lines:
             line = line.strip()
 
-            # Try common patterns
-            # Pattern 1: "Step X | Loss: Y | Accuracy: Z"
-            match = re.search(r'[Ss]tep[:\s]+(\d+)', line)
-            if match:
-                latest_step = int(match.group(1))
-
-            loss_match = re.search(r'[Ll]oss[:\s]+([\d.]+)', line)
-            if loss_match:
-                latest_loss = float(loss_match.group(1))
-
-            acc_match = re.search(r'[Aa]cc(?:uracy)?[:\s]+([\d.]+)', line)
-            if acc_match:
-                latest_acc = float(acc_match.group(1))
-
-            lr_match = re.search(r'[Ll][Rr][:\s]+([\d.e+-]+)', line)
-            if lr_match:
+            # Try common patterns, e.g. "Step X | Loss: Y | Accuracy: Z"
+            # (first value of each metric on the line)
+            found = {}
+            for match in _LIVE_METRIC_RE.finditer(line):
+                found.setdefault(match.lastgroup, match.group(match.lastgroup))
+
+            if "step" in found:
+                latest_step = int(found["step"])
+            if "loss" in found:
+                latest_loss = float(found["loss"])
+            if "acc" in found:
+                latest_acc = float(found["acc"])
+            if "lr" in found:
                 try:
-                    latest_lr = float(lr_match.group(1))
+                    latest_lr = float(found["lr"])
                 except ValueError:
                     pass
 
             # Parse validation lines like:
             # "Val (Easy) | Token Acc: 0.987 | Seq Acc: 0.941"
             # "Val (ProteomeTools) | Token: 14.0% | Gain: +0.6%"
-            val_match = re.match(r'Val\s*\(([^)]+)\)\s*\|(.+)', line)
+            val_match = _VAL_LINE_RE.match(line)
             if val_match:
                 val_name = val_match.group(1).strip()
                 val_details = val_match.group(2).strip()
 
                 # Parse accuracy values
-                token_match = re.search(r'[Tt]oken[^:]*:\s*([\d.]+)%?', val_details)
-                seq_match = re.search(r'[Ss]eq[^:]*:\s*([\d.]+)%?', val_details)
+                token_match = _VAL_TOKEN_RE.search(val_details)
+                seq_match = _VAL_SEQ_RE.search(val_details)
 
                 result = {}
                 if token_match:
@@ -1912,16 +2508,16 @@ class RunAnalyzer:
 
     def list_local_logs(self) -> list[Path]:
         """List available local log files."""
-        if not self.config.logs_dir.exists():
+        # Common patterns (*.jsonl, metrics_*.json, train_*.log), matched
+        # in a single directory scan
+        try:
+            with os.scandir(self.config.logs_dir) as it:
+                entries = [e for e in it if _is_local_log_name(e.name) and e.is_file()]
+        except (FileNotFoundError, NotADirectoryError):
             return []
 
-        # Try common patterns
-        patterns = ["*.jsonl", "metrics_*.json", "train_*.log"]
-        logs = []
-        for pattern in patterns:
-            logs.extend(self.config.logs_dir.glob(pattern))
-
-        return sorted(logs, key=lambda p: p.stat().st_mtime, reverse=True)
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        return [Path(e.path) for e in entries]
 
     def parse_local_log(self, log_file: Path) -> list[dict]:
         """Parse a local JSONL log file."""
@@ -1929,15 +2525,58 @@ class RunAnalyzer:
         if not log_file.exists():
             return records
 
-        with open(log_file) as f:
+        with open(log_file, 'rb') as f:
             for line in f:
                 try:
-                    records.append(json.loads(line.strip()))
-                except json.JSONDecodeError:
+                    records.append(_json.loads(line))
+                except _json.JSONDecodeError:
                     continue
 
         return records
 
+    def quick_log_stats(self, log_file: Path) -> tuple[int, int, list[str]]:
+        """
+        Count records and find the max step of a JSONL log in one streaming pass.
+
+        Lines are only fully decoded when the step field can't be read
+        directly (first record, missing or non-integer step). Memory use is
+        constant regardless of file size.
+
+        Returns:
+            (record_count, max_step, keys of the first record)
+        """
+        count = 0
+        max_step = None
+        first_keys: list[str] = []
+
+        with open(log_file, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line.startswith(b"{"):
+                    continue
+
+                fields = _step_fields(line) if count else None
+                # "step" wins over "_step", so a "step" the pattern couldn't
+                # read as an integer (1.5, 1e3) needs the full decode
+                if fields and (b"step" in fields or b'"step"' not in line):
+                    step = int(fields.get(b"step", fields.get(b"_step")))
+                else:
+                    try:
+                        record = _json.loads(line)
+                    except ValueError:
+                        continue
+                    if not isinstance(record, dict):
+                        continue
+                    if count == 0:
+                        first_keys = list(record.keys())
+                    step = record.get("step", record.get("_step", 0))
+
+                count += 1
+                if max_step is None or step > max_step:
+                    max_step = step
+
+        return count, max_step if max_step is not None else 0, first_keys
+
     def summarize_local_log(self, log_file: Path) -> str:
         """Generate summary from local log file."""
         records = self.parse_local_log(log_file)
@@ -2025,22 +2664,33 @@ class RunAnalyzer:
             return f"Log file not found: {log_file}"
 
         # Single pass through file collecting stats
-        stats = {key: {"values": [], "nan_count": 0} for key in keys}
+        # Running aggregates per key: one pass, no per-value lists
+        stats = {
+            key: {"n": 0, "min": None, "max": None, "sum": 0.0, "last": None, "nan_count": 0}
+            for key in keys
+        }
         total_steps = 0
 
-        with open(log_file, 'r') as f:
+        with open(log_file, 'rb') as f:
             for line in f:
                 total_steps += 1
                 try:
-                    record = json.loads(line.strip())
+                    record = _json.loads(line)
                     for key in keys:
                         if key in record:
                             val = record[key]
                             if val is None or (isinstance(val, float) and (val != val)):
                                 stats[key]["nan_count"] += 1
                             elif isinstance(val, (int, float)):
-                                stats[key]["values"].append(val)
-                except json.JSONDecodeError:
+                                agg = stats[key]
+                                if agg["n"] == 0 or val < agg["min"]:
+                                    agg["min"] = val
+                                if agg["n"] == 0 or val > agg["max"]:
+                                    agg["max"] = val
+                                agg["n"] += 1
+                                agg["sum"] += val
+                                agg["last"] = val
+                except _json.JSONDecodeError:
                     continue
 
         # Format output
@@ -2049,17 +2699,17 @@ class RunAnalyzer:
         lines.append("-" * 70)
 
         for key in keys:
-            vals = stats[key]["values"]
-            nan_count = stats[key]["nan_count"]
+            agg = stats[key]
+            nan_count = agg["nan_count"]
 
-            if not vals:
+            if not agg["n"]:
                 lines.append(f"{key:<20} {'--':>10} {'--':>10} {'--':>10} {'--':>10} {nan_count:>6}")
                 continue
 
-            min_v = min(vals)
-            max_v = max(vals)
-            mean_v = sum(vals) / len(vals)
-            final_v = vals[-1]
+            min_v = agg["min"]
+            max_v = agg["max"]
+            mean_v = agg["sum"] / agg["n"]
+            final_v = agg["last"]
 
             def fmt(v):
                 if abs(v) < 0.01 or abs(v) > 1000:
@@ -2084,13 +2734,13 @@ class RunAnalyzer:
             return f"Log file not found: {log_file}"
 
         keys = set()
-        with open(log_file, 'r') as f:
+        with open(log_file, 'rb') as f:
             for i, line in enumerate(f):
                 if i < 10 or i % 1000 == 0:  # Sample first 10 and every 1000th
                     try:
-                        record = json.loads(line.strip())
+                        record = _json.loads(line)
                         keys.update(k for k in record.keys() if not k.startswith("_"))
-                    except json.JSONDecodeError:
+                    except _json.JSONDecodeError:
                         continue
                 if i > 10000:
                     break
@@ -2123,17 +2773,17 @@ class RunAnalyzer:
         data = {key: [] for key in keys}
         total_steps = 0
 
-        with open(log_file, 'r') as f:
+        with open(log_file, 'rb') as f:
             for line in f:
                 total_steps += 1
                 try:
-                    record = json.loads(line.strip())
+                    record = _json.loads(line)
                     for key in keys:
                         if key in record:
                             val = record[key]
                             if isinstance(val, (int, float)) and val == val:  # not NaN
                                 data[key].append(val)
-                except json.JSONDecodeError:
+                except _json.JSONDecodeError:
                     continue
 
         return self._format_stability_report(
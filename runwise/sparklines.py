@@ -14,6 +14,7 @@ Examples:
     '▁▁▁█▁'
 """
 
+from operator import sub
 from typing import Optional
 
 # Unicode block characters for sparklines (8 levels)
@@ -41,16 +42,32 @@ def sparkline(
     if not values:
         return ""
 
-    # Filter out None and NaN values
-    clean_values = [v for v in values if v is not None and v == v]  # NaN != NaN
+    clean_values = _clean(values)
     if not clean_values:
         return "?"  # No valid data
 
+    return _sparkline_clean(clean_values, width, min_val, max_val)
+
+
+def _clean(values: list[float]) -> list[float]:
+    """Filter out None and NaN values."""
+    return [v for v in values if v is not None and v == v]  # NaN != NaN
+
+
+def _sparkline_clean(
+    clean_values: list[float],
+    width: Optional[int] = None,
+    min_val: Optional[float] = None,
+    max_val: Optional[float] = None,
+) -> str:
+    """sparkline() for values already filtered by _clean()."""
     # Downsample if width specified
     if width and len(clean_values) > width:
         clean_values = _downsample(clean_values, width)
 
-    # Calculate range
+    # Calculate range. Auto-detected bounds contain every value, so only
+    # caller-supplied bounds need the per-value clamp below.
+    clamp = min_val is not None or max_val is not None
     if min_val is None:
         min_val = min(clean_values)
     if max_val is None:
@@ -62,17 +79,13 @@ def sparkline(
         # All values are the same - use middle character
         return SPARK_CHARS[len(SPARK_CHARS) // 2] * len(clean_values)
 
-    # Map values to characters
-    result = []
-    for v in clean_values:
-        # Normalize to 0-1 range
-        normalized = (v - min_val) / value_range
-        # Map to character index (0 to 7)
-        idx = int(normalized * (len(SPARK_CHARS) - 1))
-        idx = max(0, min(len(SPARK_CHARS) - 1, idx))  # Clamp
-        result.append(SPARK_CHARS[idx])
+    # Map values to character indices (0 to 7) in one comprehension
+    top = len(SPARK_CHARS) - 1
+    indices = [int((v - min_val) / value_range * top) for v in clean_values]
+    if clamp:
+        indices = [0 if i < 0 else top if i > top else i for i in indices]
 
-    return "".join(result)
+    return "".join([SPARK_CHARS[i] for i in indices])
 
 
 def sparkline_with_stats(
@@ -87,26 +100,36 @@ def sparkline_with_stats(
     if not values:
         return "- (no data)"
 
-    clean_values = [v for v in values if v is not None and v == v]
+    clean_values = _clean(values)
     if not clean_values:
         return "? (no valid data)"
 
-    spark = sparkline(clean_values, width=width)
+    spark = _sparkline_clean(clean_values, width=width)
+    return f"{spark} ({_fmt_compact(clean_values[0])}→{_fmt_compact(clean_values[-1])})"
 
-    # First and last valid values
-    first = clean_values[0]
-    last = clean_values[-1]
 
-    # Format compactly
-    def fmt(v):
-        if abs(v) < 0.001 or abs(v) > 1000:
-            return f"{v:.1e}"
-        elif abs(v) < 1:
-            return f"{v:.3f}"
-        else:
-            return f"{v:.2f}"
+def _spark_parts(values: list[float], width: int) -> Optional[tuple[str, str, float, float]]:
+    """
+    Sparkline, trend and first/last valid value from a single NaN filter.
 
-    return f"{spark} ({fmt(first)}→{fmt(last)})"
+    Returns None if there are no valid values.
+    """
+    clean_values = _clean(values)
+    if not clean_values:
+        return None
+    spark = _sparkline_clean(clean_values, width=width)
+    trend = _trend_clean(clean_values) if len(clean_values) >= 2 else "→"
+    return spark, trend, clean_values[0], clean_values[-1]
+
+
+def _fmt_compact(v: float) -> str:
+    """Format a value compactly for sparkline annotations."""
+    if abs(v) < 0.001 or abs(v) > 1000:
+        return f"{v:.1e}"
+    elif abs(v) < 1:
+        return f"{v:.3f}"
+    else:
+        return f"{v:.2f}"
 
 
 def trend_indicator(values: list[float]) -> str:
@@ -118,24 +141,28 @@ def trend_indicator(values: list[float]) -> str:
     if len(values) < 2:
         return "→"
 
-    clean_values = [v for v in values if v is not None and v == v]
+    clean_values = _clean(values)
     if len(clean_values) < 2:
         return "→"
 
-    first_half = clean_values[: len(clean_values) // 2]
-    second_half = clean_values[len(clean_values) // 2:]
+    return _trend_clean(clean_values)
+
 
-    avg_first = sum(first_half) / len(first_half)
-    avg_second = sum(second_half) / len(second_half)
+def _trend_clean(clean_values: list[float]) -> str:
+    """trend_indicator() for at least two values already filtered by _clean()."""
+    n = len(clean_values)
+    half = n // 2
 
-    # Calculate volatility
-    if len(clean_values) > 4:
-        diffs = [abs(clean_values[i] - clean_values[i - 1]) for i in range(1, len(clean_values))]
-        avg_diff = sum(diffs) / len(diffs)
+    # Calculate volatility (C-level map/sum over consecutive pairs)
+    if n > 4:
+        avg_diff = sum(map(abs, map(sub, clean_values[1:], clean_values))) / (n - 1)
         value_range = max(clean_values) - min(clean_values)
         if value_range > 0 and avg_diff / value_range > 0.3:
             return "~"  # Volatile
 
+    avg_first = sum(clean_values[:half]) / half
+    avg_second = sum(clean_values[half:]) / (n - half)
+
     # Check trend
     change_ratio = (avg_second - avg_first) / (abs(avg_first) + 1e-10)
 
@@ -262,17 +289,11 @@ def _downsample(values: list[float], target_width: int) -> list[float]:
     if len(values) <= target_width:
         return values
 
-    result = []
+    # Bucket edges are computed once and shared by neighbouring buckets.
+    # With more values than buckets every bucket holds at least one value.
     bucket_size = len(values) / target_width
-
-    for i in range(target_width):
-        start = int(i * bucket_size)
-        end = int((i + 1) * bucket_size)
-        bucket = values[start:end]
-        if bucket:
-            result.append(sum(bucket) / len(bucket))
-
-    return result
+    edges = [int(i * bucket_size) for i in range(target_width + 1)]
+    return [sum(values[start:end]) / (end - start) for start, end in zip(edges, edges[1:])]
 
 
 def format_metric_with_spark(
@@ -289,23 +310,11 @@ def format_metric_with_spark(
     if not values:
         return f"{name}: - (no data)"
 
-    spark = sparkline(values, width=width)
-    trend = trend_indicator(values)
-
-    clean_values = [v for v in values if v is not None and v == v]
-    if not clean_values:
+    parts = _spark_parts(values, width)
+    if parts is None:
         return f"{name}: ? (no valid data)"
 
-    first = clean_values[0]
-    last = clean_values[-1]
-
-    def fmt(v):
-        if abs(v) < 0.001 or abs(v) > 1000:
-            return f"{v:.1e}"
-        elif abs(v) < 1:
-            return f"{v:.3f}"
-        else:
-            return f"{v:.2f}"
+    spark, trend, first, last = parts
 
     # Flip trend meaning based on higher_is_better
     if higher_is_better:
@@ -315,4 +324,4 @@ def format_metric_with_spark(
         # For loss: ↓ is good, ↑ is bad - keep as is since that's the natural interpretation
         pass
 
-    return f"{name}: {spark} {trend} ({fmt(first)}→{fmt(last)})"
+    return f"{name}: {spark} {trend} ({_fmt_compact(first)}→{_fmt_compact(last)})"
@@ -1,160 +1,222 @@
-"""Pytest fixtures for runwise tests."""
+"""
+Pytest fixtures for runwise tests.
+
+Set RUNWISE_TMPFS=1 to keep the session's temporary files in RAM
+(/dev/shm, Linux only) instead of the default temp directory.
+"""
 
 import json
+import os
+import shutil
+import sys
 import tempfile
-from pathlib import Path
+from functools import lru_cache
 
 import pytest
 
-
-@pytest.fixture
-def temp_wandb_dir():
-    """Create a temporary W&B directory structure with mock data."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        wandb_dir = Path(tmpdir) / "wandb"
-        wandb_dir.mkdir()
-
-        # Create two mock runs
-        run1_dir = wandb_dir / "run-20251214_100000-abc123"
-        run1_files = run1_dir / "files"
-        run1_files.mkdir(parents=True)
-
-        run2_dir = wandb_dir / "run-20251214_110000-def456"
-        run2_files = run2_dir / "files"
-        run2_files.mkdir(parents=True)
-
-        # Run 1: Finished run with good metrics
-        with open(run1_files / "wandb-summary.json", "w") as f:
-            json.dump({
-                "_step": 10000,
-                "_runtime": 3600,
-                "train/loss": 0.25,
-                "train/accuracy": 0.92,
-                "val/loss": 0.30,
-                "val/accuracy": 0.88,
-            }, f)
-
-        with open(run1_files / "config.yaml", "w") as f:
-            f.write("""learning_rate:
-  value: 0.001
-batch_size:
-  value: 64
-model:
-  value: transformer
-dropout:
-  value: 0.1
-""")
-
-        with open(run1_files / "wandb-metadata.json", "w") as f:
-            json.dump({
-                "displayName": "baseline-run",
-                "notes": "Testing baseline configuration with default hyperparameters",
-                "tags": ["baseline", "v1"],
-                "group": "initial-experiments",
-                "exitcode": 0,
-            }, f)
-
-        # Create history file
-        with open(run1_files / "wandb-history.jsonl", "w") as f:
-            for step in range(0, 10001, 100):
-                loss = 1.0 - (step / 10000) * 0.75
-                acc = 0.5 + (step / 10000) * 0.42
-                f.write(json.dumps({
-                    "_step": step,
-                    "train/loss": loss,
-                    "train/accuracy": acc,
-                }) + "\n")
-
+from runwise import _json
+
+
+def _wandb_config(**values) -> bytes:
+    """Render config values in the wandb config.yaml layout (key, then "  value: v")."""
+    return "".join(f"{key}:\n  value: {value}\n" for key, value in values.items()).encode()
+
+
+# Static run files, serialized once at import
+
+_RUN1_SUMMARY = json.dumps({
+    "_step": 10000,
+    "_runtime": 3600,
+    "train/loss": 0.25,
+    "train/accuracy": 0.92,
+    "val/loss": 0.30,
+    "val/accuracy": 0.88,
+}).encode()
+
+_RUN1_CONFIG = _wandb_config(learning_rate=0.001, batch_size=64, model="transformer", dropout=0.1)
+
+_RUN1_METADATA = json.dumps({
+    "displayName": "baseline-run",
+    "notes": "Testing baseline configuration with default hyperparameters",
+    "tags": ["baseline", "v1"],
+    "group": "initial-experiments",
+    "exitcode": 0,
+}).encode()
+
+_RUN2_SUMMARY = json.dumps({
+    "_step": 8000,
+    "_runtime": 2800,
+    "train/loss": 0.35,
+    "train/accuracy": 0.85,
+    "val/loss": 0.40,
+    "val/accuracy": 0.80,
+}).encode()
+
+_RUN2_CONFIG = _wandb_config(learning_rate=0.01, batch_size=32, model="transformer", dropout=0.2)
+
+_RUN2_METADATA = json.dumps({
+    "displayName": "high-lr-test",
+    "notes": "Testing higher learning rate",
+    "tags": ["experiment", "lr-test"],
+    "exitcode": 0,
+}).encode()
+
+# runwise.json with an inline schema
+_CONFIG_JSON = json.dumps({
+    "project_name": "Test Project",
+    "wandb_dir": "wandb",
+    "logs_dir": "logs",
+    "schema_inline": {
+        "loss_key": "train/loss",
+        "step_key": "_step",
+        "primary_metric": "val/accuracy",
+        "primary_metric_name": "Val Accuracy",
+        "groups": [
+            {
+                "name": "training",
+                "display_name": "TRAINING",
+                "metrics": {
+                    "train/loss": {"display": "Loss", "format": ".4f"},
+                    "train/accuracy": {"display": "Accuracy", "format": ".1%"},
+                }
+            }
+        ],
+        "validation_sets": {"val": "Validation"},
+    }
+}, separators=(",", ":")).encode()
+
+
+@lru_cache(maxsize=None)
+def _make_history(last_step: int, stride: int) -> bytes:
+    """W&B history JSONL with loss falling and accuracy rising up to last_step."""
+    return "".join(
+        json.dumps({
+            "_step": step,
+            "train/loss": 1.0 - (step / last_step) * 0.75,
+            "train/accuracy": 0.5 + (step / last_step) * 0.42,
+        }) + "\n"
+        for step in range(0, last_step + 1, stride)
+    ).encode()
+
+
+@lru_cache(maxsize=None)
+def _make_training_log(last_step: int, stride: int) -> bytes:
+    """
+    Local training JSONL with loss falling and accuracy rising up to last_step.
+
+    Written compactly through the runwise JSON shim (orjson when installed),
+    unlike the W&B history, which keeps the spaced layout wandb writes.
+    """
+    return b"".join(
+        _json.dumps({
+            "step": step,
+            "loss": 1.0 - (step / last_step) * 0.7,
+            "accuracy": 0.5 + (step / last_step) * 0.4,
+        }) + b"\n"
+        for step in range(0, last_step + 1, stride)
+    )
+
+
+def pytest_configure(config):
+    """Point temp files at a RAM-backed directory when RUNWISE_TMPFS is set."""
+    if os.environ.get("RUNWISE_TMPFS") and sys.platform.startswith("linux"):
+        tmpfs_dir = "/dev/shm/runwise-pytest"
+        if os.path.isdir("/dev/shm"):
+            os.makedirs(tmpfs_dir, exist_ok=True)
+            tempfile.tempdir = tmpfs_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep on-disk caches out of the user's home directory during tests."""
+    cache_dir = tmp_path / "runwise-cache"
+    monkeypatch.setenv("RUNWISE_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(scope="session")
+def _runwise_root(tmp_path_factory):
+    """Session temp directory holding each shared fixture's own subdirectory."""
+    return tmp_path_factory.mktemp("runwise")
+
+
+@pytest.fixture(scope="session")
+def _wandb_template(_runwise_root):
+    """
+    Build the mock W&B directory structure once per session.
+
+    The tree lives on the real filesystem: runwise reads history through
+    mmap and keeps its result cache in SQLite, neither of which work on an
+    in-memory fake filesystem.
+    """
+    wandb_dir = _runwise_root / "wandb_template" / "wandb"
+
+    # Create two mock runs (creating each leaf files/ dir creates the tree)
+    run1_dir = wandb_dir / "run-20251214_100000-abc123"
+    run1_files = run1_dir / "files"
+    os.makedirs(run1_files)
+
+    run2_dir = wandb_dir / "run-20251214_110000-def456"
+    run2_files = run2_dir / "files"
+    os.makedirs(run2_files)
+
+    payloads = {
+        # Run 1: Finished run with good metrics, plus history
+        run1_files / "wandb-summary.json": _RUN1_SUMMARY,
+        run1_files / "config.yaml": _RUN1_CONFIG,
+        run1_files / "wandb-metadata.json": _RUN1_METADATA,
+        run1_files / "wandb-history.jsonl": _make_history(10000, 100),
         # Run 2: Different config, slightly worse metrics
-        with open(run2_files / "wandb-summary.json", "w") as f:
-            json.dump({
-                "_step": 8000,
-                "_runtime": 2800,
-                "train/loss": 0.35,
-                "train/accuracy": 0.85,
-                "val/loss": 0.40,
-                "val/accuracy": 0.80,
-            }, f)
-
-        with open(run2_files / "config.yaml", "w") as f:
-            f.write("""learning_rate:
-  value: 0.01
-batch_size:
-  value: 32
-model:
-  value: transformer
-dropout:
-  value: 0.2
-""")
-
-        with open(run2_files / "wandb-metadata.json", "w") as f:
-            json.dump({
-                "displayName": "high-lr-test",
-                "notes": "Testing higher learning rate",
-                "tags": ["experiment", "lr-test"],
-                "exitcode": 0,
-            }, f)
-
-        # Create latest-run symlink
-        latest_link = wandb_dir / "latest-run"
-        latest_link.symlink_to(run2_dir)
-
-        yield {
-            "wandb_dir": wandb_dir,
-            "run1_id": "abc123",
-            "run2_id": "def456",
-            "run1_dir": run1_dir,
-            "run2_dir": run2_dir,
-        }
+        run2_files / "wandb-summary.json": _RUN2_SUMMARY,
+        run2_files / "config.yaml": _RUN2_CONFIG,
+        run2_files / "wandb-metadata.json": _RUN2_METADATA,
+    }
+    for path, payload in payloads.items():
+        path.write_bytes(payload)
 
+    # Create latest-run symlink (relative, like wandb's, so copies stay
+    # self-contained), or a marker file where symlinks need privileges
+    latest_link = wandb_dir / "latest-run"
+    try:
+        latest_link.symlink_to(run2_dir.name)
+    except OSError:
+        latest_link.write_text(run2_dir.name)
 
-@pytest.fixture
-def temp_logs_dir():
-    """Create a temporary logs directory with mock log files."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        logs_dir = Path(tmpdir) / "logs"
-        logs_dir.mkdir()
-
-        # Create a JSONL log file
-        with open(logs_dir / "training.jsonl", "w") as f:
-            for step in range(0, 1001, 10):
-                f.write(json.dumps({
-                    "step": step,
-                    "loss": 1.0 - (step / 1000) * 0.7,
-                    "accuracy": 0.5 + (step / 1000) * 0.4,
-                }) + "\n")
-
-        yield logs_dir
+    return wandb_dir
 
 
 @pytest.fixture
-def temp_config_file():
-    """Create a temporary runwise.json config file."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        config_path = Path(tmpdir) / "runwise.json"
-        config_data = {
-            "project_name": "Test Project",
-            "wandb_dir": "wandb",
-            "logs_dir": "logs",
-            "schema_inline": {
-                "loss_key": "train/loss",
-                "step_key": "_step",
-                "primary_metric": "val/accuracy",
-                "primary_metric_name": "Val Accuracy",
-                "groups": [
-                    {
-                        "name": "training",
-                        "display_name": "TRAINING",
-                        "metrics": {
-                            "train/loss": {"display": "Loss", "format": ".4f"},
-                            "train/accuracy": {"display": "Accuracy", "format": ".1%"},
-                        }
-                    }
-                ],
-                "validation_sets": {"val": "Validation"},
-            }
-        }
-        with open(config_path, "w") as f:
-            json.dump(config_data, f)
-
-        yield config_path
+def temp_wandb_dir(_wandb_template, tmp_path):
+    """
+    Create a temporary W&B directory structure with mock data.
+
+    Both runs are always present: run discovery and latest-run resolution
+    scan the whole directory, so a test that names one run still sees both.
+    """
+    wandb_dir = tmp_path / "wandb"
+    shutil.copytree(_wandb_template, wandb_dir, symlinks=True)
+    return {
+        "wandb_dir": wandb_dir,
+        "run1_id": "abc123",
+        "run2_id": "def456",
+        "run1_dir": wandb_dir / "run-20251214_100000-abc123",
+        "run2_dir": wandb_dir / "run-20251214_110000-def456",
+    }
+
+
+@pytest.fixture(scope="session")
+def temp_logs_dir(_runwise_root):
+    """Create a temporary logs directory with mock log files (shared, read-only)."""
+    logs_dir = _runwise_root / "local" / "logs"
+    logs_dir.mkdir(parents=True)
+    (logs_dir / "training.jsonl").write_bytes(_make_training_log(1000, 10))
+    return logs_dir
+
+
+@pytest.fixture(scope="session")
+def temp_config_file(_runwise_root):
+    """Create a temporary runwise.json config file (shared, read-only)."""
+    config_path = _runwise_root / "config" / "runwise.json"
+    config_path.parent.mkdir()
+    config_path.write_bytes(_CONFIG_JSON)
+    return config_path
@@ -98,6 +98,16 @@ class TestDetectAnomalies:
         if anomalies:
             assert any(a.type == "spike" for a in anomalies)
 
+    def test_first_three_spikes_reported(self):
+        """Spikes are found against the sliding-window median, first three only."""
+        history = [{"_step": i, "loss": 0.5 + 0.01 * (i % 7)} for i in range(300)]
+        for step in (120, 150, 180, 210, 240):
+            history[step] = {"_step": step, "loss": 5.0}
+
+        spikes = [a for a in detect_anomalies(history, loss_key="loss") if a.type == "spike"]
+        assert [a.step for a in spikes] == [120, 150, 180]
+        assert spikes[0].details["median"] == 0.53
+
     def test_overfitting_detection(self):
         """Overfitting (val > train divergence) is detected."""
         history = []
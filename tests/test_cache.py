@@ -0,0 +1,49 @@
+"""Tests for runwise.cache module."""
+
+from runwise.cache import ResultCache
+from runwise.config import get_cache_dir
+
+
+class TestGetCacheDir:
+    """Tests for get_cache_dir function."""
+
+    def test_env_override(self, isolated_cache_dir):
+        """Test that RUNWISE_CACHE_DIR is honored."""
+        assert get_cache_dir() == isolated_cache_dir
+
+    def test_default(self, monkeypatch):
+        """Test default location under the home directory."""
+        monkeypatch.delenv("RUNWISE_CACHE_DIR")
+        assert get_cache_dir().parts[-2:] == (".cache", "runwise")
+
+
+class TestResultCache:
+    """Tests for ResultCache class."""
+
+    def test_set_and_get(self, tmp_path):
+        """Test storing and retrieving values."""
+        cache = ResultCache(tmp_path / "sub" / "cache.sqlite3")
+        assert cache.enabled
+        assert cache.get("k") is None
+        cache.set("k", "value")
+        assert cache.get("k") == "value"
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that values survive reopening the database."""
+        ResultCache(tmp_path / "cache.sqlite3").set("k", "value")
+        assert ResultCache(tmp_path / "cache.sqlite3").get("k") == "value"
+
+    def test_expiry(self, tmp_path):
+        """Test that expired entries are not returned."""
+        cache = ResultCache(tmp_path / "cache.sqlite3")
+        cache.set("k", "value", expire=-1)
+        assert cache.get("k") is None
+
+    def test_unusable_path(self, tmp_path):
+        """Test that an unusable location disables the cache instead of failing."""
+        blocker = tmp_path / "file"
+        blocker.write_text("not a directory")
+        cache = ResultCache(blocker / "cache.sqlite3")
+        assert not cache.enabled
+        cache.set("k", "value")
+        assert cache.get("k") is None
@@ -3,8 +3,13 @@
 import sys
 from unittest.mock import patch
 
+import pytest
+
 from runwise.cli import (
+    _COMMANDS,
+    _build_parser,
     _get_default_metric_keys,
+    _top_level_keys,
     cmd_best,
     cmd_compare,
     cmd_config,
@@ -16,6 +21,7 @@ from runwise.cli import (
     cmd_local,
     cmd_notes,
     cmd_run,
+    cmd_shell,
     cmd_stats,
     main,
 )
@@ -245,6 +251,90 @@ class TestGetDefaultMetricKeys:
         # Should find train/loss and train/accuracy since they contain common patterns
         assert len(keys) > 0
 
+    def test_key_priority_order(self, tmp_path):
+        """Test that keys are ordered by pattern priority, exact matches first."""
+        files = tmp_path / "files"
+        files.mkdir()
+        (files / "wandb-history.jsonl").write_text(
+            '{"_step": 0, "lr": 0.1, "aux_loss": 2.0, "val/loss": 1.0, "train/loss": 1.0,'
+            ' "loss": 1.0, "gpu_mem": 3, "train/accuracy": 0.5}\n'
+        )
+
+        class Run:
+            directory = tmp_path
+
+        keys = _get_default_metric_keys(None, Run())
+        assert keys == ["loss", "val/loss", "train/loss", "aux_loss", "train/accuracy", "lr"]
+
+    def test_keys_cached_until_file_changes(self, temp_wandb_dir, isolated_cache_dir, monkeypatch):
+        """Test that detected keys are reused while the history file is unchanged."""
+        import runwise.cli as cli
+
+        calls = []
+        detect = cli._detect_default_keys
+        monkeypatch.setattr(cli, "_detect_default_keys", lambda path: calls.append(path) or detect(path))
+
+        config = RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"])
+        run = RunAnalyzer(config).find_run("abc123")
+        first = _get_default_metric_keys(None, run)
+        assert _get_default_metric_keys(None, run) == first
+        assert len(calls) == 1
+        assert (isolated_cache_dir / "default_keys.json").exists()
+
+        # Appending to the history invalidates the entry
+        with open(run.directory / "files" / "wandb-history.jsonl", "a") as f:
+            f.write('{"_step": 99999, "train/loss": 0.1}\n')
+        assert _get_default_metric_keys(None, run) == first
+        assert len(calls) == 2
+
+    def test_records_longer_than_read_chunk(self, tmp_path):
+        """Test that keys are still found when early records exceed 64 KB."""
+        (tmp_path / "files").mkdir()
+        padding = "x" * 100_000
+        (tmp_path / "files" / "wandb-history.jsonl").write_text(
+            f'{{"_step": 0, "media": "{padding}"}}\n'
+            f'{{"_step": 1, "media": "{padding}", "val_loss": 0.5}}\n'
+            '{"_step": 2, "loss": 0.4}\n'
+        )
+
+        class Run:
+            directory = tmp_path
+
+        assert _get_default_metric_keys(None, Run()) == ["loss", "val_loss"]
+
+    def test_empty_or_missing_history(self, tmp_path, isolated_cache_dir):
+        """Test that missing and empty history files return no keys without caching."""
+        class Run:
+            directory = tmp_path
+
+        assert _get_default_metric_keys(None, Run()) == []
+        (tmp_path / "files").mkdir()
+        (tmp_path / "files" / "wandb-history.jsonl").write_text("\n")
+        assert _get_default_metric_keys(None, Run()) == []
+        assert not (isolated_cache_dir / "default_keys.json").exists()
+
+
+class TestTopLevelKeys:
+    """Tests for _top_level_keys helper."""
+
+    def test_flat_record(self):
+        """Test keys of a flat wandb-style record."""
+        line = b'{"_step": 10, "train/loss": 0.5, "lr": 1e-4, "grad": NaN}\n'
+        assert _top_level_keys(line) == ["_step", "train/loss", "lr", "grad"]
+
+    def test_nested_values_ignored(self):
+        """Test that keys of nested objects are not reported."""
+        line = b'{"a": {"b": [1, {"c": 2}]}, "d": "x: {y}", "e\\"q": 1}'
+        assert _top_level_keys(line) == ["a", "d", 'e"q']
+
+    def test_malformed(self):
+        """Test that truncated lines do not raise."""
+        assert _top_level_keys(b'{"a": 1, "b') == ["a"]
+
+    def test_bad_escape(self):
+        """Test that an invalid escape in a key stops the scan instead of raising."""
+        assert _top_level_keys(b'{"x": 0, "a\\q": 1, "b": 2}') == ["x"]
+
 
 class TestMainEntrypoint:
     """Tests for main CLI entrypoint."""
@@ -270,3 +360,57 @@ class TestMainEntrypoint:
             assert "abc123" in captured.out or "def456" in captured.out or "No runs" in captured.out
         finally:
             os.chdir(original_cwd)
+
+    def test_init_skips_analyzer(self, tmp_path, monkeypatch, capsys):
+        """Test that init runs without detecting config or building an analyzer."""
+        import runwise.cli as cli
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(cli, "_make_analyzer", lambda: pytest.fail("analyzer built"))
+        with patch.object(sys, 'argv', ['runwise', 'init']):
+            main()
+        assert (tmp_path / "runwise.json").exists()
+
+    def test_build_parser_single_command(self):
+        """Test that only the requested subcommand parser is built."""
+        parser = _build_parser("history")
+        subparsers = parser._subparsers._group_actions[0]
+        assert list(subparsers.choices) == ["history"]
+        args = parser.parse_args(["history", "abc", "-k", "loss"])
+        assert args.command == "history"
+        assert args.keys == "loss"
+        assert args.func is cmd_history
+
+    def test_build_parser_all_commands(self):
+        """Test that help lists every command."""
+        parser = _build_parser()
+        subparsers = parser._subparsers._group_actions[0]
+        assert list(subparsers.choices) == list(_COMMANDS)
+
+
+class TestShell:
+    """Tests for the interactive shell command."""
+
+    def test_shell_runs_commands(self, temp_wandb_dir, capsys, monkeypatch):
+        """Test that commands run in-process against one analyzer."""
+        config = RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"])
+        analyzer = RunAnalyzer(config)
+        lines = iter(["", "list", "bogus-command", "keys abc123", "exit", "list"])
+        monkeypatch.setattr("builtins.input", lambda prompt="": next(lines))
+
+        cmd_shell(analyzer, MockArgs())
+
+        captured = capsys.readouterr()
+        assert "def456" in captured.out
+        assert "invalid choice" in captured.err
+        assert "train/loss" in captured.out
+        # Input after 'exit' is never read
+        assert next(lines) == "list"
+
+    def test_shell_exits_on_eof(self, capsys, monkeypatch):
+        """Test that end of input ends the session."""
+        def eof(prompt=""):
+            raise EOFError
+
+        monkeypatch.setattr("builtins.input", eof)
+        cmd_shell(None, MockArgs())
@@ -59,8 +59,7 @@ class TestMetricSchema:
                 ],
                 "validation_sets": {"val": "Validation"},
             }
-            with open(schema_path, "w") as f:
-                json.dump(data, f)
+            schema_path.write_text(json.dumps(data, separators=(",", ":")))
 
             schema = MetricSchema.from_file(schema_path)
 
@@ -81,8 +80,7 @@ class TestMetricSchema:
                 "per_step_pattern": "loss_step_{i}",
                 "num_steps": 8,
             }
-            with open(schema_path, "w") as f:
-                json.dump(data, f)
+            schema_path.write_text(json.dumps(data, separators=(",", ":")))
 
             schema = MetricSchema.from_file(schema_path)
 
@@ -169,6 +167,12 @@ class TestRunwiseConfig:
         finally:
             os.chdir(original_cwd)
 
+    def test_auto_detect_with_config_path_env(self, temp_config_file, tmp_path, monkeypatch):
+        """Test that RUNWISE_CONFIG_PATH selects the config file explicitly."""
+        monkeypatch.setenv("RUNWISE_CONFIG_PATH", str(temp_config_file))
+        config = RunwiseConfig.auto_detect(tmp_path)
+        assert config.project_name == "Test Project"
+
     def test_config_schema_property(self):
         """Test that schema property works."""
         config = RunwiseConfig()
@@ -1,9 +1,27 @@
 """Tests for runwise.core module."""
 
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from runwise.config import RunwiseConfig
-from runwise.core import RunAnalyzer, RunInfo
+from runwise.core import (
+    RunAnalyzer,
+    RunInfo,
+    _count_lines,
+    _history_columns,
+    _iter_lines,
+    _key_matcher,
+    _line_extractor,
+    _lines_with_keys,
+    _parse_config_scalar,
+    _quick_step,
+    _read_edge_lines,
+    _read_sampled_lines,
+    _read_tail_lines,
+    _sample_indices,
+)
 
 
 class TestRunInfo:
@@ -41,6 +59,171 @@ class TestRunInfo:
         assert run.tags == []
 
 
+class TestSampling:
+    """Tests for history line sampling helpers."""
+
+    def test_count_lines(self):
+        """Test that counts match line iteration, with or without a trailing newline."""
+        for data in (b"", b"a\n", b"a\nb", b"a\n\nb\n"):
+            assert _count_lines(data) == sum(1 for _ in io.BytesIO(data))
+
+    def test_sample_indices(self):
+        """Test evenly spaced indices including both ends."""
+        assert _sample_indices(5, 10) == [0, 1, 2, 3, 4]
+        assert _sample_indices(101, 3) == [0, 50, 100]
+        assert _sample_indices(10, 1) == [0]
+        assert _sample_indices(10, 0) == []
+        indices = _sample_indices(1000, 999)
+        assert indices == sorted(set(indices))
+
+    def test_read_sampled_lines(self, tmp_path):
+        """Test that sampled lines are returned without newlines, in order."""
+        path = tmp_path / "lines.jsonl"
+        path.write_bytes(b"".join(b"%d\n" % i for i in range(100)) + b"last")
+        total, lines = _read_sampled_lines(path, 3)
+        assert total == 101
+        assert lines == [(0, b"0"), (50, b"50"), (100, b"last")]
+
+        path.write_bytes(b"")
+        assert _read_sampled_lines(path, 3) == (0, [])
+
+    def test_read_sampled_lines_across_blocks(self, tmp_path):
+        """Test block skipping on files much larger than a skip block."""
+        lines = [b"%d:" % i + b"x" * (i % 97) * 50 for i in range(20000)]
+        path = tmp_path / "big.jsonl"
+        path.write_bytes(b"\n".join(lines) + b"\n")
+        total, sampled = _read_sampled_lines(path, 37)
+        assert total == len(lines)
+        assert sampled == [(i, lines[i]) for i in _sample_indices(total, 37)]
+
+    def test_read_sampled_lines_reuses_count(self, tmp_path, monkeypatch):
+        """Test that an unchanged file is only counted once."""
+        from runwise import core
+
+        calls = []
+        original = core._count_lines
+        monkeypatch.setattr(core, "_count_lines", lambda data: calls.append(1) or original(data))
+        path = tmp_path / "lines.jsonl"
+        path.write_bytes(b"".join(b"%d\n" % i for i in range(10)))
+        assert _read_sampled_lines(path, 3)[0] == 10
+        assert _read_sampled_lines(path, 5)[0] == 10
+        assert len(calls) == 1
+
+        with open(path, "ab") as f:
+            f.write(b"10\n")
+        assert _read_sampled_lines(path, 3)[0] == 11
+        assert len(calls) == 2
+
+    def test_read_sampled_lines_concurrent_eviction(self, tmp_path, monkeypatch):
+        """Test that threads filling the shared line-count cache don't fail."""
+        from runwise import core
+
+        monkeypatch.setattr(core, "_LINE_COUNT_CACHE_SIZE", 2)
+        monkeypatch.setattr(core, "_line_counts", {})
+        paths = []
+        for i in range(1, 41):
+            path = tmp_path / f"lines{i}.jsonl"
+            path.write_bytes(b"x\n" * i)
+            paths.append(path)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            totals = list(pool.map(lambda p: _read_sampled_lines(p, 3)[0], paths * 3))
+        assert totals == list(range(1, 41)) * 3
+        assert len(core._line_counts) <= 2
+
+    def test_iter_lines(self, tmp_path):
+        """Test that mmap line iteration matches file iteration."""
+        path = tmp_path / "lines.jsonl"
+        for data in (b"", b"a\n", b"a\n\nb", b'{"x": 1}\n{"x": 2}\n'):
+            path.write_bytes(data)
+            assert list(_iter_lines(path)) == list(io.BytesIO(data))
+
+    def test_read_tail_lines(self, tmp_path):
+        """Test that tail reads match the last lines of text-mode iteration."""
+        path = tmp_path / "output.log"
+        contents = [
+            "",
+            "one line",
+            "a\nb\n",
+            "".join(f"Step {i} | loss: {i / 7:.5f}\n" for i in range(500)),
+            "start\n" + "".join(f"{i}%|###\r" for i in range(300)) + "done\r\nend",
+        ]
+        for text in contents:
+            path.write_bytes(text.encode())
+            with open(path) as f:
+                expected = [line.rstrip("\n") for line in f]
+            for count in (1, 3, 100, 1000):
+                assert _read_tail_lines(path, count, block=16) == expected[-count:]
+        assert _read_tail_lines(path, 0) == []
+
+    def test_read_edge_lines(self, tmp_path):
+        """Test that only complete lines from the head and tail are returned."""
+        path = tmp_path / "lines.txt"
+        path.write_bytes(b"".join(b"line%03d\n" % i for i in range(100)))
+        lines, whole = _read_edge_lines(path, block=20)
+        assert not whole
+        assert lines == [b"line000", b"line001", b"line098", b"line099", b""]
+        lines, whole = _read_edge_lines(path)
+        assert whole
+        assert len(lines) == 101
+
+    def test_quick_step(self):
+        """Test that only top-level step fields of plain lines are read directly."""
+        assert _quick_step(b'{"_step": 4, "loss": 1}\n', 0) == 4
+        assert _quick_step(b'{"step": 7}', 0) == 7
+        assert _quick_step(b'{"loss": 1}', 9) == 9
+        assert _quick_step(b'{"step": 1.5}', 0) is None
+        assert _quick_step(b'{"meta": {"_step": 5}, "loss": 1}', 0) is None
+        assert _quick_step(b'{"_step": 2, "s": "\\"_step\\": 8,"}', 0) is None
+
+    def test_key_matcher(self, monkeypatch):
+        """Test any-key substring matching with and without pyahocorasick."""
+        from runwise import core
+
+        for available in {core.AHOCORASICK_AVAILABLE, False}:
+            monkeypatch.setattr(core, "AHOCORASICK_AVAILABLE", available)
+            _key_matcher.cache_clear()
+            contains = _key_matcher(("loss", "acc"))
+            assert contains("step 5 val_loss: 0.2")
+            assert contains("accuracy 0.9")
+            assert not contains("step 5 lr: 0.1")
+            assert not _key_matcher(())("loss")
+            assert _key_matcher(("loss", ""))("anything")
+        _key_matcher.cache_clear()
+
+    def test_lines_with_keys(self):
+        """Test that whole-text search matches the per-line check."""
+        text = "Step 1 Loss: 0.5\n\n  val_loss 0.4  \nlr 0.1\nACC 0.9"
+        expected = ["Step 1 Loss: 0.5", "val_loss 0.4", "ACC 0.9"]
+        assert _lines_with_keys(text, ("loss", "acc")) == expected
+        # Non-ASCII text and untrimmed keys take the per-line path
+        assert _lines_with_keys(text + "\né loss", ("loss", "acc")) == expected + ["é loss"]
+        assert _lines_with_keys(text, ("loss ",)) == ["val_loss 0.4"]
+        assert _lines_with_keys(text, ()) == []
+
+    def test_line_extractor(self):
+        """Test that the per-key-set extractor is reused and filters records."""
+        extract = _line_extractor(("loss", "step"))
+        assert _line_extractor(("loss", "step")) is extract
+        assert extract(b'{"_step": 4, "loss": 0.5, "acc": 1}', 0) == {"_step": 4, "loss": 0.5}
+        assert extract(b'{"step": 7, "acc": 1}', 0) == {"_step": 7, "step": 7}
+        assert extract(b'{"acc": 1}', 3) == {"_step": 3}
+        assert extract(b"not json", 0) is None
+
+    def test_history_columns(self):
+        """Test that records are transposed into per-key columns."""
+        history = [{"_step": 0, "loss": 1.0}, {"_step": 1}, {"_step": 2, "loss": None}]
+        assert _history_columns(history) == {"_step": [0, 1, 2], "loss": [1.0, None]}
+
+    def test_parse_config_scalar(self):
+        """Test scalar parsing in the config fallback parser."""
+        assert _parse_config_scalar("null") is None
+        assert _parse_config_scalar("true") is True
+        assert _parse_config_scalar("'adam'") == "adam"
+        assert _parse_config_scalar("64") == 64
+        assert _parse_config_scalar("1E-3") == 0.001
+        assert _parse_config_scalar("nan") == "nan"
+
+
 class TestRunAnalyzer:
     """Tests for RunAnalyzer class."""
 
@@ -56,6 +239,24 @@ class TestRunAnalyzer:
         assert runs[0].run_id == "def456"  # More recent
         assert runs[1].run_id == "abc123"
 
+    def test_list_runs_serial_matches_parallel(self, temp_wandb_dir):
+        """Test that the thread pool preserves order and limit."""
+        parallel = RunAnalyzer(RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"]))
+        serial = RunAnalyzer(RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"], io_workers=1))
+
+        assert parallel.list_runs() == serial.list_runs()
+        assert [r.run_id for r in parallel.list_runs(limit=1)] == ["def456"]
+
+    def test_get_stability_csv_downsampled(self, temp_wandb_dir):
+        """Test that stability CSV rows are evenly downsampled, even to one row."""
+        analyzer = RunAnalyzer(RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"]))
+        run = analyzer.find_run("abc123")
+
+        csv = analyzer.get_stability_csv(run, ["train/loss"], window=10, samples=5)
+        assert len(csv.splitlines()) == 6  # Header + 5 rows
+        csv = analyzer.get_stability_csv(run, ["train/loss"], window=10, samples=1)
+        assert len(csv.splitlines()) == 2
+
     def test_get_latest_run(self, temp_wandb_dir):
         """Test getting latest run via symlink."""
         config = RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"])
@@ -65,6 +266,18 @@ class TestRunAnalyzer:
         assert latest is not None
         assert latest.run_id == "def456"
 
+    def test_get_latest_run_marker_file(self, temp_wandb_dir):
+        """Test a latest-run text file naming the run directory."""
+        wandb_dir = temp_wandb_dir["wandb_dir"]
+        latest = wandb_dir / "latest-run"
+        latest.unlink()
+        latest.write_text(temp_wandb_dir["run1_dir"].name + "\n")
+        analyzer = RunAnalyzer(RunwiseConfig(wandb_dir=wandb_dir))
+        assert analyzer.get_latest_run().run_id == "abc123"
+
+        latest.write_text("run-missing")
+        assert analyzer.get_latest_run() is None
+
     def test_find_run(self, temp_wandb_dir):
         """Test finding specific run by ID."""
         config = RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"])
@@ -83,6 +296,54 @@ class TestRunAnalyzer:
         run = analyzer.find_run("nonexistent")
         assert run is None
 
+    def test_parsed_runs_cached_until_files_change(self, temp_wandb_dir, monkeypatch):
+        """Test that unchanged run directories are not parsed again."""
+        import json
+
+        config = RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"])
+        analyzer = RunAnalyzer(config)
+        calls = []
+        load = analyzer._load_run_dir
+        monkeypatch.setattr(analyzer, "_load_run_dir", lambda d: calls.append(d) or load(d))
+
+        first = analyzer.find_run("abc123")
+        second = analyzer.find_run("abc123")
+        assert len(calls) == 1
+        assert second is not first
+        assert second.metrics == first.metrics
+
+        summary_file = temp_wandb_dir["run1_dir"] / "files" / "wandb-summary.json"
+        summary_file.write_text(json.dumps({"_step": 20000, "train/loss": 0.1}))
+        assert analyzer.find_run("abc123").final_step == 20000
+        assert len(calls) == 2
+
+    def test_find_run_empty_id_is_latest(self, temp_wandb_dir):
+        """Test that an empty run ID resolves to the latest run."""
+        config = RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"])
+        analyzer = RunAnalyzer(config)
+
+        run = analyzer.find_run("")
+        assert run is not None
+        assert run.run_id == temp_wandb_dir["run2_id"]
+        assert run.segments == []
+
+    def test_latest_run_with_fresh_history_is_running(self, tmp_path):
+        """Test that the run latest-run points at is running while history is fresh."""
+        for marker in (False, True):
+            wandb_dir = tmp_path / f"wandb-{marker}"
+            for name in ("run-20250101_000000-old111", "run-20250102_000000-new222"):
+                files = wandb_dir / name / "files"
+                files.mkdir(parents=True)
+                (files / "wandb-history.jsonl").write_text('{"_step": 0}\n')
+            if marker:
+                (wandb_dir / "latest-run").write_text("run-20250102_000000-new222\n")
+            else:
+                (wandb_dir / "latest-run").symlink_to(wandb_dir / "run-20250102_000000-new222")
+
+            analyzer = RunAnalyzer(RunwiseConfig(wandb_dir=wandb_dir))
+            assert analyzer.find_run("new222").state == "running"
+            assert analyzer.find_run("old111").state == "unknown"
+
     def test_parse_run_metadata(self, temp_wandb_dir):
         """Test that run metadata is parsed correctly."""
         config = RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"])
@@ -115,6 +376,18 @@ class TestRunAnalyzer:
         assert run.config["batch_size"] == 64
         assert run.config["model"] == "transformer"
 
+    def test_parse_run_config_without_yaml(self, temp_wandb_dir, monkeypatch):
+        """Test that the fallback parser agrees with PyYAML on scalar configs."""
+        import runwise.core as core
+
+        config = RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"])
+        analyzer = RunAnalyzer(config)
+        config_file = temp_wandb_dir["run1_dir"] / "files" / "config.yaml"
+
+        parsed = analyzer._parse_wandb_config(config_file)
+        monkeypatch.setattr(core, "YAML_AVAILABLE", False)
+        assert analyzer._parse_wandb_config(config_file) == parsed
+
     def test_summarize_run(self, temp_wandb_dir):
         """Test run summary generation."""
         config = RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"])
@@ -128,6 +401,18 @@ class TestRunAnalyzer:
         assert "baseline-run" in summary  # Name
         assert "baseline, v1" in summary  # Tags
 
+    def test_summarize_run_sparklines_only_shown_keys(self, temp_wandb_dir, monkeypatch):
+        """Test that sparklines are only built for displayed metrics."""
+        from runwise import core
+
+        drawn = []
+        monkeypatch.setattr(core, "sparkline", lambda values, width: drawn.append(values) or "~")
+        analyzer = RunAnalyzer(RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"]))
+
+        summary = analyzer.summarize_run(analyzer.find_run("abc123"), keys=["train/loss"])
+        assert len(drawn) == 1
+        assert "~" in summary
+
     def test_format_run_list(self, temp_wandb_dir):
         """Test run list formatting."""
         config = RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"])
@@ -230,6 +515,178 @@ class TestRunAnalyzer:
         assert "Max" in stats
         assert "Mean" in stats
 
+    def test_history_stats_missing_keys(self, tmp_path):
+        """Test that keys absent from the file are reported, not parsed for."""
+        (tmp_path / "files").mkdir()
+        (tmp_path / "files" / "wandb-history.jsonl").write_text(
+            '{"_step": 0, "loss": 2.0}\n{"_step": 1}\n{"_step": 2, "loss": 1.0, "val": 3.0}\n'
+        )
+        run = RunInfo(run_id="r", directory=tmp_path, date="", time="")
+        analyzer = RunAnalyzer(RunwiseConfig())
+
+        stats = analyzer.get_history_stats(run, ["loss", "val", "bogus"])
+        lines = stats.splitlines()
+        assert "(3 steps)" in lines[0]
+        assert lines[4].split() == ["loss", "1.0000", "2.0000", "1.5000", "1.0000", "0"]
+        assert lines[5].split() == ["val", "3.0000", "3.0000", "3.0000", "3.0000", "0"]
+        assert lines[-1] == "Not in history: bogus"
+
+        assert analyzer.get_history_stats(run, ["bogus"]).startswith("No data for keys: ['bogus']")
+
+    def test_history_cache_eviction_is_thread_safe(self, temp_wandb_dir, monkeypatch):
+        """Test that concurrent callers evicting from a full cache don't fail."""
+        from runwise import core
+
+        monkeypatch.setattr(core, "_HISTORY_CACHE_SIZE", 2)
+        analyzer = RunAnalyzer(RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"]))
+        run = analyzer.find_run("abc123")
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(
+                lambda n: len(analyzer.get_history_data(run, samples=n)), range(2, 200)
+            ))
+        assert results == list(range(2, 102)) + [101] * 98
+        assert len(analyzer._history_cache) <= 2
+
+    def test_keys_cache_eviction_is_thread_safe(self, tmp_path, monkeypatch):
+        """Test that concurrent key scans evicting from a full cache don't fail."""
+        from runwise import core
+
+        monkeypatch.setattr(core, "_HISTORY_CACHE_SIZE", 2)
+        files = []
+        for i in range(40):
+            path = tmp_path / f"history{i}.jsonl"
+            path.write_text(f'{{"_step": 0, "m{i}": 1}}\n')
+            files.append(path)
+        analyzer = RunAnalyzer(RunwiseConfig())
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(analyzer._history_keys, files * 3))
+        assert results == [{"_step", f"m{i}"} for i in range(40)] * 3
+        assert len(analyzer._keys_cache) <= 2
+
+    def test_history_data_cached_until_file_changes(self, temp_wandb_dir, monkeypatch):
+        """Test that repeated history samples reuse the earlier decode."""
+        config = RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"])
+        analyzer = RunAnalyzer(config)
+        run = analyzer.find_run("abc123")
+        calls = []
+        load = analyzer._load_history_data
+        monkeypatch.setattr(
+            analyzer, "_load_history_data", lambda *a: calls.append(a) or load(*a)
+        )
+
+        first = analyzer.get_history_data(run, samples=20)
+        assert analyzer.get_history_data(run, samples=20) == first
+        assert len(calls) == 1
+        analyzer.get_history_data(run, samples=10)
+        assert len(calls) == 2
+
+        with open(run.directory / "files" / "wandb-history.jsonl", "a") as f:
+            f.write('{"_step": 99999, "train/loss": 0.1}\n')
+        assert analyzer.get_history_data(run, samples=20)[-1]["_step"] == 99999
+        assert len(calls) == 3
+
+    def test_available_keys_cached_until_file_changes(self, temp_wandb_dir):
+        """Test that key listings share one cached scan per file stamp."""
+        analyzer = RunAnalyzer(RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"]))
+        run = analyzer.find_run("abc123")
+        history_file = run.directory / "files" / "wandb-history.jsonl"
+
+        listing = analyzer.list_available_keys(run)
+        assert listing == "Available keys:\ntrain/accuracy\ntrain/loss"
+        assert analyzer._get_available_keys(run) == {"_step", "train/accuracy", "train/loss"}
+        assert len(analyzer._keys_cache) == 1
+
+        history_file.write_text(history_file.read_text().replace("train/accuracy", "train/acc"))
+        assert "train/acc\n" in analyzer.list_available_keys(run)
+        assert len(analyzer._keys_cache) == 2
+
+    def test_history_keys_from_file_edges(self, tmp_path):
+        """Test that keys come from the head and tail blocks of large files."""
+        history_file = tmp_path / "wandb-history.jsonl"
+        lines = [f'{{"_step": {i}, "loss": 1, "lr": 2, "acc": 3}}' for i in range(5000)]
+        lines[2500] = '{"_step": 2500, "middle": 1}'
+        lines[-1] = '{"_step": 4999, "val/loss": 0.5}'
+        history_file.write_text("\n".join(lines) + "\n")
+
+        analyzer = RunAnalyzer(RunwiseConfig())
+        keys = analyzer._history_keys(history_file)
+        assert keys == {"_step", "loss", "lr", "acc", "val/loss"}
+
+    def test_history_keys_sampling_fallback(self, tmp_path):
+        """Test that sparse edge keys fall back to sampling the first lines."""
+        history_file = tmp_path / "wandb-history.jsonl"
+        lines = [f'{{"_step": {i}, "loss": 1}}' for i in range(8000)]
+        lines[3000] = '{"_step": 3000, "lr": 1, "acc": 2}'
+        history_file.write_text("\n".join(lines) + "\n")
+
+        analyzer = RunAnalyzer(RunwiseConfig())
+        assert analyzer._history_keys(history_file) == {"_step", "loss", "lr", "acc"}
+
+    def test_downsample_jsonl_cells(self, tmp_path):
+        """Test CSV cell formatting for floats, ints, strings, missing keys and bad lines."""
+        log_file = tmp_path / "run.jsonl"
+        log_file.write_bytes(
+            b'{"_step": 0, "loss": 0.123456789, "phase": "warmup", "n": 3}\n'
+            b'{"_step": 1, "lr": 0.1}\n'
+            b'not json\n'
+            b'{"step": 3, "loss": NaN, "n": null}\n'
+        )
+        analyzer = RunAnalyzer(RunwiseConfig(logs_dir=tmp_path))
+
+        csv = analyzer.get_local_history(log_file, ["loss", "phase", "n"])
+        assert csv.splitlines() == [
+            "step,loss,phase,n",
+            "0,0.123457,warmup,3",
+            "1,,,",
+            "3,nan,,None",
+        ]
+
+    def test_history_data_key_projection(self, tmp_path):
+        """Test that lines without requested keys still yield their step."""
+        import json
+
+        lines = [
+            '{"_step": 0, "loss": 1.0, "lr": 0.1}',
+            '{"_step": 1, "lr": 0.1}',
+            '{"step": 2, "lr": 0.1}',
+            '{"lr": 0.1}',
+            '{"_step": 4.0, "lr": 0.1}',
+            '{"_step": 5, "note": "loss"}',
+            '{"_step": 6, "media": {"step": 3}}',
+            '{"_step": 7, "lo\\u0073s": 0.5}',
+            'not json',
+        ]
+        (tmp_path / "files").mkdir()
+        (tmp_path / "files" / "wandb-history.jsonl").write_text("\n".join(lines) + "\n")
+        run = RunInfo(run_id="x", directory=tmp_path, date="", time="")
+
+        expected = []
+        for line_num, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            row = {"_step": record.get("_step", record.get("step", line_num))}
+            if "loss" in record:
+                row["loss"] = record["loss"]
+            expected.append(row)
+
+        analyzer = RunAnalyzer(RunwiseConfig(wandb_dir=tmp_path))
+        assert analyzer.get_history_data(run, keys=["loss"], samples=100) == expected
+
+    def test_history_data_skips_internal_rows(self, tmp_path):
+        """Test that rows with only internal keys are dropped without a key filter."""
+        (tmp_path / "files").mkdir()
+        (tmp_path / "files" / "wandb-history.jsonl").write_text(
+            '{"_step": 0, "loss": 1.0}\n'
+            '{"_step": 1, "_wandb": {"_runtime": 5}}\n'
+            '{"_step": 2, "_wandb": {"runtime": 6}}\n'
+            '{ "_step": 3 , "lr" : 0.1}\n'
+        )
+        run = RunInfo(run_id="x", directory=tmp_path, date="", time="")
+        analyzer = RunAnalyzer(RunwiseConfig(wandb_dir=tmp_path))
+        assert [r["_step"] for r in analyzer.get_history_data(run)] == [0, 2, 3]
+
     def test_list_available_keys(self, temp_wandb_dir):
         """Test listing available metric keys."""
         config = RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"])
@@ -263,6 +720,45 @@ class TestRunAnalyzer:
         assert "LIVE TRAINING STATUS" in status
         assert "Run ID: def456" in status  # Latest run ID shown
 
+    def test_get_live_status_parses_output_log(self, temp_wandb_dir):
+        """Test that the latest step, loss, accuracy, LR and validation are read."""
+        (temp_wandb_dir["run2_dir"] / "files" / "output.log").write_text(
+            "Step 100 | Loss: 0.9 | Accuracy: 0.5 | lr: 1e-3\n"
+            "Val (Easy) | Token Acc: 0.987 | Seq Acc: 0.941\n"
+            "Step 200 | Loss: 0.7 | val_loss: 0.2 | Acc: 0.6\n"
+        )
+        analyzer = RunAnalyzer(RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"]))
+
+        status = analyzer.get_live_status()
+        assert "Current Step: 200" in status
+        assert "Loss: 0.7000" in status
+        assert "Accuracy: 60.0%" in status
+        assert "LR: 1.00e-03" in status
+        assert "Easy: Token: 98.7% | Seq: 94.1%" in status
+
+    def test_history_from_output_log(self, temp_wandb_dir):
+        """Test text-log history parsing with overlapping key names."""
+        (temp_wandb_dir["run2_dir"] / "files" / "output.log").write_text(
+            "step: 10 val_loss: 0.3 loss: 0.5\n"
+            "step: 20 LOSS: 0.4\n"
+        )
+        analyzer = RunAnalyzer(RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"]))
+
+        csv = analyzer.get_history(analyzer.find_run("def456"), ["loss", "val_loss"])
+        assert csv.splitlines() == ["step,loss,val_loss", "10,0.5,0.3", "20,0.4,"]
+
+    def test_history_from_output_log_json_lines(self, temp_wandb_dir):
+        """Test that JSON object lines are decoded and other JSON values ignored."""
+        (temp_wandb_dir["run2_dir"] / "files" / "output.log").write_text(
+            '{"_step": 5, "loss": 0.25}\n'
+            '"loss"\n'
+            '{"step": 6, "loss": NaN}\n'
+        )
+        analyzer = RunAnalyzer(RunwiseConfig(wandb_dir=temp_wandb_dir["wandb_dir"]))
+
+        csv = analyzer.get_history(analyzer.find_run("def456"), ["loss"])
+        assert csv.splitlines() == ["step,loss", "5,0.25", "6,nan"]
+
 
 class TestLocalLogs:
     """Tests for local log file handling."""
@@ -276,6 +772,21 @@ class TestLocalLogs:
         assert len(logs) == 1
         assert logs[0].name == "training.jsonl"
 
+    def test_list_local_logs_patterns(self, tmp_path):
+        """Test name patterns, newest-first order and missing directories."""
+        names = ["a.jsonl", "metrics_1.json", "train_2.log", "other.json", "train.log", "notes.txt"]
+        for i, name in enumerate(names):
+            path = tmp_path / name
+            path.write_text("{}\n")
+            os.utime(path, (i, i))
+        (tmp_path / "dir.jsonl").mkdir()
+
+        analyzer = RunAnalyzer(RunwiseConfig(logs_dir=tmp_path))
+        assert [p.name for p in analyzer.list_local_logs()] == [
+            "train_2.log", "metrics_1.json", "a.jsonl"
+        ]
+        assert RunAnalyzer(RunwiseConfig(logs_dir=tmp_path / "missing")).list_local_logs() == []
+
     def test_parse_local_log(self, temp_logs_dir):
         """Test parsing local log file."""
         config = RunwiseConfig(logs_dir=temp_logs_dir)
@@ -288,6 +799,68 @@ class TestLocalLogs:
         assert records[0]["step"] == 0
         assert records[-1]["step"] == 1000
 
+    def test_local_history_stats_values(self, tmp_path):
+        """Test min/max/mean/final and NaN counts from the running aggregates."""
+        log_file = tmp_path / "run.jsonl"
+        log_file.write_bytes(
+            b'{"step": 0, "loss": 2.0}\n'
+            b'{"step": 1, "loss": NaN}\n'
+            b'{"step": 2, "loss": 0.5}\n'
+            b'{"step": 3, "loss": null}\n'
+            b'{"step": 4, "loss": 1}\n'
+        )
+        analyzer = RunAnalyzer(RunwiseConfig(logs_dir=tmp_path))
+
+        stats = analyzer.get_local_history_stats(log_file, ["loss", "acc"])
+        assert "loss                     0.5000     2.0000     1.1667     1.0000      2" in stats
+        assert "acc                          --         --         --         --      0" in stats
+
+    def test_parse_local_log_nan_and_bad_bytes(self, tmp_path):
+        """Test that NaN literals parse and undecodable lines are skipped."""
+        log_file = tmp_path / "diverged.jsonl"
+        log_file.write_bytes(
+            b'{"step": 0, "loss": 1.0}\n'
+            b'{"step": 1, "loss": NaN}\n'
+            b'{"step": 2, "loss": "\xff"}\n'
+        )
+        analyzer = RunAnalyzer(RunwiseConfig(logs_dir=tmp_path))
+
+        records = analyzer.parse_local_log(log_file)
+        assert [r["step"] for r in records] == [0, 1]
+        assert records[1]["loss"] != records[1]["loss"]
+
+    def test_quick_log_stats(self, temp_logs_dir):
+        """Test streaming record count and max step."""
+        config = RunwiseConfig(logs_dir=temp_logs_dir)
+        analyzer = RunAnalyzer(config)
+
+        count, max_step, keys = analyzer.quick_log_stats(temp_logs_dir / "training.jsonl")
+        assert count == 101
+        assert max_step == 1000
+        assert keys[0] == "step"
+
+    def test_quick_log_stats_matches_parse(self, tmp_path):
+        """Test that quick stats agree with a full parse on irregular lines."""
+        log_file = tmp_path / "mixed.jsonl"
+        log_file.write_text(
+            '{"_step": 3, "loss": 1.0}\n'
+            "\n"
+            "not json\n"
+            '{"step": 7, "_step": 99, "loss": 0.5}\n'
+            '{"step": 12.5, "loss": 0.4}\n'
+            '{"step": 17.5, "_step": 2}\n'
+            '{"step": 1e3, "_step": 3}\n'
+            '{"loss": 0.3}\n'
+            '{"meta": {"step": 500}, "loss": 0.2}\n'
+            '{"step": 4, "note": "x\\"step\\": 900,"}\n'
+        )
+        analyzer = RunAnalyzer(RunwiseConfig(logs_dir=tmp_path))
+
+        records = analyzer.parse_local_log(log_file)
+        expected_max = max(r.get("step", r.get("_step", 0)) for r in records)
+        count, max_step, keys = analyzer.quick_log_stats(log_file)
+        assert (count, max_step, keys) == (len(records), expected_max, ["_step", "loss"])
+
     def test_summarize_local_log(self, temp_logs_dir):
         """Test summarizing local log file."""
         config = RunwiseConfig(logs_dir=temp_logs_dir)
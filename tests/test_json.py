@@ -0,0 +1,71 @@
+"""Tests for runwise._json module."""
+
+import math
+
+import pytest
+
+from runwise import _json
+
+
+class TestLoads:
+    """Tests for loads function."""
+
+    def test_bytes_and_str(self):
+        """Test that both bytes and str input are accepted."""
+        assert _json.loads(b'{"a": 1}') == {"a": 1}
+        assert _json.loads('{"a": 1}') == {"a": 1}
+
+    def test_nan_literal(self):
+        """Test NaN/Infinity literals (written by wandb for diverged runs)."""
+        data = _json.loads(b'{"loss": NaN, "grad": Infinity}')
+        assert math.isnan(data["loss"])
+        assert data["grad"] == float("inf")
+
+    def test_invalid_json(self):
+        """Test that invalid input raises JSONDecodeError."""
+        with pytest.raises(_json.JSONDecodeError):
+            _json.loads(b"{not json")
+
+    def test_invalid_utf8(self):
+        """Test that invalid UTF-8 raises JSONDecodeError."""
+        with pytest.raises(_json.JSONDecodeError):
+            _json.loads(b'{"a": "\xff"}')
+
+
+class TestDumps:
+    """Tests for dumps function."""
+
+    def test_returns_bytes(self):
+        """Test that output is compact UTF-8 bytes."""
+        assert _json.dumps({"a": [1, 2], "b": "é"}) == '{"a":[1,2],"b":"é"}'.encode()
+
+    def test_roundtrip(self):
+        """Test dumps/loads roundtrip."""
+        obj = {"jsonrpc": "2.0", "id": 3, "result": {"content": [{"text": "x\ny"}]}}
+        assert _json.loads(_json.dumps(obj)) == obj
+
+
+class TestLoadsFields:
+    """Tests for loads_fields function."""
+
+    def test_selects_fields(self):
+        """Test that only requested fields are returned, with nested values copied."""
+        line = b'{"_step": 3, "loss": 0.5, "acc": 0.9, "hist": {"bins": [1, 2]}, "none": null}'
+        assert _json.loads_fields(line, ("_step", "loss", "hist", "none", "missing")) == {
+            "_step": 3, "loss": 0.5, "hist": {"bins": [1, 2]}, "none": None,
+        }
+
+    def test_repeated_calls(self):
+        """Test that successive lines decode independently."""
+        rows = [_json.loads_fields(b'{"a": {"n": %d}}' % i, ("a",)) for i in range(3)]
+        assert rows == [{"a": {"n": 0}}, {"a": {"n": 1}}, {"a": {"n": 2}}]
+
+    def test_nan_literal(self):
+        """Test that NaN literals fall back to the full decoder."""
+        assert math.isnan(_json.loads_fields(b'{"loss": NaN, "x": 1}', ("loss",))["loss"])
+
+    def test_invalid(self):
+        """Test that invalid JSON, bad UTF-8 and non-objects raise JSONDecodeError."""
+        for line in (b"{not json", b'{"a": "\xff"}', b"[1, 2]"):
+            with pytest.raises(_json.JSONDecodeError):
+                _json.loads_fields(line, ("a",))
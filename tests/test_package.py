@@ -0,0 +1,30 @@
+"""Tests for the runwise package namespace."""
+
+import subprocess
+import sys
+
+import runwise
+
+
+class TestLazyExports:
+    """Tests for lazily imported public names."""
+
+    def test_all_names_resolve(self):
+        """Test that every name in __all__ is importable from the package."""
+        for name in runwise.__all__:
+            assert getattr(runwise, name) is not None
+
+    def test_unknown_attribute(self):
+        """Test that unknown names still raise AttributeError."""
+        assert not hasattr(runwise, "does_not_exist")
+
+    def test_import_is_lazy(self):
+        """Test that importing the package does not load the analyzer modules."""
+        code = (
+            "import sys, runwise; "
+            "print(sorted(m for m in sys.modules if m.startswith('runwise.')))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        assert out.strip() == "[]"
@@ -0,0 +1,292 @@
+"""Tests for mcp_server.server module."""
+
+import io
+import json
+import sys
+
+import pytest
+
+from mcp_server.server import MCPServer, RPCRequest, _parse_keys, _write_response
+
+
+@pytest.fixture
+def server(temp_wandb_dir, monkeypatch):
+    """MCP server pointed at the temporary wandb project."""
+    monkeypatch.setenv("RUNWISE_PROJECT_ROOT", str(temp_wandb_dir["wandb_dir"].parent))
+    return MCPServer()
+
+
+class TestRPCRequest:
+    """Tests for RPCRequest."""
+
+    def test_from_dict(self):
+        """Test that missing fields get defaults."""
+        request = RPCRequest.from_dict({"method": "tools/list"})
+        assert request.method == "tools/list"
+        assert request.params == {}
+        assert request.id is None
+
+    def test_null_params(self):
+        """Test that explicit null params are treated as empty."""
+        request = RPCRequest.from_dict({"id": 7, "method": "initialize", "params": None})
+        assert request.params == {}
+        assert request.id == 7
+
+
+class TestParseKeys:
+    """Tests for _parse_keys helper."""
+
+    def test_parse_keys(self):
+        """Test that keys are split, stripped and empty entries dropped."""
+        assert _parse_keys("loss, val_loss,,") == ("loss", "val_loss")
+        assert _parse_keys("") == ()
+
+
+class TestWriteResponse:
+    """Tests for _write_response helper."""
+
+    def _write(self, response) -> bytes:
+        out = io.BytesIO()
+        _write_response(out, response)
+        return out.getvalue()
+
+    def test_small_response(self):
+        """Test that ordinary responses are one JSON line."""
+        data = self._write({"jsonrpc": "2.0", "id": 1, "result": {"tools": []}})
+        assert data.endswith(b"\n")
+        assert json.loads(data) == {"jsonrpc": "2.0", "id": 1, "result": {"tools": []}}
+
+    def test_large_text_response(self):
+        """Test that large text results are written as equivalent JSON."""
+        text = "step,loss\n" + "\n".join(f"{i},{1 / (i + 1):.6g} \"é\"" for i in range(20000))
+        response = {
+            "jsonrpc": "2.0",
+            "id": "abc",
+            "result": {"content": [{"type": "text", "text": text}]},
+        }
+        data = self._write(response)
+        assert data.endswith(b"\n")
+        assert data.count(b"\n") == 1
+        assert json.loads(data) == response
+
+
+class TestListTools:
+    """Tests for tools/list."""
+
+    def test_list_tools(self, server):
+        """Test that tool definitions are returned."""
+        response = server.handle_request({"method": "tools/list"})
+        names = [tool["name"] for tool in response["result"]["tools"]]
+        assert "health_check" in names
+        assert "get_history" in names
+
+    def test_list_tools_is_cached(self, server):
+        """Test that repeated tools/list calls reuse the same response."""
+        first = server.handle_request({"method": "tools/list"})["result"]
+        second = server.handle_request({"method": "tools/list"})["result"]
+        assert first is second
+
+
+class TestResolveRun:
+    """Tests for run resolution caching."""
+
+    def test_latest_run_cached(self, server, temp_wandb_dir, monkeypatch):
+        """Test that repeated lookups reuse the resolved run."""
+        calls = []
+        original = server.analyzer.find_run
+        monkeypatch.setattr(
+            server.analyzer, "find_run", lambda run_id: calls.append(1) or original(run_id)
+        )
+        first = server._resolve_run("")
+        second = server._resolve_run("")
+        assert first is second
+        assert first.run_id == temp_wandb_dir["run2_id"]
+        assert len(calls) == 1
+
+    def test_miss_not_cached(self, server, temp_wandb_dir):
+        """Test that unknown run IDs are looked up again."""
+        assert server._resolve_run("nonexistent") is None
+        assert "nonexistent" not in server._run_cache
+        assert server._resolve_run(temp_wandb_dir["run1_id"]) is not None
+
+
+class TestResultCache:
+    """Tests for the on-disk tool result cache."""
+
+    def _call(self, server, name, arguments):
+        response = server.handle_request({
+            "method": "tools/call",
+            "params": {"name": name, "arguments": arguments},
+        })
+        return response["result"]["content"][0]["text"]
+
+    def test_finished_run_cached_across_servers(self, server, temp_wandb_dir, monkeypatch):
+        """Test that output for an explicitly named finished run is reused."""
+        run_id = temp_wandb_dir["run1_id"]
+        assert server._resolve_run(run_id).state == "finished"
+        first = self._call(server, "get_config", {"run_id": run_id})
+
+        fresh = MCPServer()
+        monkeypatch.setattr(fresh, "_tools", {
+            "get_config": lambda arguments: pytest.fail("handler should not run")
+        })
+        assert self._call(fresh, "get_config", {"run_id": run_id}) == first
+
+    def test_config_change_invalidates(self, server, temp_wandb_dir, monkeypatch):
+        """Test that rewriting config.yaml of a finished run misses the cache."""
+        run_id = temp_wandb_dir["run1_id"]
+        self._call(server, "get_config", {"run_id": run_id})
+        config_file = temp_wandb_dir["run1_dir"] / "files" / "config.yaml"
+        config_file.write_text(config_file.read_text() + "epochs:\n  value: 3\n")
+
+        fresh = MCPServer()
+        monkeypatch.setattr(fresh, "_tools", {"get_config": lambda arguments: "rerun"})
+        assert self._call(fresh, "get_config", {"run_id": run_id}) == "rerun"
+
+    def test_latest_not_cached(self, server, monkeypatch):
+        """Test that calls without a run_id always run the handler."""
+        calls = []
+        monkeypatch.setattr(server, "_tools", {
+            "get_config": lambda arguments: calls.append(1) or "text"
+        })
+        self._call(server, "get_config", {})
+        self._call(server, "get_config", {})
+        assert len(calls) == 2
+
+
+class TestCallTool:
+    """Tests for tools/call."""
+
+    def test_list_runs(self, server):
+        """Test list_runs tool."""
+        response = server.handle_request({
+            "method": "tools/call",
+            "params": {"name": "list_runs", "arguments": {}},
+        })
+        text = response["result"]["content"][0]["text"]
+        assert "abc123" in text
+        assert "def456" in text
+
+    def test_analyze_local_log(self, temp_logs_dir, monkeypatch):
+        """Test analyze_local_log resolves file names relative to logs_dir."""
+        monkeypatch.setenv("RUNWISE_PROJECT_ROOT", str(temp_logs_dir.parent))
+        monkeypatch.setenv("RUNWISE_LOGS_DIR", str(temp_logs_dir))
+        server = MCPServer()
+
+        def call(file_arg):
+            response = server.handle_request({
+                "method": "tools/call",
+                "params": {"name": "analyze_local_log", "arguments": {"file": file_arg}},
+            })
+            return response["result"]["content"][0]["text"]
+
+        assert "No log file found" not in call("training.jsonl")
+        assert call("missing.jsonl") == "No log file found"
+
+    def test_tool_error(self, server, monkeypatch):
+        """Test that expected tool failures are reported as tool errors."""
+        def missing(arguments):
+            raise FileNotFoundError("no such file")
+
+        monkeypatch.setattr(server, "_tools", {"list_runs": missing})
+        response = server.handle_request({
+            "method": "tools/call",
+            "params": {"name": "list_runs", "arguments": {}},
+        })
+        assert response["result"]["isError"] is True
+        assert "no such file" in response["result"]["content"][0]["text"]
+
+    def test_unknown_tool(self, server):
+        """Test unknown tool returns invalid-params error."""
+        response = server.handle_request({
+            "method": "tools/call",
+            "params": {"name": "bogus", "arguments": {}},
+        })
+        assert response["result"]["error"]["code"] == -32602
+
+    def test_unknown_method(self, server):
+        """Test unknown method returns JSON-RPC error."""
+        response = server.handle_request({"method": "bogus"})
+        assert response["error"]["code"] == -32601
+
+
+class TestRun:
+    """Tests for the stdio loop."""
+
+    def _run(self, server, monkeypatch, payload: bytes) -> list:
+        stdin = io.TextIOWrapper(io.BytesIO(payload), encoding="utf-8")
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        monkeypatch.setattr(sys, "stdin", stdin)
+        monkeypatch.setattr(sys, "stdout", stdout)
+        server.run()
+        stdout.flush()
+        return [json.loads(line) for line in stdout.buffer.getvalue().splitlines()]
+
+    def test_round_trip(self, server, monkeypatch):
+        """Test that requests are answered with JSON-RPC responses."""
+        payload = (
+            b'{"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}}\n'
+            b"not json\n"
+            b'{"jsonrpc": "2.0", "id": 2, "method": "tools/list"}\n'
+        )
+        responses = self._run(server, monkeypatch, payload)
+        assert [r["id"] for r in responses] == [1, 2]
+        assert responses[0]["result"]["serverInfo"]["name"] == "runwise"
+        assert responses[1]["result"]["tools"]
+
+    def test_static_results_match_handlers(self, server, monkeypatch):
+        """Test that pre-encoded responses match the regular handler output."""
+        payload = (
+            b'{"jsonrpc": "2.0", "id": "a", "method": "initialize"}\n'
+            b'{"jsonrpc": "2.0", "id": null, "method": "tools/list"}\n'
+        )
+        responses = self._run(server, monkeypatch, payload)
+        assert responses[0] == {
+            "jsonrpc": "2.0", "id": "a",
+            "result": server.handle_request({"method": "initialize"})["result"],
+        }
+        assert responses[1] == {
+            "jsonrpc": "2.0", "id": None,
+            "result": server.handle_request({"method": "tools/list"})["result"],
+        }
+
+    def test_batch(self, server, monkeypatch):
+        """Test that batch requests get a batch response in request order."""
+        payload = (
+            b'[{"jsonrpc": "2.0", "id": 1, "method": "tools/list"},'
+            b' {"jsonrpc": "2.0", "id": 2, "method": "tools/call",'
+            b'  "params": {"name": "list_runs", "arguments": {}}},'
+            b' {"jsonrpc": "2.0", "id": 3, "method": "bogus"},'
+            b' 42]\n'
+        )
+        (batch,) = self._run(server, monkeypatch, payload)
+        assert [r["id"] for r in batch] == [1, 2, 3, None]
+        assert "tools" in batch[0]["result"]
+        assert "abc123" in batch[1]["result"]["content"][0]["text"]
+        assert batch[2]["error"]["code"] == -32601
+        assert batch[3]["error"]["code"] == -32600
+
+    def test_empty_batch(self, server, monkeypatch):
+        """Test that an empty batch is rejected as an invalid request."""
+        (response,) = self._run(server, monkeypatch, b"[]\n")
+        assert response["error"]["code"] == -32600
+
+    def test_blank_lines_skipped(self, server, monkeypatch):
+        """Test that blank lines produce no response."""
+        payload = b'\n  \n{"jsonrpc": "2.0", "id": 5, "method": "tools/list"}\n'
+        responses = self._run(server, monkeypatch, payload)
+        assert [r["id"] for r in responses] == [5]
+
+    def test_internal_error_keeps_id(self, server, monkeypatch):
+        """Test that unexpected failures are reported against the request id."""
+        def broken(arguments):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(server, "_tools", {"list_runs": broken})
+        payload = (
+            b'{"jsonrpc": "2.0", "id": 9, "method": "tools/call",'
+            b' "params": {"name": "list_runs"}}\n'
+        )
+        (response,) = self._run(server, monkeypatch, payload)
+        assert response["id"] == 9
+        assert response["error"] == {"code": -32603, "message": "boom"}
@@ -2,6 +2,7 @@
 
 
 from runwise.sparklines import (
+    _downsample,
     format_metric_with_spark,
     sparkline,
     sparkline_with_stats,
@@ -59,6 +60,12 @@ class TestSparkline:
         result = sparkline(values, width=10)
         assert len(result) == 10
 
+    def test_downsample_buckets(self):
+        """Downsampling averages contiguous, non-empty buckets."""
+        assert _downsample([1, 2, 3, 4, 5, 6], 3) == [1.5, 3.5, 5.5]
+        assert _downsample([1, 2, 3, 4, 5], 2) == [1.5, 4.0]
+        assert _downsample([1, 2], 5) == [1, 2]
+
     def test_custom_min_max(self):
         """Custom min/max values affect scaling."""
         # With default scaling, [5, 6, 7] fills full range
@@ -67,6 +74,10 @@ class TestSparkline:
         custom = sparkline([5, 6, 7], min_val=0, max_val=100)
         assert default != custom
 
+    def test_custom_bounds_clamp(self):
+        """Values outside caller-supplied bounds clamp to the end characters."""
+        assert sparkline([-50, 5, 50], min_val=0, max_val=10) == "▁▄█"
+
     def test_spike_visible(self):
         """Spike in data is visible in sparkline."""
         values = [1, 1, 1, 10, 1, 1]
@@ -153,3 +164,11 @@ class TestFormatMetricWithSpark:
         result_20 = format_metric_with_spark("loss", list(range(100)), width=20)
         # Different widths produce different results
         assert len(result_5) != len(result_20)
+
+    def test_matches_component_functions(self):
+        """The combined output agrees with sparkline and trend_indicator."""
+        values = [2.0, None, 1.5, float("nan"), 1.0, 0.7, 0.5, 0.4]
+        spark = sparkline(values, width=4)
+        trend = trend_indicator(values)
+        assert format_metric_with_spark("loss", values, width=4) == f"loss: {spark} {trend} (2.00→0.400)"
+        assert format_metric_with_spark("loss", [None, float("nan")]) == "loss: ? (no valid data)"